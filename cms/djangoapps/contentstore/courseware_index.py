@@ -7,11 +7,13 @@ from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
+from edx_django_utils.monitoring import set_custom_metric
 from search.search_engine_base import SearchEngine
-from six import add_metaclass
+from six import add_metaclass, iteritems
 
 from contentstore.course_group_config import GroupConfiguration
 from course_modes.models import CourseMode
@@ -28,6 +30,13 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Default number of documents sent to the search engine in each bulk request.
+INDEX_BATCH_SIZE = 500
+
+# Key of the version of the structure of a course or library that was last
+# indexed, which incremental indexing compares the published structure with.
+INDEXED_VERSION_CACHE_KEY = u'contentstore.search_index.indexed_version.{index_name}.{structure_key}'
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -43,6 +52,77 @@ def strip_html_content_to_text(html_content):
     return text_content
 
 
+def diff_structures(previous_structure, structure):
+    """
+    Compares two versions of the structure of a course or library, as stored
+    by the split modulestore, e.g. before and after a publish.
+
+    Returns a tuple of:
+        changed (set) - the keys of the blocks of structure whose index
+            documents may have changed: added blocks, blocks whose definition
+            or fields changed, their ancestors, whose content groups depend on
+            their children, and the descendants of blocks whose settings
+            changed, which inherit them or show their names in their location,
+            and of blocks added to a parent, e.g. moved, whose location changed
+        removed (set) - the keys of the blocks of previous_structure that are
+            not in structure
+        settings_changed (set) - the keys of the blocks whose settings, i.e.
+            fields other than children, changed
+    """
+    previous_blocks = previous_structure['blocks']
+    blocks = structure['blocks']
+
+    edited = set()
+    settings_changed = set()
+    added_children = set()
+    for block_key, block in iteritems(blocks):
+        previous_block = previous_blocks.get(block_key)
+        if previous_block is None:
+            edited.add(block_key)
+            added_children.update(block.fields.get('children', []))
+        elif previous_block.definition != block.definition or previous_block.fields != block.fields:
+            edited.add(block_key)
+            if _block_settings(previous_block) != _block_settings(block):
+                settings_changed.add(block_key)
+            previous_children = set(previous_block.fields.get('children', []))
+            added_children.update(
+                child_key for child_key in block.fields.get('children', []) if child_key not in previous_children
+            )
+
+    parents = {}
+    for block_key, block in iteritems(blocks):
+        for child_key in block.fields.get('children', []):
+            parents[child_key] = block_key
+
+    changed = set()
+    for block_key in edited:
+        while block_key is not None and block_key not in changed:
+            changed.add(block_key)
+            block_key = parents.get(block_key)
+
+    descended = set()
+    pending = list(settings_changed | added_children)
+    while pending:
+        block_key = pending.pop()
+        if block_key not in descended and block_key in blocks:
+            descended.add(block_key)
+            pending.extend(blocks[block_key].fields.get('children', []))
+    changed.update(descended)
+
+    removed = set(previous_blocks) - set(blocks)
+    return changed, removed, settings_changed
+
+
+def _block_settings(block):
+    """
+    Returns the fields, other than children, of the given split modulestore block.
+    """
+    return (
+        {name: value for name, value in iteritems(block.fields) if name != 'children'},
+        block.defaults,
+    )
+
+
 def indexing_is_enabled():
     """
     Checks to see if the indexing feature is enabled
@@ -68,6 +148,8 @@ class SearchIndexerBase(object):
     INDEX_NAME = None
     DOCUMENT_TYPE = None
     ENABLE_INDEXING_KEY = None
+    # split modulestore branch whose structure is indexed
+    INDEXED_BRANCH = None
 
     INDEX_EVENT = {
         'name': None,
@@ -116,7 +198,8 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE,
+              reindex_items=None, removed_items=None):
         """
         Process course for indexing
 
@@ -132,6 +215,15 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        reindex_items (set) - version agnostic locations, as unicode, of the only
+            items whose index is updated, if given instead of triggered_at;
+            subtrees without any of them are not walked, and the given
+            removed_items are removed from the index instead of searching the
+            index for items no longer present
+
+        removed_items (set) - ids of the items to remove from the index along
+            with reindex_items
+
         Returns:
         Number of items that have been added to the index
         """
@@ -156,9 +248,12 @@ class SearchIndexerBase(object):
 
         # items_index is a list of all the items index dictionaries.
         # it is used to collect all indexes and index them using bulk API,
-        # instead of per item index API call.
+        # in batches of settings.SEARCH_INDEX_BATCH_SIZE, instead of per item index API call.
         items_index = []
 
+        # reindexed_items holds the version agnostic locations of the items in items_index.
+        reindexed_items = set()
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -180,10 +275,22 @@ class SearchIndexerBase(object):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
+            item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
+            if reindex_items is not None:
+                if unicode(get_item_location(item)) not in reindex_items:
+                    # Ancestors of the items to reindex are reindexed too, so
+                    # none of them is in this subtree and it isn't walked; its
+                    # root only reports its own content groups to its parent.
+                    if groups_usage_info and hasattr(item, "index_dictionary"):
+                        return groups_usage_info.get(unicode(get_item_location(item)), None)
+                    return
+                skip_index = False
+
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # skipped items are only walked, so don't build their index dictionary
+            item_index_dictionary = item.index_dictionary() if is_indexable and not skip_index else None
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not (item_index_dictionary or (skip_index and is_indexable)) and not item.has_children:
                 return
 
             item_content_groups = None
@@ -208,7 +315,6 @@ class SearchIndexerBase(object):
                 item_location = get_item_location(item)
                 item_content_groups = groups_usage_info.get(unicode(item_location), None)
 
-            item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
             if item.has_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
@@ -241,6 +347,7 @@ class SearchIndexerBase(object):
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
+                reindexed_items.add(unicode(get_item_location(item)))
                 indexed_count["count"] += 1
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
@@ -259,8 +366,16 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                batch_size = getattr(settings, 'SEARCH_INDEX_BATCH_SIZE', INDEX_BATCH_SIZE)
+                for batch_start in range(0, len(items_index), batch_size):
+                    searcher.index(cls.DOCUMENT_TYPE, items_index[batch_start:batch_start + batch_size])
+                if reindex_items is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                else:
+                    # Items to reindex that are no longer indexable are removed too.
+                    stale_items = set(removed_items or []) | (set(reindex_items) - reindexed_items)
+                    if stale_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, list(stale_items))
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -275,6 +390,97 @@ class SearchIndexerBase(object):
 
         return indexed_count["count"]
 
+    @classmethod
+    def incremental_indexing_is_enabled(cls):
+        """
+        Checks to see if only the changes to published structures are indexed
+        """
+        return getattr(settings, 'SEARCH_INCREMENTAL_INDEX', {}).get('ENABLED', False)
+
+    @classmethod
+    def index_changes(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+        """
+        Updates the index of the given course or library with the items that
+        changed since it was last indexed by this method, found by comparing
+        the indexed and current versions of its structure in the split
+        modulestore.  See diff_structures.
+
+        Falls back to index, given triggered_at and reindex_age, when the
+        structure isn't in the split modulestore, the indexed version is
+        unknown, the settings of the root changed, or more than
+        settings.SEARCH_INCREMENTAL_INDEX['MAX_CHANGED_FRACTION'] of the items
+        changed.
+
+        Returns:
+        Number of items that have been added to the index
+        """
+        store = modulestore._get_modulestore_for_courselike(structure_key)  # pylint: disable=protected-access
+        if store.get_modulestore_type() != ModuleStoreEnum.Type.split:
+            return cls.index(modulestore, structure_key, triggered_at=triggered_at, reindex_age=reindex_age)
+
+        structure_key = structure_key.for_branch(None).version_agnostic()
+        course_index = store.get_course_index(structure_key)
+        version = course_index['versions'].get(cls.INDEXED_BRANCH) if course_index else None
+        version_cache_key = INDEXED_VERSION_CACHE_KEY.format(
+            index_name=cls.INDEX_NAME, structure_key=unicode(structure_key)
+        )
+        indexed_version = cache.get(version_cache_key)
+        if version is not None and indexed_version == version:
+            return 0
+
+        diff = None
+        if version is not None and indexed_version is not None:
+            previous_structure = store.get_structure(structure_key, indexed_version)
+            if previous_structure is not None:
+                structure = store.get_structure(structure_key, version)
+                diff = cls._diff_for_index(structure_key, previous_structure, structure)
+
+        if diff is None:
+            indexed_count = cls.index(modulestore, structure_key, triggered_at=triggered_at, reindex_age=reindex_age)
+            set_custom_metric('search_index_mode', 'full')
+        else:
+            reindex_items, removed_items = diff
+            indexed_count = cls.index(
+                modulestore, structure_key, reindex_items=reindex_items, removed_items=removed_items
+            )
+            set_custom_metric('search_index_mode', 'incremental')
+            set_custom_metric('search_index_blocks_touched', len(reindex_items) + len(removed_items))
+            log.info(
+                u'Incrementally indexed %s: %d blocks to reindex, %d removed, %d added to the index',
+                structure_key, len(reindex_items), len(removed_items), indexed_count or 0,
+            )
+        set_custom_metric('search_index_blocks_indexed', indexed_count or 0)
+
+        if version is not None and indexed_count is not None:
+            cache.set(version_cache_key, version, None)
+        return indexed_count
+
+    @classmethod
+    def _diff_for_index(cls, structure_key, previous_structure, structure):
+        """
+        Returns a tuple of the version agnostic locations of the items to
+        reindex and of the ids of the items to remove from the index, going
+        from previous_structure to structure, or None if a full reindex is due.
+        """
+        changed, removed, settings_changed = diff_structures(previous_structure, structure)
+        max_changed_fraction = getattr(settings, 'SEARCH_INCREMENTAL_INDEX', {}).get('MAX_CHANGED_FRACTION', 0.5)
+        if structure['root'] in settings_changed:
+            # e.g. the name of the course, which is in every document, or its group configurations
+            return None
+        if len(changed) + len(removed) > max_changed_fraction * len(structure['blocks']):
+            return None
+
+        def item_location(block_key):
+            """
+            Returns the version agnostic location of the given block, as unicode.
+            """
+            return unicode(cls._id_modifier(structure_key.make_usage_key(block_key.type, block_key.id)))
+
+        return (
+            {item_location(block_key) for block_key in changed},
+            {item_location(block_key) for block_key in removed},
+        )
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -347,6 +553,8 @@ class CoursewareSearchIndexer(SearchIndexerBase):
     DOCUMENT_TYPE = "courseware_content"
     ENABLE_INDEXING_KEY = 'ENABLE_COURSEWARE_INDEX'
 
+    INDEXED_BRANCH = ModuleStoreEnum.BranchName.published
+
     INDEX_EVENT = {
         'name': 'edx.course.index.reindexed',
         'category': 'courseware_index'
@@ -436,6 +644,8 @@ class LibrarySearchIndexer(SearchIndexerBase):
     DOCUMENT_TYPE = "library_content"
     ENABLE_INDEXING_KEY = 'ENABLE_LIBRARY_INDEX'
 
+    INDEXED_BRANCH = ModuleStoreEnum.BranchName.library
+
     INDEX_EVENT = {
         'name': 'edx.library.index.reindexed',
         'category': 'library_index'
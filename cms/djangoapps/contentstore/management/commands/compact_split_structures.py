@@ -0,0 +1,55 @@
+"""
+Script for rewriting split modulestore structures stored as deltas as full snapshots
+"""
+from __future__ import print_function
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+# To run from command line: ./manage.py cms compact_split_structures course-v1:org+course+run
+
+
+class Command(BaseCommand):
+    """Compact split modulestore structures"""
+    help = '''
+    Rewrite the split modulestore structures that are stored as deltas as full snapshots.
+
+    By default, the structures at the head of each branch of the given courses, or of
+    all courses and libraries if none are given, are compacted so that they are read
+    without applying deltas.
+    --all: compact every structure stored as a delta, e.g. before disabling delta storage
+    '''
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_keys', nargs='*', help="IDs of the courses whose structures to compact")
+        parser.add_argument('--all', action='store_true', help="Compact every structure stored as a delta")
+
+    def handle(self, *args, **options):
+        """Execute the command"""
+        try:
+            course_keys = [CourseKey.from_string(course_key) for course_key in options['course_keys']]
+        except InvalidKeyError:
+            raise CommandError("Invalid course key.")
+
+        # pylint: disable=protected-access
+        split_store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.split)
+        if split_store is None:
+            raise CommandError("The split modulestore is not configured.")
+        db_connection = split_store.db_connection
+
+        if options['all']:
+            structure_ids = db_connection.find_delta_structure_ids()
+        else:
+            structure_ids = {
+                version
+                for course_index in db_connection.find_matching_course_indexes(course_keys=course_keys)
+                for version in course_index['versions'].itervalues()
+            }
+
+        compacted = sum(1 for structure_id in structure_ids if db_connection.compact_structure(structure_id))
+        print(u"Compacted {0} of {1} structures.".format(compacted, len(structure_ids)))
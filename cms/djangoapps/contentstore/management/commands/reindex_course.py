@@ -1,7 +1,9 @@
 """ Management command to update courses' search index """
 import logging
 from textwrap import dedent
+from time import time
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.core.management import BaseCommand, CommandError
 from elasticsearch import exceptions
 from opaque_keys import InvalidKeyError
@@ -14,6 +16,8 @@ from xmodule.modulestore.django import modulestore
 
 from .prompt import query_yes_no
 
+log = logging.getLogger(__name__)
+
 
 class Command(BaseCommand):
     """
@@ -24,6 +28,7 @@ class Command(BaseCommand):
         ./manage.py reindex_course <course_id_1> <course_id_2> ... - reindexes courses with provided keys
         ./manage.py reindex_course --all - reindexes all available courses
         ./manage.py reindex_course --setup - reindexes all courses for devstack setup
+        ./manage.py reindex_course --all --workers 4 - reindexes all available courses, 4 at a time
     """
     help = dedent(__doc__)
     CONFIRMATION_PROMPT = u"Re-indexing all courses might be a time consuming operation. Do you want to continue?"
@@ -38,6 +43,10 @@ class Command(BaseCommand):
         parser.add_argument('--setup',
                             action='store_true',
                             help='Reindex all courses on developers stack setup')
+        parser.add_argument('--workers',
+                            type=int,
+                            default=1,
+                            help='Number of courses to reindex at once')
 
     def _parse_course_key(self, raw_value):
         """ Parses course key from string """
@@ -103,5 +112,38 @@ class Command(BaseCommand):
             # in case course keys are provided as arguments
             course_keys = map(self._parse_course_key, course_ids)
 
-        for course_key in course_keys:
-            CoursewareSearchIndexer.do_course_reindex(store, course_key)
+        self._reindex_courses(store, course_keys, options['workers'])
+
+    def _reindex_courses(self, store, course_keys, workers):
+        """
+        Reindexes the given courses, up to the given number of workers at once,
+        each in its own thread, and logs the rate at which documents were indexed.
+        Stops at the first course that fails to be reindexed.
+        """
+        start_time = time()
+        indexed_count = 0
+        if workers <= 1:
+            for course_key in course_keys:
+                indexed_count += int(CoursewareSearchIndexer.do_course_reindex(store, course_key) or 0)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(CoursewareSearchIndexer.do_course_reindex, store, course_key)
+                    for course_key in course_keys
+                ]
+                try:
+                    for future in as_completed(futures):
+                        indexed_count += int(future.result() or 0)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        elapsed_seconds = time() - start_time
+        log.info(
+            u'Reindexed %d documents of %d courses in %.1f seconds (%.1f documents/second)',
+            indexed_count,
+            len(course_keys),
+            elapsed_seconds,
+            indexed_count / elapsed_seconds if elapsed_seconds else 0,
+        )
@@ -0,0 +1,48 @@
+"""
+Tests for the compact_split_structures management command
+"""
+from django.core.management import call_command, CommandError
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+class TestCompactSplitStructures(ModuleStoreTestCase):
+    """
+    Tests for the compact_split_structures management command
+    """
+    def setUp(self):
+        super(TestCompactSplitStructures, self).setUp()
+        # pylint: disable=protected-access
+        self.db_connection = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.split).db_connection
+        self.db_connection.structure_snapshot_interval = 10
+        self.addCleanup(setattr, self.db_connection, 'structure_snapshot_interval', None)
+
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        ItemFactory.create(parent_location=chapter.location, category='sequential')
+
+    def head_versions(self):
+        """
+        Returns the ids of the structures at the head of the course's branches.
+        """
+        course_index = self.db_connection.get_course_index(self.course.id)
+        return set(course_index['versions'].values())
+
+    def test_invalid_course_key(self):
+        with self.assertRaisesRegexp(CommandError, "Invalid course key."):
+            call_command('compact_split_structures', 'TestX/TS01')
+
+    def test_compact_head_versions(self):
+        self.assertTrue(self.head_versions() & set(self.db_connection.find_delta_structure_ids()))
+
+        call_command('compact_split_structures', unicode(self.course.id))
+
+        self.assertFalse(self.head_versions() & set(self.db_connection.find_delta_structure_ids()))
+        self.assertEqual(len(modulestore().get_course(self.course.id).get_children()), 1)
+
+    def test_compact_all(self):
+        call_command('compact_split_structures', '--all')
+        self.assertEqual(self.db_connection.find_delta_structure_ids(), [])
+        self.assertEqual(len(modulestore().get_course(self.course.id).get_children()), 1)
@@ -123,3 +123,26 @@ class TestReindexCourse(ModuleStoreTestCase):
 
             with self.assertRaises(SearchIndexingError):
                 call_command('reindex_course', text_type(self.second_course.id))
+
+    def test_workers_reindex_all_courses(self):
+        """ Test that reindexes all courses concurrently when --workers is given """
+        with mock.patch(self.YESNO_PATCH_LOCATION, mock.Mock(return_value=True)):
+            with mock.patch(self.REINDEX_PATH_LOCATION, return_value=3) as patched_index, \
+                    mock.patch(self.MODULESTORE_PATCH_LOCATION, mock.Mock(return_value=self.store)):
+                call_command('reindex_course', all=True, workers=2)
+
+                expected_calls = self._build_calls(self.first_course, self.second_course)
+                self.assertItemsEqual(patched_index.mock_calls, expected_calls)
+
+    def test_workers_fail_if_reindex_fails(self):
+        """ Test that reindexing courses concurrently fails on reindexing exceptions """
+        with mock.patch(self.REINDEX_PATH_LOCATION) as patched_index:
+            patched_index.side_effect = SearchIndexingError("message", [])
+
+            with self.assertRaises(SearchIndexingError):
+                call_command(
+                    'reindex_course',
+                    text_type(self.first_course.id),
+                    text_type(self.second_course.id),
+                    workers=2
+                )
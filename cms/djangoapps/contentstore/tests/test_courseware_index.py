@@ -11,10 +11,12 @@ from uuid import uuid4
 import ddt
 import pytest
 from django.conf import settings
+from django.test.utils import override_settings
 from lazy.lazy import lazy
 from mock import patch
 from pytz import UTC
 from search.search_engine_base import SearchEngine
+from search.tests.mock_search_engine import MockSearchEngine
 
 from contentstore.courseware_index import (
     CourseAboutSearchIndexer,
@@ -258,6 +260,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             reindex_age=(trigger_time - since_time)
         )
 
+    def index_changes(self, store):
+        """ index the changes to the course since it was last indexed this way """
+        return CoursewareSearchIndexer.index_changes(store, self.course.id)
+
     def _get_default_search(self):
         return {"course": unicode(self.course.id)}
 
@@ -544,6 +550,102 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         with self.assertRaises(SearchIndexingError):
             self.reindex_course(store)
 
+    @override_settings(SEARCH_INDEX_BATCH_SIZE=3)
+    def _test_index_batches(self, store):
+        """ Test that documents are sent to the search engine in batches """
+        self.publish_item(store, self.vertical.location)
+        with patch.object(MockSearchEngine, 'index', autospec=True, side_effect=MockSearchEngine.index) as mock_index:
+            self.assertEqual(self.reindex_course(store), 4)
+        batch_sizes = [
+            len(sources)
+            for (__, doc_type, sources), __ in mock_index.call_args_list
+            if doc_type == self.DOCUMENT_TYPE
+        ]
+        self.assertEqual(batch_sizes, [3, 1])
+        self.assertEqual(self.search()["total"], 4)
+
+    def _test_index_changes(self, store):
+        """ Test that incremental indexing only reindexes the changed items and their ancestors """
+        sequential2 = ItemFactory.create(
+            parent_location=self.chapter.location,
+            category='sequential',
+            display_name='Lesson 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        self.publish_item(store, self.vertical.location)
+
+        # without an indexed version, the whole course is indexed
+        self.assertEqual(self.index_changes(store), 5)
+        self.assertEqual(self.index_changes(store), 0)
+
+        self.html_unit.display_name = "Changed Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_changes(store), 4)
+        self.assertEqual(self.search(query_string="Changed Html Content")["total"], 1)
+        self.assertEqual(self.search()["total"], 5)
+
+        self.delete_item(store, sequential2.location)
+        self.publish_item(store, self.chapter.location)
+        self.assertEqual(self.index_changes(store), 1)
+        self.assertEqual(self.search()["total"], 4)
+
+    def _test_index_changes_of_settings(self, store):
+        """ Test that the descendants of an item whose settings changed are reindexed """
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_changes(store), 4)
+
+        self.chapter.display_name = "Week One"
+        self.update_item(store, self.chapter)
+        self.publish_item(store, self.chapter.location)
+        self.assertEqual(self.index_changes(store), 4)
+        response = self.search(query_string="Html Content")
+        self.assertEqual(response["results"][0]["data"]["location"], ["Week One", "Lesson 1", "Subsection 1"])
+
+    def _test_index_changes_of_moves(self, store):
+        """ Test that an item moved to another parent is reindexed with its descendants """
+        sequential2 = ItemFactory.create(
+            parent_location=self.chapter.location,
+            category='sequential',
+            display_name='Lesson 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_changes(store), 5)
+
+        # move the vertical, whose own fields and definition do not change
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            sequential = store.get_item(self.sequential.location)
+            sequential2 = store.get_item(sequential2.location)
+        sequential.children.remove(self.vertical.location)
+        sequential2.children.append(self.vertical.location)
+        self.update_item(store, sequential)
+        self.update_item(store, sequential2)
+        self.publish_item(store, self.chapter.location)
+
+        # the chapter, both sequentials, the vertical and its html unit
+        self.assertEqual(self.index_changes(store), 5)
+        response = self.search(query_string="Html Content")
+        self.assertEqual(response["results"][0]["data"]["location"], ["Week 1", "Lesson 2", "Subsection 1"])
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_index_batches(self, store_type):
+        self._perform_test_using_store(store_type, self._test_index_batches)
+
+    @override_settings(SEARCH_INCREMENTAL_INDEX={'ENABLED': True, 'MAX_CHANGED_FRACTION': 1})
+    def test_index_changes(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_index_changes)
+
+    @override_settings(SEARCH_INCREMENTAL_INDEX={'ENABLED': True, 'MAX_CHANGED_FRACTION': 1})
+    def test_index_changes_of_settings(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_index_changes_of_settings)
+
+    @override_settings(SEARCH_INCREMENTAL_INDEX={'ENABLED': True, 'MAX_CHANGED_FRACTION': 1})
+    def test_index_changes_of_moves(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_index_changes_of_moves)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_indexing_course(self, store_type):
         self._perform_test_using_store(store_type, self._test_indexing_course)
@@ -616,6 +616,37 @@ MODULESTORE = {
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
 
+# Process-local cache of small course assets served by the contentserver, in
+# front of the "course_assets" cache.  MAX_SIZE bounds the total bytes cached
+# in each process (0 disables the cache), MAX_ASSET_SIZE the size of each
+# cached asset, and TIMEOUT, in seconds, how long an asset may be served from
+# it after being changed in another process.
+CONTENTSERVER_PROCESS_CACHE = {
+    'MAX_SIZE': 0,
+    'MAX_ASSET_SIZE': 256 * 1024,
+    'TIMEOUT': 60,
+}
+
+# Process-local cache of the static urls resolved by static_replace, by course.
+# A TIMEOUT of 0 disables it.
+STATIC_REPLACE_URL_CACHE = {
+    'MAX_COURSES': 100,
+    'MAX_PATHS_PER_COURSE': 1000,
+    'TIMEOUT': 0,
+}
+
+# Process-local cache of CourseOverviews used by CourseOverview.get_from_ids.  MAX_SIZE
+# bounds the number of CourseOverviews cached in each process (0 disables the cache),
+# and TIMEOUT, in seconds, how long each may be served before being refetched.
+COURSE_OVERVIEW_PROCESS_CACHE = {
+    'MAX_SIZE': 0,
+    'TIMEOUT': 300,
+}
+
+# How many threads CourseOverview.get_from_ids uses to load missing CourseOverviews
+# from the modulestore.
+COURSE_OVERVIEW_LOAD_THREADS = 1
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -629,6 +660,15 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Number of warm sandbox workers to keep per process.  0 starts a new
+    # sandbox for every execution.
+    'pool_size': 0,
+    # How many executions a sandbox worker runs before it is replaced.
+    'pool_max_jobs_per_worker': 100,
+    # Number of execution results to cache in each process, in front of
+    # the shared cache.  0 disables the process cache.
+    'result_cache_size': 0,
 }
 
 ############################ DJANGO_BUILTINS ################################
@@ -1416,6 +1456,19 @@ ELASTIC_FIELD_MAPPINGS = {
     }
 }
 
+# Number of documents sent to the search engine in each bulk request when indexing
+# courseware and libraries.
+SEARCH_INDEX_BATCH_SIZE = 500
+
+# Incremental search indexing of courseware and libraries.  When ENABLED, a publish
+# only reindexes the blocks whose published structure changed since the last
+# indexing, along with their ancestors and the descendants of blocks whose settings
+# changed, unless more than MAX_CHANGED_FRACTION of the blocks changed.
+SEARCH_INCREMENTAL_INDEX = {
+    'ENABLED': False,
+    'MAX_CHANGED_FRACTION': 0.5,
+}
+
 XBLOCK_SETTINGS = {
     "VideoDescriptor": {
         "licensing_enabled": FEATURES.get("LICENSING", False)
@@ -1,10 +1,13 @@
 import logging
 import re
+from time import time
 
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
 
+from openedx.core.lib.cache_utils import LRUCache
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
@@ -13,6 +16,14 @@ from six import text_type
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Compiled patterns matching all the URLs rewritten by replace_urls, by static
+# URL and data directory.
+_REPLACE_URLS_PATTERNS = LRUCache(max_size=100)
+
+# Process-local caches of the static URLs resolved by resolve_static_url, by
+# course, created on first use.
+_RESOLVED_URL_CACHES = None
+
 
 def _url_replace_regex(prefix):
     """
@@ -94,6 +105,21 @@ def replace_course_urls(text, course_key):
     return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
 
 
+def _is_xblock_resource_url(prefix, rest):
+    """
+    Returns whether the matched url is an XBlock resource link, which must not
+    be rewritten.
+    """
+    # Probably wasn't a good idea that /static works for actual static assets
+    # and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
 def process_static_urls(text, replacement_function, data_dir=None):
     """
     Run an arbitrary replacement function on any urls matching the static file
@@ -109,14 +135,8 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix, rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
@@ -171,59 +191,208 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         """
         Replace a single matched url.
         """
-        original_uri = "".join([prefix, rest])
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+        return _replace_static_url(
+            original, prefix, quote, rest, data_directory, course_id, static_asset_path, static_paths_out
+        )
+
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
 
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
+def replace_urls(text, course_id, jump_to_id_base_url=None, data_directory=None, static_asset_path='',
+                 static_paths_out=None):
+    """
+    Does the work of replace_static_urls, replace_course_urls and, if
+    jump_to_id_base_url is given, replace_jump_to_id_urls, in a single pass over
+    the text with one compiled pattern matching the urls of all three.
+
+    The time taken is accumulated in the static_replace.rewrite_time custom
+    metric, in milliseconds, and the number of texts rewritten in
+    static_replace.rewrites.
+
+    text: The source text to do the substitution in
+    course_id: The course identifier, see replace_static_urls and replace_course_urls
+    jump_to_id_base_url: The base of the jump_to_id handler, see replace_jump_to_id_urls
+    data_directory, static_asset_path, static_paths_out: See replace_static_urls
+    """
+    start_time = time()
+
+    if static_paths_out is None:
+        static_paths_out = []
+    course_url_prefix = u'/courses/{}/'.format(text_type(course_id))
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to which of the prefixes it has.
+        """
+        original = match.group(0)
+        prefix = match.group('prefix')
+        quote = match.group('quote')
+        rest = match.group('rest')
+
+        if match.group('course_prefix'):
+            return "".join([quote, course_url_prefix, rest, quote])
+        elif match.group('jump_to_id_prefix'):
+            if jump_to_id_base_url is None:
+                return original
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        elif _is_xblock_resource_url(prefix, rest):
             return original
+        return _replace_static_url(
+            original, prefix, quote, rest, data_directory, course_id, static_asset_path, static_paths_out
+        )
+
+    text = _get_replace_urls_pattern(static_asset_path or data_directory).sub(replace_url, text)
+
+    monitoring_utils.accumulate(u'static_replace.rewrite_time', (time() - start_time) * 1000)
+    monitoring_utils.accumulate(u'static_replace.rewrites', 1)
+    return text
+
 
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+def _get_replace_urls_pattern(data_dir):
+    """
+    Returns the compiled pattern matching the urls rewritten by replace_urls,
+    whose prefix is captured in the static_prefix, course_prefix or
+    jump_to_id_prefix group.
+    """
+    cache_key = (settings.STATIC_URL, data_dir)
+    pattern = _REPLACE_URLS_PATTERNS.get(cache_key)
+    if pattern is None:
+        pattern = re.compile(_url_replace_regex(
+            u'(?P<static_prefix>(?:{static_url}|/static/)(?!{data_dir}))'
+            u'|(?P<course_prefix>/course/)'
+            u'|(?P<jump_to_id_prefix>/jump_to_id/)'.format(
+                static_url=settings.STATIC_URL,
+                data_dir=data_dir
+            )
+        ))
+        _REPLACE_URLS_PATTERNS.set(cache_key, pattern)
+    return pattern
+
+
+def _replace_static_url(original, prefix, quote, rest, data_directory, course_id, static_asset_path,
+                        static_paths_out):
+    """
+    Replace a single matched static url, see replace_static_urls.
+    """
+    original_uri = "".join([prefix, rest])
+    # Don't mess with things that end in '?raw'
+    if rest.endswith('?raw'):
+        static_paths_out.append((original_uri, original_uri))
+        return original
+
+    url = resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+    if url is None:
+        static_paths_out.append((original_uri, original_uri))
+        return original
+
+    static_paths_out.append((original_uri, url))
+    return "".join([quote, url, quote])
+
+
+def resolve_static_url(prefix, rest, data_directory=None, course_id=None, static_asset_path=''):
+    """
+    Returns the url a static url made of the given prefix and rest is replaced
+    with, or None if it is to be left as is.  See replace_static_urls.
+
+    If settings.STATIC_REPLACE_URL_CACHE has a TIMEOUT, the urls resolved for
+    each course are kept for that many seconds in a process-local cache, of
+    at most MAX_COURSES courses and MAX_PATHS_PER_COURSE urls per course.
+    """
+    timeout = _resolved_url_cache_setting('TIMEOUT', 0)
+    if not timeout:
+        return _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+
+    resolved_urls = _get_resolved_url_cache(course_id)
+    cache_key = (prefix, rest, data_directory, static_asset_path)
+    entry = resolved_urls.get(cache_key)
+    if entry is not None:
+        url, expiration = entry
+        if expiration >= time():
+            return url
+
+    url = _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+    resolved_urls.set(cache_key, (url, time() + timeout))
+    return url
+
+
+def clear_resolved_urls():
+    """
+    Clears the process-local caches of resolved static urls.
+    """
+    global _RESOLVED_URL_CACHES  # pylint: disable=global-statement
+    _RESOLVED_URL_CACHES = None
 
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
 
-            if exists_in_staticfiles_storage:
+def _get_resolved_url_cache(course_id):
+    """
+    Returns the process-local cache of the static urls resolved for the given
+    course.
+    """
+    global _RESOLVED_URL_CACHES  # pylint: disable=global-statement
+    if _RESOLVED_URL_CACHES is None:
+        _RESOLVED_URL_CACHES = LRUCache(max_size=_resolved_url_cache_setting('MAX_COURSES', 100))
+
+    resolved_urls = _RESOLVED_URL_CACHES.get(course_id)
+    if resolved_urls is None:
+        resolved_urls = LRUCache(max_size=_resolved_url_cache_setting('MAX_PATHS_PER_COURSE', 1000))
+        _RESOLVED_URL_CACHES.set(course_id, resolved_urls)
+    return resolved_urls
+
+
+def _resolved_url_cache_setting(name, default):
+    """
+    Returns the given setting of the cache of resolved static urls.
+    """
+    return getattr(settings, 'STATIC_REPLACE_URL_CACHE', {}).get(name, default)
+
+
+def _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Resolves a static url, see resolve_static_url.
+    """
+    # In debug mode, if we can find the url as is,
+    if settings.DEBUG and finders.find(rest, True):
+        return None
+
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    elif (not static_asset_path) and course_id:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            # Import is placed here to avoid model import at project startup.
+            from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            base_url = AssetBaseUrlConfig.get_base_url()
+            excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+            url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if staticfiles_storage.exists(rest):
                 url = staticfiles_storage.url(rest)
             else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
-        else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
-
-        static_paths_out.append((original_uri, url))
-        return "".join([quote, url, quote])
+                url = staticfiles_storage.url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+            url = "".join([prefix, course_path])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return url
@@ -16,10 +16,13 @@ from PIL import Image
 
 from static_replace import (
     _url_replace_regex,
+    clear_resolved_urls,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -250,6 +253,61 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls(mock_storage):
+    """
+    Make sure that replace_urls rewrites the text as replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls do one after the other.
+    """
+    mock_storage.exists.side_effect = lambda path: path == 'file.png'
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    pre_text = (
+        '<img src="/static/file.png"/><a href="/course/info">info</a><a href=\'/jump_to_id/intro\'>intro</a>'
+        '<script src="/static/js/capa/protex.js?raw"></script>'
+        '<img src="/static/xblock/resources/babys_first.lil_xblock/public/images/pacifier.png"/>'
+    )
+    expected_text = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    static_paths = []
+    assert replace_urls(
+        pre_text, COURSE_KEY, jump_to_id_base_url, DATA_DIRECTORY, static_paths_out=static_paths
+    ) == expected_text
+    assert static_paths == [
+        ('/static/file.png', '/static/hashed/file.png'),
+        ('/static/js/capa/protex.js?raw', '/static/js/capa/protex.js?raw'),
+    ]
+    assert replace_urls('"/jump_to_id/intro"', COURSE_KEY) == '"/jump_to_id/intro"'
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_resolved_urls_cache(mock_storage):
+    """
+    Make sure that the urls resolved for a course are only resolved once while
+    cached.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/hashed/file.png'
+    clear_resolved_urls()
+    try:
+        with override_settings(STATIC_REPLACE_URL_CACHE={'TIMEOUT': 60}):
+            for __ in range(2):
+                assert replace_urls(STATIC_SOURCE, COURSE_KEY) == '"/static/hashed/file.png"'
+            mock_storage.exists.assert_called_once_with('file.png')
+
+            replace_urls(STATIC_SOURCE, CourseKey.from_string('org/other_course/run'))
+            assert mock_storage.exists.call_count == 2
+
+        replace_urls(STATIC_SOURCE, COURSE_KEY)
+        assert mock_storage.exists.call_count == 3
+    finally:
+        clear_resolved_urls()
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -0,0 +1,254 @@
+"""
+Snapshot of the parts of the learner dashboard that don't depend on the request.
+
+Each enrollment on the dashboard has a snapshot holding its certificate,
+credit and verification statuses and the URL of its resume button, which is
+cached with the key DASHBOARD_SNAPSHOT_KEY.  Snapshots are updated
+incrementally: a change to one enrollment, certificate, grade, credit request
+or completion only drops the snapshot of that course, while changes which
+affect several snapshots replace a generation, per user for ID verifications
+and per course for publishing and verification deadlines, that the snapshots
+are stored with.  Dropped snapshots are rebuilt in the background, and by the
+dashboard when it finds them missing.
+
+Snapshots are kept for settings.STUDENT_DASHBOARD_SNAPSHOT['TIMEOUT']
+seconds, as statuses that depend on the time, e.g. a missed verification
+deadline, are only refreshed when a snapshot expires.  Snapshots are not
+cached at all unless TIMEOUT is set.
+"""
+from __future__ import absolute_import
+
+from completion.models import BlockCompletion
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from six import iteritems, text_type
+
+from lms.djangoapps.verify_student.models import (
+    ManualVerification,
+    SoftwareSecurePhotoVerification,
+    SSOVerification,
+    VerificationDeadline
+)
+from openedx.core.djangoapps.credit.models import CreditEligibility, CreditRequest
+from openedx.core.djangoapps.signals.signals import COURSE_CERT_CHANGED, COURSE_GRADE_CHANGED
+from openedx.core.djangoapps.theming.helpers import is_request_in_themed_site
+from openedx.core.lib.cache_utils import get_cache_generations
+from student.models import CourseEnrollment
+from xmodule.modulestore.django import SignalHandler
+
+DASHBOARD_SNAPSHOT_KEY = u'student.dashboard.snapshot.{user_id}.{course_id}'
+USER_GENERATION_CACHE_KEY = u'student.dashboard.generation.user.{user_id}'
+COURSE_GENERATION_CACHE_KEY = u'student.dashboard.generation.course.{course_id}'
+
+
+def is_dashboard_snapshot_enabled():
+    """
+    Returns whether dashboard snapshots are cached.
+    """
+    return bool(_dashboard_snapshot_timeout())
+
+
+def get_snapshot_versions(user_id, course_keys):
+    """
+    Returns the version that the snapshots of the given courses of the given
+    user must have, keyed by course.
+
+    Versions hold the current generations of the user and of the course, and
+    whether the request is in a themed site, which hides LinkedIn buttons from
+    certificate statuses.
+    """
+    user_generation = get_cache_generations([USER_GENERATION_CACHE_KEY.format(user_id=user_id)])
+    course_generations = get_cache_generations([
+        COURSE_GENERATION_CACHE_KEY.format(course_id=text_type(course_key)) for course_key in course_keys
+    ])
+    themed_site = is_request_in_themed_site()
+    return {
+        course_key: (
+            user_generation[0],
+            course_generation,
+            themed_site,
+        )
+        for course_key, course_generation in zip(course_keys, course_generations)
+    }
+
+
+def get_cached_snapshots(user_id, versions):
+    """
+    Returns the cached snapshots of the given user that have the given
+    versions, keyed by course.  Courses whose snapshot is missing or outdated
+    are left out.
+    """
+    cache_keys = {
+        _snapshot_cache_key(user_id, course_key): course_key
+        for course_key in versions
+    }
+    snapshots = {}
+    for cache_key, (version, snapshot) in iteritems(cache.get_many(list(cache_keys))):
+        course_key = cache_keys[cache_key]
+        if version == versions[course_key]:
+            snapshots[course_key] = snapshot
+    return snapshots
+
+
+def set_cached_snapshots(user_id, versions, snapshots):
+    """
+    Caches the given snapshots of the given user, keyed by course, with their
+    versions as returned by get_snapshot_versions.
+    """
+    cache.set_many(
+        {
+            _snapshot_cache_key(user_id, course_key): (versions[course_key], snapshot)
+            for course_key, snapshot in iteritems(snapshots)
+        },
+        _dashboard_snapshot_timeout(),
+    )
+
+
+def invalidate_snapshot(user_id, course_key):
+    """
+    Invalidates the snapshot of the given course of the given user.
+    """
+    cache.delete(_snapshot_cache_key(user_id, course_key))
+
+
+def invalidate_user_snapshots(user_id):
+    """
+    Invalidates the snapshots of all the courses of the given user.
+    """
+    cache.delete(USER_GENERATION_CACHE_KEY.format(user_id=user_id))
+
+
+def invalidate_course_snapshots(course_key):
+    """
+    Invalidates the snapshots of the given course, for all users.
+    """
+    cache.delete(COURSE_GENERATION_CACHE_KEY.format(course_id=text_type(course_key)))
+
+
+def _on_commit_invalidate(invalidate, *args, **kwargs):
+    """
+    Calls the given invalidate function once the current transaction is
+    committed, so that snapshots aren't rebuilt from the data being replaced.
+    If rebuild_user_id is given, the snapshots of that user are then rebuilt
+    in the background.
+    """
+    rebuild_user_id = kwargs.pop('rebuild_user_id', None)
+
+    def _invalidate():
+        invalidate(*args)
+        if rebuild_user_id is not None:
+            from student.tasks import rebuild_dashboard_snapshots
+            rebuild_dashboard_snapshots.delay(rebuild_user_id)
+
+    if is_dashboard_snapshot_enabled():
+        transaction.on_commit(_invalidate)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def _listen_for_enrollment_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of an enrollment when it is saved, e.g. when the
+    learner enrolls, unenrolls or changes mode.
+    """
+    _on_commit_invalidate(
+        invalidate_snapshot, instance.user_id, instance.course_id, rebuild_user_id=instance.user_id
+    )
+
+
+@receiver(COURSE_CERT_CHANGED)
+def _listen_for_certificate_change(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of a course when the learner's certificate changes.
+    """
+    _on_commit_invalidate(invalidate_snapshot, user.id, course_key, rebuild_user_id=user.id)
+
+
+@receiver(COURSE_GRADE_CHANGED)
+def _listen_for_grade_change(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of a course when the learner's grade, which is
+    shown with their certificate status, changes.
+    """
+    _on_commit_invalidate(invalidate_snapshot, user.id, course_key)
+
+
+@receiver(post_save, sender=BlockCompletion)
+def _listen_for_completion(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of a course when the learner completes a block,
+    which moves their resume button.  Snapshots aren't rebuilt in the
+    background, as learners often complete several blocks in a row.
+    """
+    _on_commit_invalidate(invalidate_snapshot, instance.user_id, instance.course_key)
+
+
+@receiver(post_save, sender=CreditEligibility)
+@receiver(post_save, sender=CreditRequest)
+def _listen_for_credit_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of a course when the learner's credit eligibility
+    or request changes.
+    """
+    if not is_dashboard_snapshot_enabled():
+        return
+    user_id = User.objects.filter(username=instance.username).values_list('id', flat=True).first()
+    if user_id is not None:
+        _on_commit_invalidate(invalidate_snapshot, user_id, instance.course.course_key, rebuild_user_id=user_id)
+
+
+@receiver(post_save, sender=ManualVerification)
+@receiver(post_save, sender=SoftwareSecurePhotoVerification)
+@receiver(post_save, sender=SSOVerification)
+def _listen_for_verification_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshots of a learner when one of their ID verifications
+    changes, as it may change their verification status in all their courses.
+    """
+    _on_commit_invalidate(invalidate_user_snapshots, instance.user_id, rebuild_user_id=instance.user_id)
+
+
+@receiver(post_save, sender=VerificationDeadline)
+def _listen_for_verification_deadline_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshots of a course when its verification deadline changes.
+    """
+    _on_commit_invalidate(invalidate_course_snapshots, instance.course_key)
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshots of a course when it is published, which may
+    change how its certificates are displayed.
+    """
+    _on_commit_invalidate(invalidate_course_snapshots, course_key)
+
+
+@receiver(user_logged_in)
+def _listen_for_login(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuilds the missing snapshots of a learner in the background when they
+    log in, as they usually land on their dashboard next.
+    """
+    if is_dashboard_snapshot_enabled():
+        from student.tasks import rebuild_dashboard_snapshots
+        transaction.on_commit(lambda: rebuild_dashboard_snapshots.delay(user.id))
+
+
+def _snapshot_cache_key(user_id, course_key):
+    """
+    Returns the key of the snapshot of the given course of the given user.
+    """
+    return DASHBOARD_SNAPSHOT_KEY.format(user_id=user_id, course_id=text_type(course_key))
+
+
+def _dashboard_snapshot_timeout():
+    """
+    Returns how long, in seconds, dashboard snapshots are cached.
+    """
+    return getattr(settings, 'STUDENT_DASHBOARD_SNAPSHOT', {}).get('TIMEOUT', 0)
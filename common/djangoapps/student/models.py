@@ -1587,16 +1587,15 @@ class CourseEnrollment(models.Model):
         We try to preload all CourseOverviews, which are usually lazily loaded
         as the .course_overview property. This is to avoid making an extra
         query for every enrollment when displaying something like the student
-        dashboard. If some of the CourseOverviews are not found, we make no
-        attempt to initialize them -- we just fall back to existing lazy-load
-        behavior. The goal is to optimize the most common case as simply as
-        possible, without changing any of the existing contracts.
+        dashboard. CourseOverviews that are not found are loaded from the
+        modulestore all at once; if a course still can't be loaded, we fall
+        back to existing lazy-load behavior.
 
         The name of this method is long, but was the end result of hashing out a
         number of alternatives, so pylint can stuff it (disable=invalid-name)
         """
         enrollments = list(cls.enrollments_for_user(user))
-        overviews = CourseOverview.get_from_ids_if_exists(
+        overviews = CourseOverview.get_from_ids(
             enrollment.course_id for enrollment in enrollments
         )
         for enrollment in enrollments:
@@ -48,3 +48,19 @@ def send_activation_email(self, subject, message, from_address, dest_addr):
             exc_info=True
         )
         raise Exception
+
+
+@task()
+def rebuild_dashboard_snapshots(user_id):
+    """
+    Rebuilds the missing or outdated dashboard snapshots of the given user.
+    """
+    from django.contrib.auth.models import User
+    from student.views.dashboard import get_course_enrollments, get_dashboard_snapshots
+
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        log.info(u'Not rebuilding the dashboard snapshots of missing user %s', user_id)
+        return
+    get_dashboard_snapshots(user, list(get_course_enrollments(user, None, None)))
@@ -0,0 +1,79 @@
+"""
+Tests for the snapshots of the student dashboard.
+"""
+import unittest
+
+from django.conf import settings
+from django.test.utils import override_settings
+from mock import patch
+
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student import dashboard_snapshot
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from student.views.dashboard import _compute_dashboard_snapshots, get_dashboard_snapshots
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+@override_settings(STUDENT_DASHBOARD_SNAPSHOT={'TIMEOUT': 60})
+class DashboardSnapshotTest(CacheIsolationTestCase):
+    """
+    Tests that dashboard snapshots are cached and invalidated.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(DashboardSnapshotTest, self).setUp()
+        self.user = UserFactory()
+        self.enrollments = [
+            CourseEnrollmentFactory(user=self.user, course_id=CourseOverviewFactory().id)
+            for __ in range(2)
+        ]
+
+    def get_dashboard_snapshots(self, expected_computed_courses):
+        """
+        Returns the dashboard snapshots of the user, checking that the
+        snapshots of the given courses are computed.
+        """
+        with patch(
+            'student.views.dashboard._compute_dashboard_snapshots', wraps=_compute_dashboard_snapshots
+        ) as mock_compute:
+            snapshots = get_dashboard_snapshots(self.user, self.enrollments)
+        computed_courses = set()
+        for call_args in mock_compute.call_args_list:
+            computed_courses.update(enrollment.course_id for enrollment in call_args[0][1])
+        self.assertEqual(computed_courses, set(expected_computed_courses))
+        return snapshots
+
+    def test_snapshots_cached(self):
+        course_ids = [enrollment.course_id for enrollment in self.enrollments]
+        expected = self.get_dashboard_snapshots(course_ids)
+        self.assertEqual(set(expected), set(course_ids))
+        self.assertEqual(self.get_dashboard_snapshots([]), expected)
+
+    @override_settings(STUDENT_DASHBOARD_SNAPSHOT={'TIMEOUT': 0})
+    def test_snapshots_disabled(self):
+        course_ids = [enrollment.course_id for enrollment in self.enrollments]
+        self.get_dashboard_snapshots(course_ids)
+        self.get_dashboard_snapshots(course_ids)
+
+    def test_invalidate_snapshot(self):
+        self.get_dashboard_snapshots([enrollment.course_id for enrollment in self.enrollments])
+        dashboard_snapshot.invalidate_snapshot(self.user.id, self.enrollments[0].course_id)
+        self.get_dashboard_snapshots([self.enrollments[0].course_id])
+
+    def test_invalidate_user_snapshots(self):
+        course_ids = [enrollment.course_id for enrollment in self.enrollments]
+        self.get_dashboard_snapshots(course_ids)
+        dashboard_snapshot.invalidate_user_snapshots(self.user.id)
+        self.get_dashboard_snapshots(course_ids)
+
+    def test_invalidate_course_snapshots(self):
+        self.get_dashboard_snapshots([enrollment.course_id for enrollment in self.enrollments])
+        dashboard_snapshot.invalidate_course_snapshots(self.enrollments[1].course_id)
+        self.get_dashboard_snapshots([self.enrollments[1].course_id])
+
+    def test_themed_site_not_shared(self):
+        self.get_dashboard_snapshots([enrollment.course_id for enrollment in self.enrollments])
+        with patch('student.dashboard_snapshot.is_request_in_themed_site', return_value=True):
+            self.get_dashboard_snapshots([enrollment.course_id for enrollment in self.enrollments])
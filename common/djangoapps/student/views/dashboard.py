@@ -49,6 +49,7 @@ from openedx.features.enterprise_support.api import get_dashboard_consent_notifi
 from openedx.features.journals.api import journals_enabled
 from shoppingcart.api import order_history
 from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
+from student import dashboard_snapshot
 from student.helpers import cert_info, check_verify_status_by_course
 from student.models import (
     AccountRecovery,
@@ -550,6 +551,68 @@ def _get_urls_for_resume_buttons(user, enrollments):
     return resume_button_urls
 
 
+def _compute_dashboard_snapshots(user, course_enrollments, all_course_enrollments):
+    """
+    Computes the snapshots of the given enrollments of the user: the parts of
+    their dashboard cards that don't depend on the request.
+
+    Arguments:
+        user (User): The user whose dashboard is shown.
+        course_enrollments (list[CourseEnrollment]): The enrollments to compute
+            the snapshots of.
+        all_course_enrollments (list[CourseEnrollment]): All the enrollments on
+            the dashboard, which verification statuses depend on.
+
+    Returns: dict
+
+    The returned dictionary has keys that are `CourseKey`s and values that
+    are dictionaries with:
+
+        * cert_status (dict): The certificate status returned by cert_info.
+        * credit_status (dict): The credit status returned by _credit_statuses, or None.
+        * verification_status (dict): The verification status returned by
+            check_verify_status_by_course, or None.
+        * resume_url (unicode): The URL of the resume button, or ''.
+    """
+    credit_statuses = _credit_statuses(user, course_enrollments)
+    verify_status_by_course = check_verify_status_by_course(user, all_course_enrollments)
+    resume_button_urls = _get_urls_for_resume_buttons(user, course_enrollments)
+    return {
+        enrollment.course_id: {
+            'cert_status': cert_info(user, enrollment.course_overview),
+            'credit_status': credit_statuses.get(enrollment.course_id),
+            'verification_status': verify_status_by_course.get(enrollment.course_id),
+            'resume_url': resume_url,
+        }
+        for enrollment, resume_url in zip(course_enrollments, resume_button_urls)
+    }
+
+
+def get_dashboard_snapshots(user, course_enrollments):
+    """
+    Returns the snapshots of the given enrollments of the user, keyed by
+    course, as computed by _compute_dashboard_snapshots.
+
+    When dashboard snapshots are enabled, snapshots are read from the cache
+    and only the missing or outdated ones are computed, then cached.
+    """
+    if not dashboard_snapshot.is_dashboard_snapshot_enabled():
+        return _compute_dashboard_snapshots(user, course_enrollments, course_enrollments)
+
+    versions = dashboard_snapshot.get_snapshot_versions(
+        user.id, [enrollment.course_id for enrollment in course_enrollments]
+    )
+    snapshots = dashboard_snapshot.get_cached_snapshots(user.id, versions)
+    missing_enrollments = [
+        enrollment for enrollment in course_enrollments if enrollment.course_id not in snapshots
+    ]
+    if missing_enrollments:
+        missing_snapshots = _compute_dashboard_snapshots(user, missing_enrollments, course_enrollments)
+        dashboard_snapshot.set_cached_snapshots(user.id, versions, missing_snapshots)
+        snapshots.update(missing_snapshots)
+    return snapshots
+
+
 @login_required
 @ensure_csrf_cookie
 @add_maintenance_banner
@@ -732,6 +795,10 @@ def student_dashboard(request):
         for enrollment in course_enrollments
     }
 
+    # Certificate, credit and verification statuses, and resume urls, come
+    # from the dashboard snapshots, which are cached when enabled.
+    dashboard_snapshots = get_dashboard_snapshots(user, course_enrollments)
+
     # Determine the per-course verification status
     # This is a dictionary in which the keys are course locators
     # and the values are one of:
@@ -746,10 +813,14 @@ def student_dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+    verify_status_by_course = {
+        course_id: snapshot['verification_status']
+        for course_id, snapshot in iteritems(dashboard_snapshots)
+        if snapshot['verification_status'] is not None
+    }
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview)
-        for enrollment in course_enrollments
+        course_id: snapshot['cert_status']
+        for course_id, snapshot in iteritems(dashboard_snapshots)
     }
 
     # only show email settings for Mongo course and when bulk email is turned on
@@ -848,7 +919,11 @@ def student_dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': {
+            enrollment.course_id: dashboard_snapshots[enrollment.course_id]['credit_status']
+            for enrollment in course_enrollments
+            if dashboard_snapshots[enrollment.course_id]['credit_status'] is not None
+        },
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_display': verification_status['should_display'],
@@ -895,8 +970,8 @@ def student_dashboard(request):
 
     # Gather urls for course card resume buttons.
     resume_button_urls = ['' for entitlement in course_entitlements]
-    for url in _get_urls_for_resume_buttons(user, course_enrollments):
-        resume_button_urls.append(url)
+    for enrollment in course_enrollments:
+        resume_button_urls.append(dashboard_snapshots[enrollment.course_id]['resume_url'])
     # There must be enough urls for dashboard.html. Template creates course
     # cards for "enrollments + entitlements".
     context.update({
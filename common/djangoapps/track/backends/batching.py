@@ -0,0 +1,190 @@
+"""
+Event tracker backend that hands events to another backend from a
+background thread, in batches.
+
+The request thread only puts the event in a bounded queue.  A background
+thread takes the events off the queue and sends them to the wrapped backend
+with its `send_batch` method, so that serializing and writing the events,
+e.g. with a single insert in Mongo, is done outside of the request.
+
+Example configuration::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.batching.BatchingBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...},
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'overflow': 'drop',
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Empty, Full, Queue
+
+from edx_django_utils import monitoring as monitoring_utils
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+DROP = 'drop'
+BLOCK = 'block'
+
+
+class BatchingBackend(BaseBackend):
+    """Event tracker backend that sends events to another backend in batches,
+    from a background thread."""
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, overflow=DROP, block_timeout=None,
+                 flush_timeout=5.0, **kwargs):
+        """
+        Wrap the backend configured by `backend`.
+
+        :Parameters:
+          - `backend`: the configuration of the wrapped backend, a dict
+            with the same ENGINE and OPTIONS keys as in TRACKING_BACKENDS.
+          - `max_queue_size`: the number of events that may be waiting to
+            be sent.
+          - `batch_size`: the largest number of events sent at once.
+          - `overflow`: what to do with an event when the queue is full:
+            'drop' it, or 'block' until there is room for it.
+          - `block_timeout`: how long, in seconds, to block before dropping
+            the event anyway, or None to block until there is room.
+          - `flush_timeout`: how long, in seconds, to wait for the queued
+            events to be sent when the process exits.
+
+        """
+        super(BatchingBackend, self).__init__(**kwargs)
+
+        if overflow not in (DROP, BLOCK):
+            raise ValueError('Invalid overflow policy %s' % overflow)
+
+        # Imported here, as the tracker imports the backends.
+        from track.tracker import _instantiate_backend_from_name
+
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.flush_timeout = flush_timeout
+        self.dropped_events = 0
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event to be sent by the background thread."""
+        queue = self._get_queue()
+        try:
+            if self.overflow == BLOCK:
+                queue.put(event, timeout=self.block_timeout)
+            else:
+                queue.put_nowait(event)
+        except Full:
+            self.dropped_events += 1
+            monitoring_utils.accumulate('track_batching_dropped_events', 1)
+            log.debug('Dropped event, the queue of the tracker backend is full')
+
+        monitoring_utils.set_custom_metric('track_batching_queue_depth', queue.qsize())
+
+    def send_batch(self, events):
+        """Queue the events to be sent by the background thread."""
+        for event in events:
+            self.send(event)
+
+    def flush(self, timeout=None):
+        """
+        Wait at most `timeout` seconds, or `flush_timeout` if not given, for
+        the queued events to be sent.  If the background thread is not
+        running, send them from the current thread.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            queue, thread = self._queue, self._thread
+
+        if not thread.is_alive():
+            while True:
+                batch = self._next_batch(queue, block=False)
+                if not batch:
+                    break
+                self._write(queue, batch)
+
+        timeout = self.flush_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        with queue.all_tasks_done:
+            while queue.unfinished_tasks:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    log.warning('Timed out sending the queued events of the tracker backend')
+                    break
+                queue.all_tasks_done.wait(remaining)
+
+    def _get_queue(self):
+        """
+        Return the queue of the events to send, starting the background
+        thread that sends them if this process has not started it yet.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # The thread of the process this one was forked from, if
+                # any, does not run here.
+                self._pid = os.getpid()
+                self._queue = Queue(maxsize=self.max_queue_size)
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name='track-batching-backend'
+                )
+                self._thread.daemon = True
+                self._thread.start()
+            return self._queue
+
+    def _run(self, queue):
+        """Send the events of the queue in batches, forever."""
+        while True:
+            batch = self._next_batch(queue, block=True)
+            if batch:
+                self._write(queue, batch)
+
+    def _next_batch(self, queue, block):
+        """
+        Take up to `batch_size` events off the queue, waiting for the first
+        one if `block`.
+        """
+        batch = []
+        try:
+            batch.append(queue.get(block))
+            while len(batch) < self.batch_size:
+                batch.append(queue.get_nowait())
+        except Empty:
+            pass
+        return batch
+
+    def _write(self, queue, batch):
+        """Send the batch of events to the wrapped backend."""
+        try:
+            self.backend.send_batch(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Keep the background thread alive; the events are lost.
+            log.exception('Error sending a batch of %d events to the tracker backend', len(batch))
+        finally:
+            for __ in batch:
+                queue.task_done()
@@ -34,6 +34,26 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_batch(self, events):
+        """
+        Serialize all the events before logging them, so that the logger
+        is only held while writing.  Events that cannot be serialized are
+        skipped, rather than failing the whole batch.
+        """
+        event_strs = []
+        for event in events:
+            try:
+                event_strs.append(self._serialize(event))
+            except UnicodeDecodeError:
+                continue
+
+        for event_str in event_strs:
+            self.event_logger.info(event_str)
+
+    def _serialize(self, event):
+        """Return the event as a JSON string."""
         try:
             event_str = json.dumps(event, cls=DateTimeJSONEncoder)
         except UnicodeDecodeError:
@@ -45,6 +65,4 @@ class LoggerBackend(BaseBackend):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
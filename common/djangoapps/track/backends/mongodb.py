@@ -96,3 +96,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection with a single query"""
+        if not events:
+            return
+        try:
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            # As in send, the events that could not be inserted are lost.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,81 @@
+"""Tests for the batching event tracker backend."""
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.batching import BatchingBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """A backend that keeps the batches of events it is sent."""
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.unblocked.wait()
+        self.batches.append(list(events))
+
+
+class TestBatchingBackend(TestCase):
+    """Tests for the batching event tracker backend."""
+
+    def create_backend(self, **kwargs):
+        """Return a BatchingBackend wrapping an InMemoryBackend."""
+        backend = BatchingBackend(
+            backend={'ENGINE': 'track.backends.tests.test_batching.InMemoryBackend'},
+            **kwargs
+        )
+        self.addCleanup(backend.backend.unblocked.set)
+        return backend
+
+    def test_events_sent_in_batches(self):
+        backend = self.create_backend(batch_size=2)
+        backend.backend.unblocked.clear()
+        events = [{'test': i} for i in range(5)]
+
+        for event in events:
+            backend.send(event)
+        backend.backend.unblocked.set()
+        backend.flush()
+
+        batches = backend.backend.batches
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual([event for batch in batches for event in batch], events)
+
+    def test_events_dropped_when_queue_full(self):
+        backend = self.create_backend(max_queue_size=1, batch_size=1)
+        backend.backend.unblocked.clear()
+
+        for i in range(5):
+            backend.send({'test': i})
+        backend.backend.unblocked.set()
+        backend.flush()
+
+        sent_events = [event for batch in backend.backend.batches for event in batch]
+        self.assertGreaterEqual(backend.dropped_events, 3)
+        self.assertEqual(len(sent_events) + backend.dropped_events, 5)
+
+    def test_events_blocked_when_queue_full(self):
+        backend = self.create_backend(max_queue_size=1, batch_size=1, overflow='block', block_timeout=5)
+        events = [{'test': i} for i in range(5)]
+
+        for event in events:
+            backend.send(event)
+        backend.flush()
+
+        self.assertEqual(backend.dropped_events, 0)
+        self.assertEqual([event for batch in backend.backend.batches for event in batch], events)
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            self.create_backend(overflow='wait')
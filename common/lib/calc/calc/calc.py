@@ -8,6 +8,8 @@ from __future__ import absolute_import
 import math
 import numbers
 import operator
+import threading
+from collections import OrderedDict
 
 import numpy
 from pyparsing import (
@@ -83,6 +85,9 @@ SUFFIXES = {
     '%': 0.01,
 }
 
+# Maximum number of compiled expressions kept by `compile_expression`.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
 
 class UndefinedVariable(Exception):
     """
@@ -218,20 +223,112 @@ def eval_product(parse_result):
     return prod
 
 
+# The following evaluation actions are the counterparts of the ones above
+# used by `evaluator_array`, where the values are arrays with one element per
+# point the expression is evaluated at.
+
+def array_operands(parse_result):
+    """
+    Return the values in the list of results, leaving out the operators and
+    parentheses.
+    """
+    return [k for k in parse_result if not isinstance(k, six.string_types)]
+
+
+def eval_array_atom(parse_result):
+    """
+    Return the value wrapped by the atom.
+    """
+    return array_operands(parse_result)[0]
+
+
+def eval_array_power(parse_result):
+    """
+    Exponentiate the values, right to left.
+    """
+    return reduce(lambda a, b: b ** a, reversed(array_operands(parse_result)))
+
+
+def eval_array_parallel(parse_result):
+    """
+    Compute values according to the parallel resistors operator.
+
+    NaN where there is a zero among the inputs.
+    """
+    operands = array_operands(parse_result)
+    if len(operands) == 1:
+        return operands[0]
+    is_zero = reduce(numpy.logical_or, [operand == 0 for operand in operands])
+    reciprocals = [1. / numpy.where(operand == 0, 1., operand) for operand in operands]
+    return numpy.where(is_zero, float('nan'), 1. / sum(reciprocals))
+
+
+def eval_array_sum(parse_result):
+    """
+    Add the values, keeping in mind their sign.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def eval_array_product(parse_result):
+    """
+    Multiply the values.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
+
+
+EVALUATE_ACTIONS = {
+    'atom': eval_atom,
+    'power': eval_power,
+    'parallel': eval_parallel,
+    'product': eval_product,
+    'sum': eval_sum,
+}
+
+EVALUATE_ARRAY_ACTIONS = {
+    'atom': eval_array_atom,
+    'power': eval_array_power,
+    'parallel': eval_array_parallel,
+    'product': eval_array_product,
+    'sum': eval_array_sum,
+}
+
+
 def add_defaults(variables, functions, case_sensitive):
     """
     Create dictionaries with both the default and user-defined variables.
     """
-    all_variables = dict(DEFAULT_VARIABLES)
-    all_functions = dict(DEFAULT_FUNCTIONS)
-    all_variables.update(variables)
-    all_functions.update(functions)
+    return (
+        with_defaults(DEFAULT_VARIABLES, variables, case_sensitive),
+        with_defaults(DEFAULT_FUNCTIONS, functions, case_sensitive),
+    )
+
+
+def with_defaults(defaults, values, case_sensitive):
+    """
+    Create a dictionary of the defaults updated with `values`.
+    """
+    all_values = dict(defaults)
+    all_values.update(values)
 
     if not case_sensitive:
-        all_variables = lower_dict(all_variables)
-        all_functions = lower_dict(all_functions)
+        all_values = lower_dict(all_values)
 
-    return (all_variables, all_functions)
+    return all_values
 
 
 def evaluator(variables, functions, math_expr, case_sensitive=False):
@@ -246,35 +343,208 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     if math_expr.strip() == "":
         return float('nan')
 
-    # Parse the tree.
+    # Parse the tree, or reuse it if it was parsed before.
+    compiled_expr = compile_expression(math_expr, case_sensitive)
+    return compiled_expr.evaluate(variables, functions)
+
+
+def evaluator_array(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at many points at once; that is, take a string of
+    math and return a NumPy array.
+
+    -Variables are passed as a dictionary from string to a NumPy array of
+     their values at each point, or to a number.
+    -Unary functions are passed as a dictionary from string to function, and
+     must accept arrays. The default functions do, except for the factorial.
+
+    The result has one element per point; it is a number if the expression
+    does not depend on the variables. The values match the ones `evaluator`
+    returns, up to floating point rounding, except where `evaluator` would
+    raise an error: there, floating point errors are handled as set by
+    `numpy.seterr`.
+    """
+    if math_expr.strip() == "":
+        return float('nan')
+
+    compiled_expr = compile_expression(math_expr, case_sensitive)
+    return compiled_expr.evaluate_array(variables, functions)
+
+
+def evaluator_many(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at many points; that is, take a string of math and
+    a list of variable dictionaries, and return a list of floats.
+
+    Equivalent to calling `evaluator` for each dictionary of variables, but
+    the expression is only parsed, and the functions only collected, once.
+    """
+    if math_expr.strip() == "":
+        return [float('nan')] * len(variables_list)
+
+    compiled_expr = compile_expression(math_expr, case_sensitive)
+    return compiled_expr.evaluate_many(variables_list, functions)
+
+
+_compiled_expressions = OrderedDict()
+_compiled_expressions_lock = threading.Lock()
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return a `CompiledExpression` for the given expression.
+
+    The most recently used `COMPILED_EXPRESSION_CACHE_SIZE` compiled expressions
+    are cached, so that an expression that is evaluated repeatedly, e.g. once
+    per sample of a formula problem, is only parsed once.
+
+    Raise UnmatchedParenthesis or pyparsing.ParseException if the expression
+    cannot be parsed.
+    """
+    key = (math_expr, case_sensitive)
+    with _compiled_expressions_lock:
+        compiled_expr = _compiled_expressions.pop(key, None)
+        if compiled_expr is not None:
+            _compiled_expressions[key] = compiled_expr
+            return compiled_expr
+
     check_parens(math_expr)
     math_interpreter = ParseAugmenter(math_expr, case_sensitive)
     math_interpreter.parse_algebra()
+    compiled_expr = CompiledExpression(math_interpreter)
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    with _compiled_expressions_lock:
+        _compiled_expressions[key] = compiled_expr
+        while len(_compiled_expressions) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _compiled_expressions.popitem(last=False)
+    return compiled_expr
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
+def clear_compiled_expressions():
+    """
+    Empty the cache of compiled expressions.
+    """
+    with _compiled_expressions_lock:
+        _compiled_expressions.clear()
+
+
+class CompiledExpression(object):
+    """
+    A parsed expression, compiled into nested closures so that it can be
+    evaluated for many values of its variables without being parsed again.
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    Each node of the parse tree becomes a closure that takes the variable and
+    function dictionaries, evaluates the closures of its child nodes, and
+    applies the same evaluation action as `evaluator` does.
+
+    The closures evaluating the expression for arrays of values are compiled
+    the first time they are needed.
+    """
+    def __init__(self, math_interpreter):
+        """
+        Compile the tree of the given, parsed, ParseAugmenter.
+        """
+        self.math_interpreter = math_interpreter
+        self.case_sensitive = math_interpreter.case_sensitive
+        self._evaluate = self._compile_node(math_interpreter.tree, EVALUATE_ACTIONS)
+        self._evaluate_array = None
+
+    def casify(self, name):
+        """
+        Return the name used to look up a variable or function.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def _compile_node(self, node, actions):
+        """
+        Return the closure evaluating the given node of the parse tree, using
+        the given evaluation actions.
+        """
+        node_name = node.getName()
+
+        if node_name == 'number':
+            value = eval_number(node)
+            return lambda all_variables, all_functions: value
+
+        if node_name == 'variable':
+            variable_name = self.casify(node[0])
+            return lambda all_variables, all_functions: all_variables[variable_name]
+
+        if node_name == 'function':
+            function_name = self.casify(node[0])
+            argument = self._compile_node(node[1], actions)
+            return lambda all_variables, all_functions: all_functions[function_name](
+                argument(all_variables, all_functions)
+            )
+
+        if node_name not in actions:  # pragma: no cover
+            raise Exception(u"Unknown branch name '{}'".format(node_name))
+        action = actions[node_name]
+
+        # Terminal nodes, i.e. operators and parentheses, are passed to the
+        # action as they are.
+        kids = [
+            self._compile_node(kid, actions) if isinstance(kid, ParseResults) else kid
+            for kid in node
+        ]
+        compiled_kids = [(index, kid) for index, kid in enumerate(kids) if callable(kid)]
+
+        def evaluate_node(all_variables, all_functions):
+            """
+            Return the value of the node.
+            """
+            handled_kids = list(kids)
+            for index, kid in compiled_kids:
+                handled_kids[index] = kid(all_variables, all_functions)
+            return action(handled_kids)
+
+        return evaluate_node
+
+    def check_variables(self, all_variables, all_functions):
+        """
+        Confirm that all the variables and functions used in the expression
+        are defined; raise UndefinedVariable otherwise.
+        """
+        self.math_interpreter.check_variables(all_variables, all_functions)
+
+    def evaluate(self, variables, functions):
+        """
+        Return the value of the expression for the given user-defined
+        variables and functions, as `evaluator` does.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self.check_variables(all_variables, all_functions)
+        return self._evaluate(all_variables, all_functions)
+
+    def evaluate_array(self, variables, functions):
+        """
+        Return the values of the expression for the given user-defined
+        variables, whose values may be arrays, and functions, as
+        `evaluator_array` does.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self.check_variables(all_variables, all_functions)
+        if self._evaluate_array is None:
+            self._evaluate_array = self._compile_node(self.math_interpreter.tree, EVALUATE_ARRAY_ACTIONS)
+        return self._evaluate_array(all_variables, all_functions)
+
+    def evaluate_many(self, variables_list, functions):
+        """
+        Return the list of the values of the expression for each of the given
+        dictionaries of user-defined variables.
+        """
+        all_functions = with_defaults(DEFAULT_FUNCTIONS, functions, self.case_sensitive)
+        checked_names = set()
+        results = []
+        for variables in variables_list:
+            all_variables = with_defaults(DEFAULT_VARIABLES, variables, self.case_sensitive)
+            # Whether the variables are defined only depends on their names.
+            variable_names = frozenset(all_variables)
+            if variable_names not in checked_names:
+                self.check_variables(all_variables, all_functions)
+                checked_names.add(variable_names)
+            results.append(self._evaluate(all_variables, all_functions))
+        return results
 
 
 def check_parens(formula):
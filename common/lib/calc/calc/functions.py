@@ -50,6 +50,8 @@ def arccot(val):
     """
     Inverse cotangent
     """
+    if numpy.ndim(val):
+        return numpy.where(numpy.real(val) < 0, -numpy.pi / 2 - numpy.arctan(val), numpy.pi / 2 - numpy.arctan(val))
     if numpy.real(val) < 0:
         return -numpy.pi / 2 - numpy.arctan(val)
     else:
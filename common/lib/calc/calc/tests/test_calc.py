@@ -4,6 +4,7 @@ Unit tests for calc.py
 
 from __future__ import absolute_import
 import unittest
+import mock
 import numpy
 import calc
 from pyparsing import ParseException
@@ -556,3 +557,78 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({}, {}, "(1+2")
         with self.assertRaisesRegexp(calc.UnmatchedParenthesis, 'no matching opening parenthesis'):
             calc.evaluator({}, {}, "(1+2))")
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Test the cache of compiled expressions and `calc.evaluator_many`
+    """
+
+    def setUp(self):
+        super(CompiledExpressionTest, self).setUp()
+        calc.clear_compiled_expressions()
+        self.addCleanup(calc.clear_compiled_expressions)
+
+    def test_compiled_expression_cache(self):
+        """
+        Expressions are parsed once per case sensitivity
+        """
+        compiled_expr = calc.compile_expression("x^2 + 1")
+        self.assertIs(calc.compile_expression("x^2 + 1"), compiled_expr)
+        self.assertIsNot(calc.compile_expression("x^2 + 1", case_sensitive=True), compiled_expr)
+
+        self.assertEqual(calc.evaluator({'x': 2}, {}, "x^2 + 1"), 5)
+        self.assertEqual(calc.evaluator({'x': 3}, {}, "x^2 + 1"), 10)
+
+    def test_compiled_expression_cache_size(self):
+        """
+        The least recently used expressions are evicted
+        """
+        with mock.patch('calc.calc.COMPILED_EXPRESSION_CACHE_SIZE', 2):
+            first_expr = calc.compile_expression("1")
+            second_expr = calc.compile_expression("2")
+            calc.compile_expression("1")
+            calc.compile_expression("3")
+
+            self.assertIs(calc.compile_expression("1"), first_expr)
+            self.assertIsNot(calc.compile_expression("2"), second_expr)
+
+    def test_evaluator_many(self):
+        """
+        Evaluating at many points matches evaluating at each point
+        """
+        variables_list = [{'x': 1.5, 'Y': 2}, {'x': -2, 'Y': 0.5}, {'x': 0, 'Y': 1}]
+        functions = {'f': lambda x: 2 * x}
+        for math_expr in ("f(x) * y^2 - sin(pi*x)", "x || y", "sqrt(x) + 3%", "-x/y + j"):
+            numpy.testing.assert_array_equal(
+                calc.evaluator_many(variables_list, functions, math_expr),
+                [calc.evaluator(variables, functions, math_expr) for variables in variables_list],
+            )
+
+    def test_evaluator_many_errors(self):
+        """
+        Evaluating at many points raises the same errors as `evaluator`
+        """
+        self.assertTrue(all(numpy.isnan(calc.evaluator_many([{}, {}], {}, " "))))
+        with self.assertRaisesRegexp(calc.UndefinedVariable, r'y'):
+            calc.evaluator_many([{'x': 1, 'y': 2}, {'x': 1}], {}, "x + y")
+        with self.assertRaisesRegexp(calc.UndefinedVariable, r'Y'):
+            calc.evaluator_many([{'x': 1}], {}, "x + Y", case_sensitive=True)
+        with self.assertRaises(calc.UnmatchedParenthesis):
+            calc.evaluator_many([{}], {}, "(1")
+
+    def test_evaluator_array(self):
+        """
+        Evaluating with arrays matches evaluating at each point
+        """
+        variables_list = [{'x': 1.5, 'y': 2.0}, {'x': -2.0, 'y': 0.5}, {'x': 0.0, 'y': 1.0}]
+        variables = {name: numpy.array([values[name] for values in variables_list]) for name in ('x', 'y')}
+        for math_expr in ("x^2 * y^3^0.5 - sin(pi*x)", "x || y", "y || 2", "sqrt(x) + 3%", "-x/y + j*arccot(x)"):
+            numpy.testing.assert_allclose(
+                calc.evaluator_array(variables, {}, math_expr),
+                calc.evaluator_many(variables_list, {}, math_expr),
+            )
+
+        self.assertEqual(calc.evaluator_array(variables, {}, "2^3"), 8)
+        with self.assertRaisesRegexp(calc.UndefinedVariable, r'z'):
+            calc.evaluator_array(variables, {}, "x + z")
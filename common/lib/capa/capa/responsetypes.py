@@ -39,7 +39,7 @@ from six import text_type
 import capa.safe_exec as safe_exec
 import capa.xqueue_interface as xqueue_interface
 # specific library imports
-from calc import UndefinedVariable, UnmatchedParenthesis, evaluator
+from calc import UndefinedVariable, UnmatchedParenthesis, evaluator, evaluator_array
 from cmath import isnan
 from openedx.core.djangolib.markup import HTML, Text
 
@@ -47,6 +47,7 @@ from . import correctmap
 from .registry import TagRegistry
 from .util import (
     compare_with_tolerance,
+    compare_with_tolerance_array,
     contextualize_text,
     convert_files_to_filenames,
     default_tolerance,
@@ -3144,6 +3145,40 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def evaluate_samples_array(self, answer, var_dict_list):
+        """
+        Takes in an answer and a list of dictionaries mapping variables to values,
+        as tupleize_answers does, and evaluates the answer for all of them at once
+        with NumPy arrays.
+
+        Returns an array of the formula evaluation results, or None if the answer
+        must be evaluated sample by sample instead: when it uses functions that
+        do not support arrays, when a floating point error occurs or a result is
+        not finite, or when the answer is invalid, so that tupleize_answers
+        reports the error.
+        """
+        if not var_dict_list:
+            return None
+
+        variables = {
+            var: numpy.array([var_dict[var] for var_dict in var_dict_list])
+            for var in var_dict_list[0]
+        }
+        # pylint: disable=broad-except
+        try:
+            # Where sample by sample evaluation raises an error or warns,
+            # array evaluation raises a FloatingPointError.
+            with numpy.errstate(all='raise', under='ignore'):
+                result = evaluator_array(variables, dict(), answer, case_sensitive=self.case_sensitive)
+            result = numpy.broadcast_to(result, (len(var_dict_list),))
+        except Exception as err:
+            log.debug('formularesponse: evaluating samples one by one after error %s in formula', err)
+            return None
+
+        if result.dtype.kind not in 'fc' or not numpy.isfinite(result).all():
+            return None
+        return result
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
@@ -3173,11 +3208,19 @@ class FormulaResponse(LoncapaResponse):
         "correct" or "incorrect".
         """
         var_dict_list = self.randomize_variables(samples)
-        student_result = self.tupleize_answers(given, var_dict_list)
-        instructor_result = self.tupleize_answers(expected, var_dict_list)
+        student_result = self.evaluate_samples_array(given, var_dict_list)
+        instructor_result = None
+        if student_result is not None:
+            instructor_result = self.evaluate_samples_array(expected, var_dict_list)
+
+        if instructor_result is not None:
+            correct = compare_with_tolerance_array(student_result, instructor_result, self.tolerance).all()
+        else:
+            student_result = self.tupleize_answers(given, var_dict_list)
+            instructor_result = self.tupleize_answers(expected, var_dict_list)
 
-        correct = all(compare_with_tolerance(student, instructor, self.tolerance)
-                      for student, instructor in zip(student_result, instructor_result))
+            correct = all(compare_with_tolerance(student, instructor, self.tolerance)
+                          for student, instructor in zip(student_result, instructor_result))
         if correct:
             return "correct"
         else:
@@ -0,0 +1,420 @@
+"""
+A pool of warm sandbox workers for capa's safe_exec.
+
+Starting a sandboxed Python process and importing numpy, scipy and the
+sandbox packages into it takes much longer than running most problem code.
+A worker is a long-lived sandboxed Python process that imports them once,
+then forks a child for each piece of code it is sent.  The child runs the
+code under the configured resource limits and exits, so nothing the code
+does outlives the call: each call starts from the worker's freshly imported
+state.  As with CodeJail, the child cannot start processes of its own, and
+its whole process group is killed if it runs out of time.
+
+Workers are started with the command CodeJail is configured with for
+"python", or with the current Python executable when the pool is used as a
+local, unsandboxed stand-in, e.g. in tests.  Like CodeJail, the files on the
+Python path and the extra files are put into a temporary directory that the
+code runs in.  Each job is handled in a function, so that nothing of
+one piece of code, its globals or its result stays reachable from the next.
+"""
+import json
+import logging
+import os
+import os.path
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+
+log = logging.getLogger(__name__)
+
+# The modules the workers import before running any code.
+PREIMPORTS = [
+    "numpy",
+    "scipy",
+    "sympy",
+    "math",
+    "calc",
+    "eia",
+    "chem.chemcalc",
+    "chem.chemtools",
+    "chem.miller",
+    "verifiers.draganddrop",
+]
+
+# The resource limits, from CodeJail's limits, that the workers apply to
+# the children running the code, and whether a limit of 0 means no limit,
+# as it does for CodeJail's CPU and VMEM.  A FSIZE of 0 means that no files
+# can be written.  The children also cannot start any processes.
+RLIMITS = [
+    ("CPU", "RLIMIT_CPU", True),
+    ("VMEM", "RLIMIT_AS", True),
+    ("FSIZE", "RLIMIT_FSIZE", False),
+]
+
+# The code run by the workers.  It reads one JSON job per line from stdin,
+# and writes one JSON result per line to stdout.  It runs in the sandbox's
+# Python, so must not depend on anything but the standard library.
+WORKER_CODE = r"""
+import json
+import os
+import resource
+import select
+import signal
+import sys
+import time
+import traceback
+
+for module_name in json.loads(sys.argv[1]):
+    try:
+        __import__(module_name)
+    except Exception:
+        pass
+
+try:
+    OK_TYPES = (type(None), int, long, float, str, unicode, list, tuple, dict)
+except NameError:
+    OK_TYPES = (type(None), int, float, str, bytes, list, tuple, dict)
+BAD_KEYS = ("__builtins__",)
+
+
+def jsonable(value):
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def run_job(job, result_fd):
+    os.setpgid(0, 0)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    for rlimit_name, value in job["rlimits"]:
+        resource.setrlimit(getattr(resource, rlimit_name), (value, value))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    os.chdir(job["tmp_dir"])
+    sys.path.extend(job["python_path"])
+
+    g_dict = job["globals"]
+    try:
+        exec(compile(job["code"], "<jailed code>", "exec"), g_dict)
+        g_dict = dict(
+            (key, value) for key, value in g_dict.items()
+            if jsonable(value) and key not in BAD_KEYS
+        )
+        result = {"status": 0, "globals": g_dict}
+    except BaseException:
+        result = {"status": 1, "stderr": traceback.format_exc()}
+    data = json.dumps(result).encode("utf-8")
+    while data:
+        data = data[os.write(result_fd, data):]
+
+
+def kill_process_group(pgid):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def wait_for_child(pid, result_fd, realtime):
+    chunks = []
+    deadline = time.time() + realtime if realtime else None
+    while True:
+        timeout = max(deadline - time.time(), 0) if deadline else None
+        ready, _, _ = select.select([result_fd], [], [], timeout)
+        if not ready:
+            kill_process_group(pid)
+            break
+        chunk = os.read(result_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    # Kill anything the child left behind in its process group.
+    kill_process_group(pid)
+    try:
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except ValueError:
+        if os.WIFSIGNALED(status):
+            status = -os.WTERMSIG(status)
+        else:
+            status = os.WEXITSTATUS(status) or 1
+        return {"status": status, "stderr": ""}
+
+
+def serve_job(line):
+    job = json.loads(line)
+    del line
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            run_job(job, write_fd)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    try:
+        # Also set by the child; whichever runs first avoids killing the
+        # worker's own group.
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    result = wait_for_child(pid, read_fd, job["realtime"])
+    os.close(read_fd)
+    sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    # Nothing of a job may outlive serve_job, which would leave it reachable
+    # by the code of the jobs after it.
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        serve_job(line)
+        del line
+
+
+main()
+"""
+
+
+class SandboxWorkerError(Exception):
+    """
+    A sandbox worker failed, or did not answer in time.
+    """
+    pass
+
+
+class SandboxWorker(object):
+    """
+    A sandboxed Python process that runs code in forked children.
+    """
+    def __init__(self, command, preimports):
+        self.process = subprocess.Popen(
+            command + ["-c", WORKER_CODE, json.dumps(preimports)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            close_fds=True,
+        )
+        self.jobs = 0
+
+    def run(self, job, timeout=None):
+        """
+        Sends the job to the worker, and returns its result.
+        """
+        self.jobs += 1
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+            if not ready:
+                raise SandboxWorkerError("The sandbox worker did not answer in time.")
+            line = self.process.stdout.readline()
+            if not line:
+                raise SandboxWorkerError("The sandbox worker exited.")
+            return json.loads(line)
+        except (IOError, OSError, ValueError) as error:
+            raise SandboxWorkerError(error)
+
+    def close(self):
+        """
+        Stops the worker.
+        """
+        try:
+            self.process.stdin.close()
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+        except (IOError, OSError):
+            # A worker running as another user may not be killable from here,
+            # but exits as soon as it reads the end of its input.
+            pass
+
+
+class SandboxPool(object):
+    """
+    A pool of up to `size` warm sandbox workers.
+
+    `command` is the command line that starts a sandboxed Python, by default
+    the one CodeJail is configured with.  With `unsafely`, the workers are
+    started with the current Python executable instead, without any
+    sandboxing.
+
+    Each worker is replaced after running `max_jobs_per_worker` pieces of
+    code.  Workers started by another process, e.g. before the current one
+    was forked, are never used.
+    """
+    def __init__(self, size, command=None, unsafely=False, limits=None, max_jobs_per_worker=100,
+                 preimports=None):
+        self.size = size
+        if command is None:
+            command = [sys.executable, "-E", "-B"] if unsafely else self.codejail_command()
+        self.command = command
+        self.limits = limits if limits is not None else getattr(jail_code, "LIMITS", {})
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.preimports = PREIMPORTS if preimports is None else preimports
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._idle_workers = []
+        self._num_workers = 0
+
+    @staticmethod
+    def codejail_command():
+        """
+        Returns the command line CodeJail runs sandboxed Python with, as
+        jail_code builds it.
+        """
+        python_command = jail_code.COMMANDS["python"]
+        command = []
+        if python_command.get("user"):
+            command.extend(["sudo", "-u", python_command["user"]])
+        command.extend(python_command["cmdline_start"])
+        return command
+
+    def warm(self):
+        """
+        Starts all the workers of the pool.
+        """
+        workers = [self._checkout() for _ in range(self.size)]
+        for worker in workers:
+            if worker is not None:
+                self._checkin(worker)
+
+    def close(self):
+        """
+        Stops the idle workers of the pool.
+        """
+        with self._lock:
+            workers, self._idle_workers = self._idle_workers, []
+            self._num_workers -= len(workers)
+        for worker in workers:
+            worker.close()
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Executes the code with the given globals in a sandbox worker, updating
+        globals_dict with the resulting globals, as codejail's safe_exec does.
+
+        Raises SafeExecException if the code fails.  If no worker is available,
+        or the worker fails, the code is run by codejail's safe_exec instead.
+        """
+        worker = self._checkout()
+        if worker is None:
+            log.info("No idle sandbox worker for %s, running it in a new sandbox.", slug)
+            return codejail_safe_exec(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+
+        tmp_dir = self._make_tmp_dir(python_path, extra_files)
+        try:
+            job = {
+                "code": code,
+                "globals": json_safe(globals_dict),
+                "tmp_dir": tmp_dir,
+                "python_path": [os.path.basename(pydir) for pydir in python_path or ()],
+                "rlimits": [
+                    (rlimit_name, self.limits.get(limit_name, 0))
+                    for limit_name, rlimit_name, zero_is_unlimited in RLIMITS
+                    if self.limits.get(limit_name) or not zero_is_unlimited
+                ],
+                "realtime": self.limits.get("REALTIME") or 0,
+            }
+            # The worker enforces the real time limit; allow it some slack
+            # before deciding that the worker itself is stuck.
+            timeout = job["realtime"] + 5 if job["realtime"] else None
+            result = worker.run(job, timeout)
+        except SandboxWorkerError:
+            log.exception("Sandbox worker failed running %s, running it in a new sandbox.", slug)
+            worker.close()
+            worker = None
+            with self._lock:
+                self._num_workers -= 1
+            return codejail_safe_exec(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if worker is not None:
+                self._checkin(worker)
+
+        if result["status"] != 0:
+            raise SafeExecException((
+                "Couldn't execute jailed code: stdout: '', "
+                "stderr: {stderr!r} with status code: {status}"
+            ).format(stderr=result.get("stderr", "").encode("utf-8"), status=result["status"]))
+        globals_dict.update(result["globals"])
+
+    def _checkout(self):
+        """
+        Returns an idle worker, starting one if the pool is not full, or None.
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                # The workers belong to the process this one was forked from.
+                self._pid = os.getpid()
+                self._idle_workers = []
+                self._num_workers = 0
+            if self._idle_workers:
+                return self._idle_workers.pop()
+            if self._num_workers >= self.size:
+                return None
+            self._num_workers += 1
+
+        try:
+            return SandboxWorker(self.command, self.preimports)
+        except (IOError, OSError):
+            log.exception("Couldn't start a sandbox worker.")
+            with self._lock:
+                self._num_workers -= 1
+            return None
+
+    def _checkin(self, worker):
+        """
+        Returns the worker to the pool, or stops it if it has run its share
+        of jobs.
+        """
+        if worker.jobs >= self.max_jobs_per_worker or worker.process.poll() is not None:
+            worker.close()
+            with self._lock:
+                self._num_workers -= 1
+            return
+        with self._lock:
+            if os.getpid() == self._pid:
+                self._idle_workers.append(worker)
+
+    @staticmethod
+    def _make_tmp_dir(python_path, extra_files):
+        """
+        Returns a new temporary directory holding copies of the files on the
+        Python path that are not extra files, and the extra files.
+        """
+        tmp_dir = tempfile.mkdtemp(prefix="codejail-")
+        os.chmod(tmp_dir, 0o755)
+        extra_filenames = set(filename for filename, _ in extra_files or ())
+        for pydir in python_path or ():
+            if pydir in extra_filenames:
+                continue
+            destination = os.path.join(tmp_dir, os.path.basename(pydir))
+            if os.path.isdir(pydir):
+                shutil.copytree(pydir, destination)
+            else:
+                shutil.copyfile(pydir, destination)
+        for filename, contents in extra_files or ():
+            with open(os.path.join(tmp_dir, filename), "wb") as extra_file:
+                extra_file.write(contents)
+        return tmp_dir
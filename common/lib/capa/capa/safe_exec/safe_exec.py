@@ -1,12 +1,19 @@
 """Capa's specialized use of codejail.safe_exec."""
 
+from codejail.jail_code import is_configured
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
+from django.conf import settings
+from edx_django_utils.monitoring import set_custom_metric
+from openedx.core.lib.cache_utils import LRUCache
 from . import lazymod
+from .pool import SandboxPool
 from six import text_type
 
+import copy
 import hashlib
+import threading
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -73,6 +80,89 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+_SANDBOX_POOL = None
+_RESULT_CACHE = None
+_lock = threading.Lock()
+
+
+def get_sandbox_pool():
+    """
+    Return the process's pool of warm sandbox workers, or None if it is not
+    enabled.
+
+    The pool is enabled by setting CODE_JAIL['pool_size'] to the number of
+    workers, once CodeJail is configured for Python.  It starts warming up
+    its workers in the background when first used.
+    """
+    global _SANDBOX_POOL  # pylint: disable=global-statement
+    if _SANDBOX_POOL is None:
+        code_jail_settings = getattr(settings, 'CODE_JAIL', {})
+        pool_size = code_jail_settings.get('pool_size', 0)
+        if not pool_size or not is_configured('python'):
+            return None
+        with _lock:
+            if _SANDBOX_POOL is None:
+                _SANDBOX_POOL = SandboxPool(
+                    pool_size,
+                    max_jobs_per_worker=code_jail_settings.get('pool_max_jobs_per_worker', 100),
+                )
+                warm_up = threading.Thread(target=_SANDBOX_POOL.warm, name='safe_exec_pool_warm_up')
+                warm_up.daemon = True
+                warm_up.start()
+    return _SANDBOX_POOL
+
+
+def get_result_cache():
+    """
+    Return the process-local cache of safe_exec results, or None if it is
+    not enabled.
+
+    The cache holds at most CODE_JAIL['result_cache_size'] results, and is
+    consulted before the cache passed to safe_exec.
+    """
+    global _RESULT_CACHE  # pylint: disable=global-statement
+    if _RESULT_CACHE is None:
+        result_cache_size = getattr(settings, 'CODE_JAIL', {}).get('result_cache_size', 0)
+        if not result_cache_size:
+            return None
+        _RESULT_CACHE = LRUCache(max_size=result_cache_size)
+    return _RESULT_CACHE
+
+
+def get_cached_result(cache, key):
+    """
+    Return the result cached for the key in the process-local cache of
+    results, or else in `cache`, or None.
+    """
+    result_cache = get_result_cache()
+    cached = result_cache.get(key) if result_cache is not None else None
+    if cached is not None:
+        set_custom_metric('safe_exec_cache', 'process_hit')
+        # Callers get their own copy of the globals to modify.
+        cached = copy.deepcopy(cached)
+    else:
+        cached = cache.get(key)
+        set_custom_metric('safe_exec_cache', 'miss' if cached is None else 'hit')
+        if cached is not None and result_cache is not None:
+            result_cache.set(key, copy.deepcopy(cached))
+
+    if result_cache is not None:
+        for counter_name, value in result_cache.stats().iteritems():
+            set_custom_metric('safe_exec_process_cache_{}'.format(counter_name), value)
+    return cached
+
+
+def set_cached_result(cache, key, result):
+    """
+    Cache the result for the key, in `cache` and in the process-local cache
+    of results.
+    """
+    cache.set(key, result)
+    result_cache = get_result_cache()
+    if result_cache is not None:
+        result_cache.set(key, result)
+
+
 def safe_exec(
     code,
     globals_dict,
@@ -116,7 +206,7 @@ def safe_exec(
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        cached = get_cached_result(cache, key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -133,7 +223,8 @@ def safe_exec(
     if unsafely:
         exec_fn = codejail_not_safe_exec
     else:
-        exec_fn = codejail_safe_exec
+        sandbox_pool = get_sandbox_pool()
+        exec_fn = sandbox_pool.safe_exec if sandbox_pool is not None else codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
     try:
@@ -150,7 +241,7 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
-        cache.set(key, (emsg, cleaned_results))
+        set_cached_result(cache, key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
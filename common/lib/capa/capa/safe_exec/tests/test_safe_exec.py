@@ -6,13 +6,20 @@ import os.path
 import random
 import textwrap
 import unittest
+from importlib import import_module
 
+import mock
 import pytest
 from six import text_type
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.pool import SandboxPool
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
+from openedx.core.lib.cache_utils import LRUCache
+
+# The safe_exec module, rather than the function of the same name.
+safe_exec_module = import_module('capa.safe_exec.safe_exec')
 
 
 class TestSafeExec(unittest.TestCase):
@@ -177,6 +184,146 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_process_cache(self):
+        cache = {}
+        with mock.patch.object(safe_exec_module, 'get_result_cache', return_value=LRUCache(10)):
+            with mock.patch.object(safe_exec_module, 'set_custom_metric') as mock_set_custom_metric:
+                g = {}
+                safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+                mock_set_custom_metric.assert_any_call('safe_exec_cache', 'miss')
+
+                # The result cached in the process is used before the shared cache.
+                cache[cache.keys()[0]] = (None, {'a': [17]})
+                g = {}
+                safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+                self.assertEqual(g['a'], [3])
+                mock_set_custom_metric.assert_any_call('safe_exec_cache', 'process_hit')
+                mock_set_custom_metric.assert_any_call('safe_exec_process_cache_hits', 1)
+
+                # Results are copied out of the process cache.
+                g['a'].append(4)
+                g = {}
+                safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+                self.assertEqual(g['a'], [3])
+
+    def test_sandbox_pool(self):
+        pool = SandboxPool(1, unsafely=True, preimports=['math'])
+        self.addCleanup(pool.close)
+        with mock.patch.object(safe_exec_module, 'get_sandbox_pool', return_value=pool):
+            g = {}
+            safe_exec("a = int(math.pi)", g, random_seed=17)
+            self.assertEqual(g['a'], 3)
+            with self.assertRaises(SafeExecException):
+                safe_exec("1/0", g)
+
+
+class TestSandboxPool(unittest.TestCase):
+    """Test the pool of warm sandbox workers, run unsafely."""
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.pool = SandboxPool(2, unsafely=True, preimports=['math'], max_jobs_per_worker=3)
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {'a': 17}
+        self.pool.safe_exec("import math\nb = a + 1\nc = math", g)
+        self.assertEqual(g, {'a': 17, 'b': 18})
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+    def test_python_path_and_extra_files(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        g = {}
+        self.pool.safe_exec(
+            "import constant; a = constant.THE_CONST; b = open('extra.txt').read()", g,
+            python_path=[pylib], extra_files=[('extra.txt', 'extra')],
+        )
+        self.assertEqual(g['a'], 23)
+        self.assertEqual(g['b'], 'extra')
+
+    def test_workers_are_reused_and_reset(self):
+        code = "import os, sys\nworker = os.getppid()\nleaked = hasattr(sys, 'leaked')\nsys.leaked = True"
+        results = []
+        for _ in range(4):
+            g = {}
+            self.pool.safe_exec(code, g)
+            results.append((g['worker'], g['leaked']))
+
+        # The worker is replaced after running 3 pieces of code, and nothing
+        # leaks from one to the next.
+        self.assertEqual(len(set(worker for worker, _ in results[:3])), 1)
+        self.assertNotEqual(results[3][0], results[0][0])
+        self.assertFalse(any(leaked for _, leaked in results))
+
+    def test_jobs_are_isolated(self):
+        pool = SandboxPool(1, unsafely=True, preimports=[])
+        self.addCleanup(pool.close)
+        g = {'submission': 'first' + '-job-secret'}
+        pool.safe_exec("answer = submission.upper()", g)
+
+        # The next piece of code, run by the same forked worker, cannot find
+        # anything of the first one: not at the worker's module scope, in
+        # the frames that forked it, nor anywhere else in its memory.
+        code = textwrap.dedent("""
+            import gc, sys
+            def leaks(value):
+                # The secret is only built here, so that this code holds no copy of it.
+                try:
+                    return '-'.join(['first', 'job', 'secret']) in repr(value).lower()
+                except Exception:
+                    return False
+            in_main = [name for name, value in vars(sys.modules['__main__']).items() if leaks(value)]
+            frame, in_frames = sys._getframe(), []
+            while frame is not None:
+                in_frames.extend(name for name, value in frame.f_locals.items() if leaks(value))
+                frame = frame.f_back
+            objects = gc.get_objects()
+            in_objects = len([
+                obj for obj in objects if obj is not objects and isinstance(obj, (dict, list)) and leaks(obj)
+            ])
+            del frame, objects, leaks
+        """)
+        g = {}
+        pool.safe_exec(code, g)
+        self.assertEqual((g['in_main'], g['in_frames'], g['in_objects']), ([], [], 0))
+
+    def test_time_limit(self):
+        self.pool.limits = {'REALTIME': 1}
+        with self.assertRaisesRegexp(SafeExecException, 'status code: -9'):
+            self.pool.safe_exec("import time\ntime.sleep(5)", {})
+
+        # The worker is still usable.
+        g = {}
+        self.pool.safe_exec("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_file_size_limit(self):
+        # A FSIZE of 0 means that no files can be written.
+        self.pool.limits = {'FSIZE': 0}
+        with self.assertRaisesRegexp(SafeExecException, 'File too large'):
+            self.pool.safe_exec("f = open('out.txt', 'w')\nf.write('out')\nf.close()", {})
+
+    @unittest.skipIf(os.geteuid() == 0, "root is not limited in the number of processes")
+    def test_no_subprocesses(self):
+        with self.assertRaises(SafeExecException):
+            self.pool.safe_exec("import os\nos.fork()", {})
+
+    @mock.patch('capa.safe_exec.pool.codejail_safe_exec')
+    def test_fallback(self, mock_codejail_safe_exec):
+        # A worker that dies is replaced, and the code is run by codejail.
+        self.pool.safe_exec("import os\nos.kill(os.getppid(), 9)", {})
+        self.assertTrue(mock_codejail_safe_exec.called)
+
+        # Without idle workers, the code is run by codejail as well.
+        self.pool.size = 0
+        mock_codejail_safe_exec.reset_mock()
+        self.pool.safe_exec("a = 1", {})
+        self.assertTrue(mock_codejail_safe_exec.called)
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
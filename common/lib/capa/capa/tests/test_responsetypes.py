@@ -576,6 +576,35 @@ class FormulaResponseTest(ResponseTest):
         self.assertTrue(list(problem.responders.values())[0].validate_answer('14*x'))
         self.assertFalse(list(problem.responders.values())[0].validate_answer('3*y+2*x'))
 
+    def test_grade_complex_samples(self):
+        """
+        Test that formulae with complex values are graded with arrays of samples.
+        """
+        sample_dict = {'x': (-10, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance="0.001%",
+                                     answer="sqrt(x) + i*arccot(x)")
+        with mock.patch('capa.responsetypes.compare_with_tolerance') as mock_compare:
+            self.assert_grade(problem, "j*arccot(x) + sqrt(x)", "correct")
+            self.assert_grade(problem, "j*arccot(x) + sqrt(abs(x))", "incorrect")
+        self.assertFalse(mock_compare.called)
+
+    @mock.patch('capa.responsetypes.evaluator_array', side_effect=TypeError)
+    def test_grade_array_fallback(self, mock_evaluator_array):
+        """
+        Test that formulae are graded sample by sample when they cannot be
+        evaluated with arrays.
+        """
+        sample_dict = {'x': (-10, 10), 'y': (1, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance=0.01,
+                                     answer="x+2*y")
+        self.assert_grade(problem, "2*x - x + y + y", "correct")
+        self.assert_grade(problem, "x + y", "incorrect")
+        self.assertTrue(mock_evaluator_array.called)
+
 
 class StringResponseTest(ResponseTest):  # pylint: disable=missing-docstring
     xml_factory_class = StringResponseXMLFactory
@@ -5,12 +5,21 @@ from __future__ import absolute_import
 
 import unittest
 
+import ddt
+import numpy
 from lxml import etree
 
 from capa.tests.helpers import test_capa_system
-from capa.util import compare_with_tolerance, get_inner_html_from_xpath, remove_markup, sanitize_html
+from capa.util import (
+    compare_with_tolerance,
+    compare_with_tolerance_array,
+    get_inner_html_from_xpath,
+    remove_markup,
+    sanitize_html
+)
 
 
+@ddt.ddt
 class UtilTest(unittest.TestCase):
     """Tests for util"""
     def setUp(self):
@@ -109,6 +118,29 @@ class UtilTest(unittest.TestCase):
         result = compare_with_tolerance(111.0, complex(100.0, 0), '10%', True)
         self.assertTrue(result)
 
+    @ddt.data(
+        ('0.001%', False),
+        ('10%', False),
+        ('10%', True),
+        ('0.1', True),
+        ('10.0', False),
+        (10.0, False),
+        (0, False),
+    )
+    @ddt.unpack
+    def test_compare_with_tolerance_array(self, tolerance, relative_tolerance):
+        infinity = float('Inf')
+        instructor_complexes = [100.0, 100.0, 100.0, 100.0, 100.0, 100.0, infinity, 1 + 2j, 1 + 2j, 0.3]
+        student_complexes = [100.0, 100.001, 109.9, 110.1, 111.0, float('NaN'), infinity, 1 + 2.1j, 11 + 2j, 0.1 + 0.2]
+
+        results = compare_with_tolerance_array(
+            numpy.array(student_complexes), numpy.array(instructor_complexes), tolerance, relative_tolerance,
+        )
+        self.assertEqual(results.tolist(), [
+            compare_with_tolerance(student_complex, instructor_complex, tolerance, relative_tolerance)
+            for student_complex, instructor_complex in zip(student_complexes, instructor_complexes)
+        ])
+
     def test_sanitize_html(self):
         """
         Test for html sanitization with bleach.
@@ -1,10 +1,12 @@
 """
 Utility functions for capa.
 """
+import numbers
 import re
 from decimal import Decimal
 
 import bleach
+import numpy
 from lxml import etree
 
 from calc import evaluator
@@ -94,6 +96,63 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+def compare_with_tolerance_array(student_complexes, instructor_complexes, tolerance=default_tolerance,
+                                 relative_tolerance=False):
+    """
+    Compare arrays of student and instructor results element by element, as
+    compare_with_tolerance does, and return an array of booleans.
+
+    The elements are compared with NumPy, except where the outcome could
+    depend on the rounding of the Decimal comparison of real numbers, or
+    where a value is not finite: those are compared with
+    compare_with_tolerance.
+    """
+    student_complexes = numpy.asarray(student_complexes)
+    instructor_complexes = numpy.asarray(instructor_complexes)
+    if not isinstance(tolerance, (str, numbers.Number)):
+        return numpy.array([
+            compare_with_tolerance(student_complex, instructor_complex, tolerance, relative_tolerance)
+            for student_complex, instructor_complex in zip(student_complexes, instructor_complexes)
+        ], dtype=bool)
+
+    student_abs = numpy.abs(student_complexes)
+    instructor_abs = numpy.abs(instructor_complexes)
+    if isinstance(tolerance, str):
+        if tolerance == default_tolerance:
+            relative_tolerance = True
+        if tolerance.endswith('%'):
+            tolerances = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            if not relative_tolerance:
+                tolerances = tolerances * instructor_abs
+        else:
+            tolerances = evaluator(dict(), dict(), tolerance)
+    else:
+        tolerances = tolerance
+
+    with numpy.errstate(all='ignore'):
+        if relative_tolerance:
+            tolerances = tolerances * numpy.maximum(student_abs, instructor_abs)
+        differences = numpy.abs(student_complexes - instructor_complexes)
+        results = differences <= tolerances
+
+        # Real numbers are compared as the Decimals of their str(), which may
+        # round them, so only differences clearly away from the tolerance are
+        # decided here.
+        is_real = (numpy.imag(student_complexes) == 0) & (numpy.imag(instructor_complexes) == 0)
+        margins = 1e-9 * (student_abs + instructor_abs + numpy.abs(tolerances))
+        decided = (
+            numpy.isfinite(student_complexes) & numpy.isfinite(instructor_complexes) & numpy.isfinite(tolerances) &
+            (~is_real | (numpy.abs(differences - tolerances) > margins))
+        )
+
+    results = numpy.array(numpy.broadcast_to(results, decided.shape))
+    for index in numpy.flatnonzero(~decided):
+        results[index] = compare_with_tolerance(
+            student_complexes[index], instructor_complexes[index], tolerance, relative_tolerance,
+        )
+    return results
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
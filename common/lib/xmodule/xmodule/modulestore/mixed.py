@@ -865,6 +865,19 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(course_key, 'create_xblock')
         return store.create_xblock(runtime, course_key, block_type, block_id, fields or {}, **kwargs)
 
+    def prefetch_structures(self, course_keys):
+        """
+        Fetches the structures of the given courses in bulk, in the modulestores that
+        support it, so that the courses aren't fetched one at a time when they are
+        loaded later in this request.
+        """
+        course_keys = [course_key for course_key in course_keys if not course_key.deprecated]
+        if not course_keys:
+            return
+        for store in self.modulestores:
+            if hasattr(store, 'prefetch_structures'):
+                store.prefetch_structures(course_keys)
+
     @strip_key
     def get_courses_for_wiki(self, wiki_slug, **kwargs):
         """
@@ -203,6 +203,65 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+def structure_delta_to_mongo(structure, base_structure, chain, course_context=None):
+    """
+    Converts a structure to a delta document holding only the blocks that
+        were added or changed since base_structure, in the format of
+        :func:`structure_to_mongo`, and the keys of the blocks deleted since.
+    The 'delta' key records the ``chain`` of ids of the structures the
+        delta applies to, starting with a full snapshot and ending with
+        base_structure.
+    """
+    with TIMER.timer('structure_delta_to_mongo', course_context) as tagger:
+        tagger.measure('blocks', len(structure['blocks']))
+
+        base_blocks = base_structure['blocks']
+        new_structure = dict(structure)
+        new_structure['blocks'] = []
+
+        for block_key, block in structure['blocks'].iteritems():
+            storable_block = block.to_storable()
+            base_block = base_blocks.get(block_key)
+            if base_block is not None and base_block.to_storable() == storable_block:
+                continue
+            new_block = dict(storable_block)
+            new_block.setdefault('block_type', block_key.type)
+            new_block['block_id'] = block_key.id
+            new_structure['blocks'].append(new_block)
+
+        new_structure['delta'] = {
+            'chain': chain,
+            'deleted': [list(block_key) for block_key in base_blocks.viewkeys() - structure['blocks'].viewkeys()],
+        }
+        tagger.measure('delta_blocks', len(new_structure['blocks']))
+
+        return new_structure
+
+
+def apply_structure_deltas(delta, chain_structures):
+    """
+    Returns the full mongo structure document encoded by the given delta
+        document, given the documents of the structures in its chain by id.
+    """
+    blocks = {}
+    for structure in [chain_structures[structure_id] for structure_id in delta['delta']['chain']] + [delta]:
+        if 'delta' not in structure:
+            # A full snapshot, possibly one written by compaction.
+            blocks = {}
+        else:
+            for block_key in structure['delta']['deleted']:
+                blocks.pop(tuple(block_key), None)
+        for block in structure['blocks']:
+            blocks[(block['block_type'], block['block_id'])] = block
+
+    new_structure = dict(delta)
+    del new_structure['delta']
+    # structure_from_mongo modifies the blocks and their fields in place,
+    # and the chain's blocks may be shared by several reconstructed structures.
+    new_structure['blocks'] = [dict(block, fields=dict(block['fields'])) for block in blocks.itervalues()]
+    return new_structure
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
@@ -256,6 +315,43 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+    def get_many(self, keys, course_context=None):
+        """
+        Pull the compressed, pickled structs for the given keys from cache in a single
+        round trip and deserialize them.  Returns a dict of the structures found, by key.
+        """
+        if self.cache is None:
+            return {}
+
+        with TIMER.timer("CourseStructureCache.get_many", course_context) as tagger:
+            compressed_pickled_data_by_key = self.cache.get_many(keys)
+            tagger.measure('requested', len(keys))
+            tagger.measure('found', len(compressed_pickled_data_by_key))
+            if len(compressed_pickled_data_by_key) < len(keys):
+                # Always log cache misses, because they are unexpected
+                tagger.sample_rate = 1
+
+            return {
+                key: pickle.loads(zlib.decompress(compressed_pickled_data))
+                for key, compressed_pickled_data in compressed_pickled_data_by_key.iteritems()
+            }
+
+    def set_many(self, structures, course_context=None):
+        """Given a dict of structures by key, will pickle, compress, and write them to cache at once."""
+        if self.cache is None:
+            return None
+
+        with TIMER.timer("CourseStructureCache.set_many", course_context) as tagger:
+            tagger.measure('structures', len(structures))
+            compressed_pickled_data_by_key = {
+                # 1 = Fastest (slightly larger results)
+                key: zlib.compress(pickle.dumps(structure, pickle.HIGHEST_PROTOCOL), 1)
+                for key, structure in structures.iteritems()
+            }
+
+            # Stuctures are immutable, so we set a timeout of "never"
+            self.cache.set_many(compressed_pickled_data_by_key, None)
+
 
 class MongoConnection(object):
     """
@@ -263,11 +359,16 @@ class MongoConnection(object):
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_snapshot_interval=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If structure_snapshot_interval is set, new structures are stored as deltas against
+        their previous version, with a full snapshot every structure_snapshot_interval versions.
         """
+        self.structure_snapshot_interval = structure_snapshot_interval
+
         # Set a write concern of 1, which makes writes complete successfully to the primary
         # only before returning. Also makes pymongo report write errors.
         kwargs['w'] = 1
@@ -314,6 +415,7 @@ class MongoConnection(object):
                             unicode(key)
                         )
                         return None
+                    doc = self._resolve_structure_deltas([doc], course_context)[0]
                     tagger_find_one.measure("blocks", len(doc['blocks']))
                     structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
@@ -322,6 +424,51 @@ class MongoConnection(object):
 
             return structure
 
+    @autoretry_read()
+    def get_structures(self, keys, course_context=None):
+        """
+        Get the structures from the persistence mechanism whose ids are the given keys.
+
+        Cached versions of the structures are read in a single cache round trip, and
+        all the structures missing from the cache are fetched with a single query and
+        then cached.
+
+        Returns a dict of the structures found, by id.
+        """
+        with TIMER.timer("get_structures", course_context) as tagger_get_structures:
+            keys = list(set(keys))
+            tagger_get_structures.measure("requested_ids", len(keys))
+            if not keys:
+                return {}
+
+            cache = CourseStructureCache()
+            structures = cache.get_many(keys, course_context)
+            missing_keys = [key for key in keys if key not in structures]
+            tagger_get_structures.measure("cache_misses", len(missing_keys))
+            if missing_keys:
+                # Always log cache misses, because they are unexpected
+                tagger_get_structures.sample_rate = 1
+
+                with TIMER.timer("get_structures.find", course_context) as tagger_find:
+                    fetched_structures = {
+                        doc['_id']: structure_from_mongo(doc, course_context)
+                        for doc in self._resolve_structure_deltas(
+                            self.structures.find({'_id': {'$in': missing_keys}}), course_context,
+                        )
+                    }
+                    tagger_find.measure("structures", len(fetched_structures))
+                    tagger_find.sample_rate = 1
+
+                if len(fetched_structures) < len(missing_keys):
+                    log.warning(
+                        "docs were None when attempting to retrieve structures with keys %s",
+                        [unicode(key) for key in missing_keys if key not in fetched_structures]
+                    )
+                cache.set_many(fetched_structures, course_context)
+                structures.update(fetched_structures)
+
+            return structures
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
@@ -334,7 +481,9 @@ class MongoConnection(object):
             tagger.measure("requested_ids", len(ids))
             docs = [
                 structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({'_id': {'$in': ids}})
+                for structure in self._resolve_structure_deltas(
+                    self.structures.find({'_id': {'$in': ids}}), course_context,
+                )
             ]
             tagger.measure("structures", len(docs))
             return docs
@@ -350,13 +499,31 @@ class MongoConnection(object):
         """
         with TIMER.timer("find_courselike_blocks_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
-            docs = [
-                structure_from_mongo(structure, course_context)
-                for structure in self.structures.find(
-                    {'_id': {'$in': ids}},
-                    {'blocks': {'$elemMatch': {'block_type': block_type}}, 'root': 1}
-                )
-            ]
+            structures = list(self.structures.find(
+                {'_id': {'$in': ids}},
+                {'blocks': {'$elemMatch': {'block_type': block_type}}, 'root': 1, 'delta': 1}
+            ))
+            delta_ids = [structure['_id'] for structure in structures if 'delta' in structure]
+            if delta_ids:
+                # The courselike block is only in a delta if it changed in that version.
+                full_structures = {
+                    structure['_id']: structure
+                    for structure in self._resolve_structure_deltas(
+                        self.structures.find({'_id': {'$in': delta_ids}}), course_context,
+                    )
+                }
+                structures = [
+                    structure if 'delta' not in structure else {
+                        '_id': structure['_id'],
+                        'root': structure['root'],
+                        'blocks': [
+                            block for block in full_structures[structure['_id']]['blocks']
+                            if block['block_type'] == block_type
+                        ][:1],
+                    }
+                    for structure in structures
+                ]
+            docs = [structure_from_mongo(structure, course_context) for structure in structures]
             tagger.measure("structures", len(docs))
             return docs
 
@@ -372,7 +539,9 @@ class MongoConnection(object):
             tagger.measure("base_ids", len(ids))
             docs = [
                 structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({'previous_version': {'$in': ids}})
+                for structure in self._resolve_structure_deltas(
+                    self.structures.find({'previous_version': {'$in': ids}}), course_context,
+                )
             ]
             tagger.measure("structures", len(docs))
             return docs
@@ -387,9 +556,11 @@ class MongoConnection(object):
             block_key (BlockKey): The id of the block in question
         """
         with TIMER.timer("find_ancestor_structures", course_context) as tagger:
+            # A delta only contains the block if it changed in that version, which
+            # are the versions this is used to find.
             docs = [
                 structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({
+                for structure in self._resolve_structure_deltas(self.structures.find({
                     'original_version': original_version,
                     'blocks': {
                         '$elemMatch': {
@@ -400,7 +571,7 @@ class MongoConnection(object):
                             },
                         },
                     },
-                })
+                }), course_context)
             ]
             tagger.measure("structures", len(docs))
             return docs
@@ -408,10 +579,86 @@ class MongoConnection(object):
     def insert_structure(self, structure, course_context=None):
         """
         Insert a new structure into the database.
+
+        If structures are stored as deltas, the structure is stored as a delta against
+        its previous version, unless a full snapshot is due.
         """
         with TIMER.timer("insert_structure", course_context) as tagger:
             tagger.measure("blocks", len(structure["blocks"]))
-            self.structures.insert(structure_to_mongo(structure, course_context))
+            delta = self._structure_delta(structure, course_context)
+            tagger.tag(delta=str(delta is not None).lower())
+            if delta is None:
+                self.structures.insert(structure_to_mongo(structure, course_context))
+            else:
+                self.structures.insert(delta)
+
+    def _structure_delta(self, structure, course_context=None):
+        """
+        Returns the delta document to store for the given structure, or None if
+        the structure should be stored as a full snapshot.
+        """
+        base_id = structure.get('previous_version')
+        if not self.structure_snapshot_interval or base_id is None:
+            return None
+
+        base_doc = self.structures.find_one({'_id': base_id}, {'delta.chain': 1})
+        if base_doc is None:
+            return None
+        chain = base_doc.get('delta', {}).get('chain', []) + [base_id]
+        if len(chain) >= self.structure_snapshot_interval:
+            return None
+
+        base_structure = self.get_structure(base_id, course_context)
+        if base_structure is None:
+            return None
+        return structure_delta_to_mongo(structure, base_structure, chain, course_context)
+
+    def _resolve_structure_deltas(self, docs, course_context=None):
+        """
+        Returns the given structure documents, with those stored as deltas replaced
+        by the full structure documents they encode.
+
+        The structures in the chains of all the deltas are fetched in a single query.
+        """
+        docs = list(docs)
+        chain_ids = set()
+        for doc in docs:
+            if 'delta' in doc:
+                chain_ids.update(doc['delta']['chain'])
+        if not chain_ids:
+            return docs
+
+        with TIMER.timer("resolve_structure_deltas", course_context) as tagger:
+            tagger.measure("chain_structures", len(chain_ids))
+            chain_structures = {
+                structure['_id']: structure
+                for structure in self.structures.find({'_id': {'$in': list(chain_ids)}})
+            }
+            return [
+                apply_structure_deltas(doc, chain_structures) if 'delta' in doc else doc
+                for doc in docs
+            ]
+
+    def find_delta_structure_ids(self):
+        """
+        Return the ids of all the structures stored as deltas.
+        """
+        return [doc['_id'] for doc in self.structures.find({'delta': {'$exists': True}}, {'_id': 1})]
+
+    def compact_structure(self, key, course_context=None):
+        """
+        Rewrites the structure whose id is the given key as a full snapshot, if it
+        is stored as a delta, so it can be read without applying deltas.
+
+        Returns whether the structure was rewritten.
+        """
+        with TIMER.timer("compact_structure", course_context):
+            doc = self.structures.find_one({'_id': key})
+            if doc is None or 'delta' not in doc:
+                return False
+            doc = self._resolve_structure_deltas([doc], course_context)[0]
+            self.structures.update({'_id': key}, doc)
+            return True
 
     def get_course_index(self, key, ignore_case=False):
         """
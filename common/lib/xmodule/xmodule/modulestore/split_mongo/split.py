@@ -329,7 +329,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
             # The structure hasn't been loaded from the db yet, so load it
             if structure is None:
-                structure = self.db_connection.get_structure(version_guid, course_key)
+                structure = self._pop_prefetched_structure(course_key.as_object_id(version_guid))
+                if structure is None:
+                    structure = self.db_connection.get_structure(version_guid, course_key)
                 bulk_write_record.structures[version_guid] = structure
                 if structure is not None:
                     bulk_write_record.structures_in_db.add(version_guid)
@@ -338,7 +340,33 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         else:
             # cast string to ObjectId if necessary
             version_guid = course_key.as_object_id(version_guid)
-            return self.db_connection.get_structure(version_guid, course_key)
+            structure = self._pop_prefetched_structure(version_guid)
+            if structure is None:
+                structure = self.db_connection.get_structure(version_guid, course_key)
+            return structure
+
+    def _get_prefetched_structures(self):
+        """
+        Returns the dict of structures prefetched for this request by
+        :meth:`prefetch_structures`, by version_guid, or None if there is
+        no request cache.
+        """
+        request_cache = getattr(self, 'request_cache', None)
+        if request_cache is None:
+            return None
+        return request_cache.data.setdefault('prefetched_structures', {})
+
+    def _pop_prefetched_structure(self, version_guid):
+        """
+        Removes and returns the prefetched structure with the given version_guid, if any.
+
+        Each prefetched structure is handed out once, as callers may modify the
+        structures they get.
+        """
+        prefetched_structures = self._get_prefetched_structures()
+        if not prefetched_structures:
+            return None
+        return prefetched_structures.pop(version_guid, None)
 
     def update_structure(self, course_key, structure):
         """
@@ -697,14 +725,18 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, structure_snapshot_interval=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_snapshot_interval: if set, new structures are stored as deltas against their
+            previous version, with a full snapshot every structure_snapshot_interval versions.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(
+            structure_snapshot_interval=structure_snapshot_interval, **doc_store_config
+        )
 
         if default_class is not None:
             module_path, __, class_name = default_class.rpartition('.')
@@ -865,6 +897,32 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             self.request_cache.data['course_cache'] = {}
 
+    def prefetch_structures(self, course_keys):
+        """
+        Fetches the structures of the given courses and libraries in bulk, so that
+        loading them later in this request doesn't fetch them one at a time.
+
+        Each key must specify either a version_guid or a branch.
+        """
+        prefetched_structures = self._get_prefetched_structures()
+        if prefetched_structures is None:
+            return
+
+        version_guids = set()
+        course_keys_by_branch = defaultdict(list)
+        for course_key in course_keys:
+            if course_key.version_guid:
+                version_guids.add(course_key.as_object_id(course_key.version_guid))
+            elif course_key.branch:
+                course_keys_by_branch[course_key.branch].append(course_key)
+        for branch, branch_course_keys in course_keys_by_branch.iteritems():
+            for course_index in self.find_matching_course_indexes(branch, course_keys=branch_course_keys):
+                version_guids.add(course_index['versions'][branch])
+
+        version_guids.difference_update(prefetched_structures)
+        if version_guids:
+            prefetched_structures.update(self.db_connection.get_structures(list(version_guids)))
+
     def _lookup_course(self, course_key, head_validation=True):
         """
         Decode the locator into the right series of db access. Does not
@@ -65,6 +65,13 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         library_id = self._map_revision_to_branch(library_id)
         return super(DraftVersioningModuleStore, self).get_library(library_id, depth=depth, **kwargs)
 
+    def prefetch_structures(self, course_keys):
+        """
+        See :py:meth: xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.prefetch_structures
+        """
+        course_keys = [self._map_revision_to_branch(course_key) for course_key in course_keys]
+        super(DraftVersioningModuleStore, self).prefetch_structures(course_keys)
+
     def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, revision=None, **kwargs):
         """
         See :py:meth: xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.clone_course
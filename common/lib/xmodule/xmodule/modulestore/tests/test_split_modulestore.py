@@ -1,7 +1,7 @@
 """
     Test split modulestore w/o using any django stuff.
 """
-from mock import patch
+from mock import Mock, patch
 import datetime
 from importlib import import_module
 from path import Path as path
@@ -999,13 +999,50 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_get_structures(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        other_course = modulestore().create_course(
+            'org', 'other_course', 'test_run', self.user, BRANCH_NAME_DRAFT,
+        )
+        version_guids = [self._version_guid(course) for course in (self.new_course, other_course)]
+        cached_structure = self._get_structure(self.new_course)
+
+        # the structure missing from the cache is fetched in a single query
+        with check_mongo_calls(1):
+            structures = modulestore().db_connection.get_structures(version_guids)
+        self.assertEqual(structures[version_guids[0]], cached_structure)
+        self.assertEqual(structures[version_guids[1]], self._get_structure(other_course))
+
+        # and all the structures are cached afterwards
+        with check_mongo_calls(0):
+            self.assertEqual(modulestore().db_connection.get_structures(version_guids), structures)
+
+    def test_prefetch_structures(self):
+        store = modulestore()
+        version_guid = self._version_guid(self.new_course)
+        with patch.object(store, 'request_cache', Mock(data={})):
+            store.prefetch_structures([self.new_course.id.version_agnostic()])
+
+            # the prefetched structure is handed out once
+            with check_mongo_calls(0):
+                prefetched_structure = store.get_structure(self.new_course.id, version_guid)
+            with check_mongo_calls(1):
+                structure = store.get_structure(self.new_course.id, version_guid)
+
+        self.assertEqual(prefetched_structure, structure)
+
+    def _version_guid(self, course):
+        """
+        Helper function to get the structure id of a course.
+        """
+        return course.location.as_object_id(course.location.version_guid)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
         """
-        return modulestore().db_connection.get_structure(
-            course.location.as_object_id(course.location.version_guid)
-        )
+        return modulestore().db_connection.get_structure(self._version_guid(course))
 
 
 class SplitModuleItemTests(SplitModuleTest):
@@ -2210,6 +2247,87 @@ class TestPublish(SplitModuleTest):
         self.assertEqual(source_block_keys, dest_block_keys)
 
 
+class TestStructureDeltas(SplitModuleTest):
+    """
+    Test storing structures as deltas against their previous version
+    """
+    def setUp(self):
+        super(TestStructureDeltas, self).setUp()
+        self.db_connection = modulestore().db_connection
+        self.db_connection.structure_snapshot_interval = 3
+        self.course = modulestore().create_course(
+            'org', 'course', 'delta_run', self.user_id, BRANCH_NAME_DRAFT,
+        )
+
+    def _edit_course(self, num_edits):
+        """
+        Adds num_edits chapters to the course, one version at a time, and
+        returns the ids of the new versions.
+        """
+        version_guids = []
+        for __ in range(num_edits):
+            modulestore().create_child(self.user_id, self.course.location.version_agnostic(), 'chapter')
+            version_guids.append(self._head_version_guid())
+        return version_guids
+
+    def _head_version_guid(self):
+        """
+        Returns the id of the course's current structure.
+        """
+        return modulestore().get_course(self.course.id.version_agnostic()).location.version_guid
+
+    def test_deltas(self):
+        version_guids = self._edit_course(4)
+        raw_structures = [self.db_connection.structures.find_one({'_id': guid}) for guid in version_guids]
+
+        # the first 2 versions are deltas against the course's initial
+        # snapshot, and the third starts a new chain
+        self.assertEqual(['delta' in raw for raw in raw_structures], [True, True, False, True])
+        self.assertEqual(len(raw_structures[1]['blocks']), 2)
+        self.assertEqual(raw_structures[1]['delta']['chain'][1:], [version_guids[0]])
+        self.assertEqual(raw_structures[3]['delta']['chain'], [version_guids[2]])
+
+        # each version is read in full
+        for num_chapters, guid in enumerate(version_guids, start=1):
+            structure = self.db_connection.get_structure(guid)
+            self.assertEqual(
+                len([block_key for block_key in structure['blocks'] if block_key.type == 'chapter']),
+                num_chapters,
+            )
+        course = modulestore().get_course(self.course.id.version_agnostic())
+        self.assertEqual(len(course.children), 4)
+
+    def test_deleted_blocks(self):
+        version_guids = self._edit_course(1)
+        chapter_usage_key = modulestore().get_course(self.course.id.version_agnostic()).children[0]
+        modulestore().delete_item(chapter_usage_key.version_agnostic(), self.user_id)
+
+        course = modulestore().get_course(self.course.id.version_agnostic())
+        raw_structure = self.db_connection.structures.find_one({'_id': self._head_version_guid()})
+        self.assertEqual(
+            raw_structure['delta']['deleted'],
+            [[chapter_usage_key.block_type, chapter_usage_key.block_id]],
+        )
+        self.assertEqual(course.children, [])
+        self.assertIn(
+            BlockKey.from_usage_key(chapter_usage_key),
+            self.db_connection.get_structure(version_guids[0])['blocks'],
+        )
+
+    def test_compact_structure(self):
+        version_guid = self._edit_course(2)[-1]
+        structure = self.db_connection.get_structure(version_guid)
+
+        self.assertIn(version_guid, self.db_connection.find_delta_structure_ids())
+        self.assertTrue(self.db_connection.compact_structure(version_guid))
+        self.assertFalse(self.db_connection.compact_structure(version_guid))
+
+        raw_structure = self.db_connection.structures.find_one({'_id': version_guid})
+        self.assertNotIn('delta', raw_structure)
+        self.assertEqual(self.db_connection.get_structure(version_guid), structure)
+        self.assertNotIn(version_guid, self.db_connection.find_delta_structure_ids())
+
+
 class TestSchema(SplitModuleTest):
     """
     Test the db schema (and possibly eventually migrations?)
@@ -10,7 +10,7 @@ from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from openedx.core.lib.cache_utils import get_cache
-from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider
+from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
@@ -174,6 +174,7 @@ def override_field_for_ccx(ccx, block, name, value):
 
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+    clear_resolved_overrides()
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -207,6 +208,7 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):
         ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
+    clear_resolved_overrides()
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -217,3 +219,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        clear_resolved_overrides()
@@ -13,8 +13,13 @@ Note: The access control logic in this file does NOT check for enrollment in
 import logging
 from datetime import datetime
 
+from crum import get_current_request
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from pytz import UTC
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from six import text_type
@@ -45,7 +50,7 @@ from mobile_api.models import IgnoreMobileAvailableFlagConfig
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.features.course_duration_limits.access import check_course_expired
 from student import auth
-from student.models import CourseEnrollmentAllowed
+from student.models import CourseAccessRole, CourseEnrollment, CourseEnrollmentAllowed
 from student.roles import (
     CourseBetaTesterRole,
     CourseCcxCoachRole,
@@ -69,6 +74,8 @@ from xmodule.x_module import XModule
 
 log = logging.getLogger(__name__)
 
+ACCESS_CACHE_NAMESPACE = u'courseware.access.decisions'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -128,11 +135,98 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    Within a request, the decisions are cached by user, masquerade, action and
+    object, see clear_access_cache.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    cache_key = _access_cache_key(user, action, obj, course_key)
+    if cache_key is None:
+        return _has_access(user, action, obj, course_key)
+
+    decisions = RequestCache(ACCESS_CACHE_NAMESPACE).data
+    try:
+        response = decisions[cache_key]
+    except KeyError:
+        response = decisions[cache_key] = _has_access(user, action, obj, course_key)
+    else:
+        monitoring_utils.accumulate(u'has_access.cache_hits', 1)
+    return response
+
+
+def clear_access_cache():
+    """
+    Clears the access decisions cached during the current request.
+
+    Must be called whenever something that has_access depends on changes
+    during a request, so that the new decisions are seen by the rest of the
+    request.  Changes to course access roles and enrollments clear it
+    automatically.
+    """
+    RequestCache(ACCESS_CACHE_NAMESPACE).clear()
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def _clear_access_cache_on_role_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached access decisions when a course access role changes.
+    """
+    clear_access_cache()
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_save, sender=CourseEnrollmentAllowed)
+@receiver(post_delete, sender=CourseEnrollmentAllowed)
+def _clear_access_cache_on_enrollment_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached access decisions when an enrollment changes, e.g. when
+    a learner enrolls or upgrades, since course expiration and enrollment
+    access depend on it.
+    """
+    clear_access_cache()
+
+
+def _access_cache_key(user, action, obj, course_key):
+    """
+    Returns the key of the access decision in the request cache, or None if it
+    must not be cached: outside of requests, and for objects that either have
+    no stable key or delegate to another object's decision.
+
+    The key holds the user's masquerades, which change the decisions of staff
+    users.
+    """
+    if get_current_request() is None:
+        return None
+
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
+        obj_key = obj.id
+    elif isinstance(obj, (ErrorDescriptor, XModule)):
+        return None
+    elif isinstance(obj, XBlock):
+        obj_key = obj.scope_ids.usage_id
+    elif isinstance(obj, (CourseKey, UsageKey, basestring)):
+        obj_key = obj
+    else:
+        return None
+
+    masquerades = tuple(sorted(
+        (text_type(masquerade_course_key), masquerade.role, masquerade.user_partition_id, masquerade.group_id,
+         masquerade.user_name)
+        for masquerade_course_key, masquerade in getattr(user, 'masquerade_settings', {}).iteritems()
+        if masquerade is not None
+    ))
+    return (user.id, masquerades, action, type(obj).__name__, obj_key, course_key)
+
+
+def _has_access(user, action, obj, course_key):
+    """
+    Decides whether the user has access to do action on obj, see has_access.
+    """
     # Preview mode is only accessible by staff.
     if in_preview_mode() and course_key:
         if not has_staff_access_to_preview_mode(user, course_key):
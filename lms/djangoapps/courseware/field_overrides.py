@@ -19,7 +19,8 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -27,6 +28,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+RESOLVED_OVERRIDES_NAMESPACE = u'courseware.field_overrides.resolved_overrides'
 
 
 def resolve_dotted(name):
@@ -48,15 +50,25 @@ def resolve_dotted(name):
     return target
 
 
-def _lineage(block):
+def _block_cache_key(block):
     """
-    Returns an iterator over all ancestors of the given block, starting with
-    its immediate parent and ending at the root of the block tree.
+    Returns the key identifying the given block in the cache of resolved
+    overrides.
     """
-    parent = block.get_parent()
-    while parent:
-        yield parent
-        parent = parent.get_parent()
+    scope_ids = getattr(block, 'scope_ids', None)
+    if scope_ids is None:
+        return block
+    return scope_ids.usage_id
+
+
+def clear_resolved_overrides():
+    """
+    Clears the field overrides resolved during the current request.
+
+    Must be called whenever overrides are set or cleared, so that the new
+    values are seen by the rest of the request.
+    """
+    RequestCache(RESOLVED_OVERRIDES_NAMESPACE).clear()
 
 
 class _OverridesDisabled(threading.local):
@@ -145,6 +157,11 @@ class OverrideFieldData(FieldData):
     is important for this setting.  Override providers will tried in the order
     configured in the setting.  The first provider to find an override 'wins'
     for a particular field lookup.
+
+    The overrides found, and those inherited from ancestors, are cached for
+    the rest of the request, and shared by all instances for the same user
+    and providers.  Setting or deleting a field clears that cache, as does
+    `clear_resolved_overrides`.
     """
     provider_classes = None
 
@@ -200,18 +217,60 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._cache_scope = (type(self), getattr(user, 'id', user), tuple(providers))
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
+        if overrides_disabled():
+            return NOTSET
+
+        resolved_overrides = RequestCache(RESOLVED_OVERRIDES_NAMESPACE).data
+        cache_key = (self._cache_scope, u'override', _block_cache_key(block), name)
+        try:
+            value = resolved_overrides[cache_key]
+        except KeyError:
+            value = NOTSET
             for provider in self.providers:
+                monitoring_utils.accumulate(u'field_overrides.provider_calls', 1)
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
-                    return value
-        return NOTSET
+                    break
+            resolved_overrides[cache_key] = value
+        else:
+            monitoring_utils.accumulate(u'field_overrides.cache_hits', 1)
+        return value
+
+    def get_inherited_override(self, block, name):
+        """
+        Checks for an override for the field identified by `name` in the
+        ancestors of `block`.  Returns the overridden value of the closest
+        ancestor that has one or `NOTSET` if no override is found.
+
+        The result is cached for each block, so that the overrides inherited
+        by a subtree are only looked up once, however deep it is.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        resolved_overrides = RequestCache(RESOLVED_OVERRIDES_NAMESPACE).data
+        cache_key = (self._cache_scope, u'inherited', _block_cache_key(block), name)
+        try:
+            return resolved_overrides[cache_key]
+        except KeyError:
+            pass
+
+        parent = block.get_parent()
+        if parent:
+            value = self.get_override(parent, name)
+            if value is NOTSET:
+                value = self.get_inherited_override(parent, name)
+        else:
+            value = NOTSET
+        resolved_overrides[cache_key] = value
+        return value
 
     def get(self, block, name):
         value = self.get_override(block, name)
@@ -221,9 +280,11 @@ class OverrideFieldData(FieldData):
 
     def set(self, block, name, value):
         self.fallback.set(block, name, value)
+        clear_resolved_overrides()
 
     def delete(self, block, name):
         self.fallback.delete(block, name)
+        clear_resolved_overrides()
 
     def has(self, block, name):
         if not self.providers:
@@ -235,15 +296,15 @@ class OverrideFieldData(FieldData):
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in inheritable and self.get_inherited_override(block, name) is not NOTSET:
+                return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
     def set_many(self, block, update_dict):
-        return self.fallback.set_many(block, update_dict)
+        result = self.fallback.set_many(block, update_dict)
+        clear_resolved_overrides()
+        return result
 
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
@@ -251,10 +312,9 @@ class OverrideFieldData(FieldData):
         if self.providers and not overrides_disabled():
             inheritable = InheritanceMixin.fields.keys()
             if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+                value = self.get_inherited_override(block, name)
+                if value is not NOTSET:
+                    return value
         return self.fallback.default(block, name)
 
 
@@ -26,11 +26,13 @@ import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
 
+import numpy as np
 from contracts import contract, new_contract
 from django.db import DatabaseError, IntegrityError, transaction
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import CourseKey
+from pytz import UTC
 from xblock.core import XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
@@ -39,7 +41,13 @@ from xblock.runtime import KeyValueStore
 from courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.django import modulestore
 
-from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
+from .models import (
+    StudentModule,
+    XModuleStudentInfoField,
+    XModuleStudentPrefsField,
+    XModuleUserStateSummaryField,
+    chunks
+)
 
 log = logging.getLogger(__name__)
 
@@ -989,6 +997,105 @@ class ScoresClient(object):
         return client
 
 
+class MultiUserScoresClient(object):
+    """
+    Client for retrieving the Score information of many users at once.
+
+    Scores are fetched in chunked queries and held in (users x locations)
+    arrays, where the correct and total columns of missing scores, and None
+    grades, are NaN.  Use `scores_client_for_user` to get a ScoresClient for
+    one of the users, e.g. for the grading code.
+    """
+    CHUNK_SIZE = 500
+
+    def __init__(self, course_key, user_ids):
+        self.course_key = course_key
+        self.user_ids = list(user_ids)
+        self._user_index = {user_id: index for index, user_id in enumerate(self.user_ids)}
+        self.locations = []
+        self._location_index = {}
+        self.correct = self.total = self.created = self.present = None
+
+    def fetch_scores(self, locations):
+        """Grab score information for all the users at the given locations."""
+        self.locations = list(set(location.replace(version=None, branch=None) for location in locations))
+        self._location_index = {location: index for index, location in enumerate(self.locations)}
+
+        shape = (len(self.user_ids), len(self.locations))
+        self.correct = np.full(shape, np.nan)
+        self.total = np.full(shape, np.nan)
+        self.created = np.zeros(shape, dtype='datetime64[us]')
+        self.present = np.zeros(shape, dtype=bool)
+
+        for user_ids in chunks(self.user_ids, self.CHUNK_SIZE):
+            for locations in chunks(self.locations, self.CHUNK_SIZE):
+                scores_qset = StudentModule.objects.filter(
+                    student_id__in=user_ids,
+                    course_id=self.course_key,
+                    module_state_key__in=locations,
+                )
+                for user_id, location, correct, total, created in scores_qset.values_list(
+                        'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+                ):
+                    # As in ScoresClient, add the course run back into old mongo locations.
+                    column = self._location_index.get(location.map_into_course(self.course_key))
+                    if column is None:
+                        continue
+                    row = self._user_index[user_id]
+                    self.correct[row, column] = np.nan if correct is None else correct
+                    self.total[row, column] = np.nan if total is None else total
+                    self.created[row, column] = np.datetime64(created.astimezone(UTC).replace(tzinfo=None), 'us')
+                    self.present[row, column] = True
+
+    def get(self, user_id, location):
+        """
+        Get the score of the given user for a given location, as a
+        ScoresClient.Score, or None if it doesn't exist.
+        """
+        if self.present is None:
+            raise ValueError(
+                u"Tried to fetch location {} from MultiUserScoresClient before fetch_scores() has run."
+                .format(location)
+            )
+        row = self._user_index.get(user_id)
+        column = self._location_index.get(location.replace(version=None, branch=None))
+        if row is None or column is None or not self.present[row, column]:
+            return None
+        return self._score(row, column)
+
+    def scores_client_for_user(self, user_id):
+        """
+        Returns a ScoresClient holding the scores of the given user, without
+        querying for them again.
+        """
+        client = ScoresClient(self.course_key, user_id)
+        row = self._user_index[user_id]
+        client._locations_to_scores = {  # pylint: disable=protected-access
+            self.locations[column]: self._score(row, column)
+            for column in np.flatnonzero(self.present[row])
+        }
+        client._has_fetched = True  # pylint: disable=protected-access
+        return client
+
+    def _score(self, row, column):
+        """
+        Returns the ScoresClient.Score held at the given row and column.
+        """
+        correct, total = self.correct[row, column], self.total[row, column]
+        return ScoresClient.Score(
+            None if np.isnan(correct) else float(correct),
+            None if np.isnan(total) else float(total),
+            self.created[row, column].item().replace(tzinfo=UTC),
+        )
+
+    @classmethod
+    def create_for_locations(cls, course_id, user_ids, scorable_locations):
+        """Create a MultiUserScoresClient with pre-fetched data for the given users and locations."""
+        client = cls(course_id, user_ids)
+        client.fetch_scores(scorable_locations)
+        return client
+
+
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
     """
@@ -16,6 +16,7 @@ import itertools
 import logging
 
 from config_models.models import ConfigurationModel
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
@@ -216,11 +217,13 @@ class BaseStudentModuleHistory(models.Model):
         history_entries = []
 
         if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+            # Entries written asynchronously may not be inserted in the order
+            # their StudentModules were saved in, so order them by when they were.
             history_entries += coursewarehistoryextended.models.StudentModuleHistoryExtended.objects.filter(
                 # Django will sometimes try to join to courseware_studentmodule
                 # so just do an in query
                 student_module__in=[module.id for module in student_modules]
-            ).order_by('-id')
+            ).order_by('-created', '-id')
 
         # If we turn off reading from multiple history tables, then we don't want to read from
         # StudentModuleHistory anymore, we believe that all history is in the Extended table.
@@ -232,6 +235,51 @@ class BaseStudentModuleHistory(models.Model):
 
         return history_entries
 
+    @classmethod
+    def build_history_entries(cls, student_modules):
+        """
+        Returns new, unsaved entries of this class for each of the given
+        StudentModules whose module_type is one that we save.
+        """
+        return [
+            cls(
+                student_module=student_module,
+                version=None,
+                created=student_module.modified,
+                state=student_module.state,
+                grade=student_module.grade,
+                max_grade=student_module.max_grade,
+            )
+            for student_module in student_modules
+            if student_module.module_type in cls.HISTORY_SAVING_TYPES
+        ]
+
+    @classmethod
+    def bulk_save_history(cls, student_modules):
+        """
+        Creates & saves, in a single query, an entry of this class for each of
+        the given StudentModules whose module_type is one that we save.
+        """
+        history_entries = cls.build_history_entries(student_modules)
+        if history_entries:
+            cls.objects.bulk_create(history_entries)
+
+    @staticmethod
+    def save_history_many(student_modules):
+        """
+        Saves history entries for the given StudentModules across the backend
+        stores, as the post_save receivers of the history models do for each
+        StudentModule saved.
+
+        Bulk writes of StudentModules don't send post_save, so must call this
+        for the StudentModules they wrote.
+        """
+        # Mirror the conditions under which the post_save receivers are connected.
+        if not settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+            StudentModuleHistory.bulk_save_history(student_modules)
+        if apps.is_installed('coursewarehistoryextended'):
+            coursewarehistoryextended.models.StudentModuleHistoryExtended.bulk_save_history(student_modules)
+
 
 class StudentModuleHistory(BaseStudentModuleHistory):
     """Keeps a complete history of state changes for a given XModule for a given
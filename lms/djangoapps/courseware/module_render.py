@@ -46,10 +46,12 @@ from courseware.entrance_exams import user_can_skip_entrance_exam, user_has_pass
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
     filter_displayed_blocks,
+    get_course_masquerade,
     is_masquerading_as_specific_student,
     setup_masquerade
 )
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from courseware import toc_cache
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
@@ -72,9 +74,7 @@ from openedx.core.lib.url_utils import quote_slashes, unquote_slashes
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import (
     add_staff_markup,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     wrap_xblock,
     is_xblock_aside,
     get_aside_from_xblock,
@@ -94,6 +94,7 @@ from xmodule.exceptions import NotFoundError, ProcessingError
 from xmodule.lti_module import LTIModule
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.partitions.partitions_service import get_all_partitions_for_course, get_user_partition_groups
 from xmodule.x_module import XModuleDescriptor
 
 from edx_when.field_data import DateLookupFieldData
@@ -167,15 +168,6 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     field_data_cache must include data from the course module and 2 levels of its descendants
     '''
     with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(
-            user, request, course, field_data_cache, course.id, course=course
-        )
-        if course_module is None:
-            return None, None, None
-
-        toc_chapters = list()
-        chapters = course_module.get_display_items()
-
         # Check for content which needs to be completed
         # before the rest of the content is made available
         required_content = milestones_helpers.get_required_content(course.id, user)
@@ -184,108 +176,179 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
         if user_can_skip_entrance_exam(user, course):
             required_content = [content for content in required_content if not content == course.entrance_exam_id]
 
-        previous_of_active_section, next_of_active_section = None, None
-        last_processed_section, last_processed_chapter = None, None
-        found_active_section = False
-        for chapter in chapters:
-            # Only show required content, if there is required content
-            # chapter.hide_from_toc is read-only (bool)
-            # xss-lint: disable=python-deprecated-display-name
-            display_id = slugify(chapter.display_name_with_default_escaped)
-            local_hide_from_toc = False
-            if required_content:
-                if unicode(chapter.location) not in required_content:
-                    local_hide_from_toc = True
-
-            # Skip the current chapter if a hide flag is tripped
-            if chapter.hide_from_toc or local_hide_from_toc:
-                continue
+        toc_cache_key = _get_toc_cache_key(user, course, required_content)
+        toc_chapters = toc_cache.get_cached_toc(toc_cache_key) if toc_cache_key else None
+        if toc_chapters is None:
+            toc_chapters = _get_toc_chapters(user, request, course, field_data_cache, required_content)
+            if toc_chapters is None:
+                return None, None, None
+            if toc_cache_key:
+                toc_cache.set_cached_toc(toc_cache_key, toc_chapters)
 
-            sections = list()
-            for section in chapter.get_display_items():
-                # skip the section if it is hidden from the user
-                if section.hide_from_toc:
-                    continue
-
-                is_section_active = (chapter.url_name == active_chapter and section.url_name == active_section)
-                if is_section_active:
-                    found_active_section = True
-
-                section_context = {
-                    # xss-lint: disable=python-deprecated-display-name
-                    'display_name': section.display_name_with_default_escaped,
-                    'url_name': section.url_name,
-                    'format': section.format if section.format is not None else '',
-                    'due': section.due,
-                    'active': is_section_active,
-                    'graded': section.graded,
-                }
-                _add_timed_exam_info(user, course, section, section_context)
-
-                # update next and previous of active section, if applicable
-                if is_section_active:
-                    if last_processed_section:
-                        previous_of_active_section = last_processed_section.copy()
-                        previous_of_active_section['chapter_url_name'] = last_processed_chapter.url_name
-                elif found_active_section and not next_of_active_section:
-                    next_of_active_section = section_context.copy()
-                    next_of_active_section['chapter_url_name'] = chapter.url_name
-
-                sections.append(section_context)
-                last_processed_section = section_context
-                last_processed_chapter = chapter
-
-            toc_chapters.append({
-                # xss-lint: disable=python-deprecated-display-name
-                'display_name': chapter.display_name_with_default_escaped,
-                'display_id': display_id,
-                'url_name': chapter.url_name,
-                'sections': sections,
-                'active': chapter.url_name == active_chapter
-            })
-        return {
-            'chapters': toc_chapters,
-            'previous_of_active_section': previous_of_active_section,
-            'next_of_active_section': next_of_active_section,
-        }
+        return _toc_with_active_section(user, course, toc_chapters, active_chapter, active_section)
 
 
-def _add_timed_exam_info(user, course, section, section_context):
+def _get_toc_cache_key(user, course, required_content):
     """
-    Add in rendering context if exam is a timed exam (which includes proctored)
+    Returns the key of the navigation of the course for the user in the toc
+    cache, or None if it must not be cached.
+
+    Besides the course version, the key holds everything that decides which
+    chapters and sections the user can see: staff access, the groups they
+    are in, the content they must complete first and the milestones that
+    still gate content for them.
     """
-    section_is_time_limited = (
-        getattr(section, 'is_time_limited', False) and
-        settings.FEATURES.get('ENABLE_SPECIAL_EXAMS', False)
+    if not toc_cache.is_toc_cache_enabled() or not user.is_authenticated:
+        return None
+    if get_course_masquerade(user, course.id):
+        return None
+
+    partition_groups = get_user_partition_groups(course.id, get_all_partitions_for_course(course), user, 'id')
+    unfulfilled_milestones = milestones_helpers.get_course_content_milestones(course.id, None, 'requires', user.id)
+    return toc_cache.get_toc_cache_key(user, course, (
+        bool(has_access(user, 'staff', course, course.id)),
+        tuple(sorted((partition_id, group.id) for partition_id, group in partition_groups.iteritems())),
+        tuple(sorted(unicode(content) for content in required_content)),
+        tuple(sorted(unicode(milestone['content_id']) for milestone in unfulfilled_milestones)),
+    ))
+
+
+def _get_toc_chapters(user, request, course, field_data_cache, required_content):
+    """
+    Returns the chapters of the course the user can see, as cached by the toc
+    cache: a list of chapter dicts, whose 'sections' are (section context,
+    location of the section if it is a timed exam) pairs.  The section
+    contexts don't say whether the section is active, nor have the timed exam
+    information, which both change from one request to the next.
+
+    Returns None if the user has no access to the course.
+    """
+    course_module = get_module_for_descriptor(
+        user, request, course, field_data_cache, course.id, course=course
     )
-    if section_is_time_limited:
-        # call into edx_proctoring subsystem
-        # to get relevant proctoring information regarding this
-        # level of the courseware
-        #
-        # This will return None, if (user, course_id, content_id)
-        # is not applicable
-        timed_exam_attempt_context = None
-        try:
-            timed_exam_attempt_context = get_attempt_status_summary(
-                user.id,
-                unicode(course.id),
-                unicode(section.location)
+    if course_module is None:
+        return None
+
+    toc_chapters = list()
+    chapters = course_module.get_display_items()
+
+    for chapter in chapters:
+        # Only show required content, if there is required content
+        # chapter.hide_from_toc is read-only (bool)
+        # xss-lint: disable=python-deprecated-display-name
+        display_id = slugify(chapter.display_name_with_default_escaped)
+        local_hide_from_toc = False
+        if required_content:
+            if unicode(chapter.location) not in required_content:
+                local_hide_from_toc = True
+
+        # Skip the current chapter if a hide flag is tripped
+        if chapter.hide_from_toc or local_hide_from_toc:
+            continue
+
+        sections = list()
+        for section in chapter.get_display_items():
+            # skip the section if it is hidden from the user
+            if section.hide_from_toc:
+                continue
+
+            section_context = {
+                # xss-lint: disable=python-deprecated-display-name
+                'display_name': section.display_name_with_default_escaped,
+                'url_name': section.url_name,
+                'format': section.format if section.format is not None else '',
+                'due': section.due,
+                'graded': section.graded,
+            }
+            section_is_time_limited = (
+                getattr(section, 'is_time_limited', False) and
+                settings.FEATURES.get('ENABLE_SPECIAL_EXAMS', False)
             )
-        except Exception as ex:  # pylint: disable=broad-except
-            # safety net in case something blows up in edx_proctoring
-            # as this is just informational descriptions, it is better
-            # to log and continue (which is safe) than to have it be an
-            # unhandled exception
-            log.exception(ex)
-
-        if timed_exam_attempt_context:
-            # yes, user has proctoring context about
-            # this level of the courseware
-            # so add to the accordion data context
-            section_context.update({
-                'proctoring': timed_exam_attempt_context,
-            })
+            sections.append((section_context, unicode(section.location) if section_is_time_limited else None))
+
+        toc_chapters.append({
+            # xss-lint: disable=python-deprecated-display-name
+            'display_name': chapter.display_name_with_default_escaped,
+            'display_id': display_id,
+            'url_name': chapter.url_name,
+            'sections': sections,
+        })
+    return toc_chapters
+
+
+def _toc_with_active_section(user, course, toc_chapters, active_chapter, active_section):
+    """
+    Returns the table of contents returned by toc_for_course, from the chapters
+    returned by _get_toc_chapters.
+    """
+    chapters = list()
+    previous_of_active_section, next_of_active_section = None, None
+    last_processed_section, last_processed_chapter = None, None
+    found_active_section = False
+    for chapter in toc_chapters:
+        sections = list()
+        for section_context, timed_exam_location in chapter['sections']:
+            is_section_active = (chapter['url_name'] == active_chapter and section_context['url_name'] == active_section)
+            if is_section_active:
+                found_active_section = True
+
+            section_context = dict(section_context, active=is_section_active)
+            if timed_exam_location:
+                _add_timed_exam_info(user, course, timed_exam_location, section_context)
+
+            # update next and previous of active section, if applicable
+            if is_section_active:
+                if last_processed_section:
+                    previous_of_active_section = last_processed_section.copy()
+                    previous_of_active_section['chapter_url_name'] = last_processed_chapter['url_name']
+            elif found_active_section and not next_of_active_section:
+                next_of_active_section = section_context.copy()
+                next_of_active_section['chapter_url_name'] = chapter['url_name']
+
+            sections.append(section_context)
+            last_processed_section = section_context
+            last_processed_chapter = chapter
+
+        chapters.append(dict(chapter, sections=sections, active=chapter['url_name'] == active_chapter))
+    return {
+        'chapters': chapters,
+        'previous_of_active_section': previous_of_active_section,
+        'next_of_active_section': next_of_active_section,
+    }
+
+
+def _add_timed_exam_info(user, course, section_location, section_context):
+    """
+    Add in rendering context for the timed exam (which includes proctored)
+    at the given location
+    """
+    # call into edx_proctoring subsystem
+    # to get relevant proctoring information regarding this
+    # level of the courseware
+    #
+    # This will return None, if (user, course_id, content_id)
+    # is not applicable
+    timed_exam_attempt_context = None
+    try:
+        timed_exam_attempt_context = get_attempt_status_summary(
+            user.id,
+            unicode(course.id),
+            section_location
+        )
+    except Exception as ex:  # pylint: disable=broad-except
+        # safety net in case something blows up in edx_proctoring
+        # as this is just informational descriptions, it is better
+        # to log and continue (which is safe) than to have it be an
+        # unhandled exception
+        log.exception(ex)
+
+    if timed_exam_attempt_context:
+        # yes, user has proctoring context about
+        # this level of the courseware
+        # so add to the accordion data context
+        section_context.update({
+            'proctoring': timed_exam_attempt_context,
+        })
 
 
 def get_module(user, request, usage_key, field_data_cache,
@@ -698,27 +761,21 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
+    # Rewrite, in a single pass:
+    # * urls beginning in /static to point to course-specific content
+    # * urls of the form '/course/' to refer to the root of multicourse directory
     #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # * intra-courseware links (/jump_to_id/<id>). This format is an improvement
+    #   over the /course/... format for studio authored courses, because it is
+    #   agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
+        getattr(descriptor, 'data_dir', None),
         course_id,
         reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     block_wrappers.append(partial(display_access_messages, user))
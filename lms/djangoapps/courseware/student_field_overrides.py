@@ -7,7 +7,7 @@ import json
 from courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_resolved_overrides
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -81,6 +81,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_resolved_overrides()
 
 
 def clear_override_for_user(user, block, name):
@@ -98,3 +99,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    clear_resolved_overrides()
@@ -727,6 +727,57 @@ class UserRoleTestCase(TestCase):
         )
 
 
+class AccessDecisionCacheTestCase(TestCase):
+    """
+    Tests for the request cache of access decisions.
+    """
+
+    def setUp(self):
+        super(AccessDecisionCacheTestCase, self).setUp()
+        self.course_key = CourseLocator('edX', 'toy', '2012_Fall')
+        self.course_staff = StaffFactory(course_key=self.course_key)
+        self.student = UserFactory()
+
+        access.clear_access_cache()
+        self.addCleanup(access.clear_access_cache)
+        patcher = patch('courseware.access.get_current_request', return_value=Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_decisions_cached(self):
+        with patch('courseware.access._has_access_course_key', wraps=access._has_access_course_key) as mock_check:
+            for __ in range(3):
+                self.assertTrue(access.has_access(self.course_staff, 'staff', self.course_key))
+                self.assertFalse(access.has_access(self.student, 'staff', self.course_key))
+            self.assertEqual(mock_check.call_count, 2)
+
+    def test_decisions_not_cached_outside_requests(self):
+        with patch('courseware.access.get_current_request', return_value=None):
+            with patch('courseware.access._has_access_course_key', wraps=access._has_access_course_key) as mock_check:
+                access.has_access(self.course_staff, 'staff', self.course_key)
+                access.has_access(self.course_staff, 'staff', self.course_key)
+                self.assertEqual(mock_check.call_count, 2)
+
+    def test_masquerade_not_cached(self):
+        self.assertTrue(access.has_access(self.course_staff, 'staff', self.course_key))
+        self.course_staff.masquerade_settings = {
+            self.course_key: CourseMasquerade(self.course_key, role='student')
+        }
+        self.assertFalse(access.has_access(self.course_staff, 'staff', self.course_key))
+
+    def test_role_change_clears_cache(self):
+        self.assertFalse(access.has_access(self.student, 'staff', self.course_key))
+        CourseStaffRole(self.course_key).add_users(self.student)
+        self.assertTrue(access.has_access(self.student, 'staff', self.course_key))
+
+    def test_enrollment_change_clears_cache(self):
+        with patch('courseware.access._has_access_course_key', wraps=access._has_access_course_key) as mock_check:
+            access.has_access(self.student, 'staff', self.course_key)
+            CourseEnrollmentFactory(user=self.student, course_id=unicode(self.course_key))
+            access.has_access(self.student, 'staff', self.course_key)
+            self.assertEqual(mock_check.call_count, 2)
+
+
 @ddt.ddt
 class CourseOverviewAccessTestCase(ModuleStoreTestCase):
     """
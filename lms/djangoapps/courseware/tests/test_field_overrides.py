@@ -14,6 +14,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_resolved_overrides,
     disable_overrides,
     resolve_dotted
 )
@@ -44,6 +45,37 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class CountingOverrideProvider(FieldOverrideProvider):
+    """
+    A concrete implementation of `FieldOverrideProvider` for testing, which
+    overrides the `due` field of blocks named 'overridden', and counts the
+    lookups made.
+    """
+    lookups = 0
+
+    def get(self, block, name, default):
+        CountingOverrideProvider.lookups += 1
+        if name == 'due' and block.name == 'overridden':
+            return 'overridden due'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+class FakeBlock(object):
+    """
+    A block in a tree of blocks, for testing inherited overrides.
+    """
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+
+    def get_parent(self):
+        return self.parent
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -146,6 +178,72 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.CountingOverrideProvider',))
+class OverrideFieldDataCacheTests(OverrideFieldBase):
+    """
+    Tests for the caching of the overrides resolved by `OverrideFieldData`.
+    """
+
+    def setUp(self):
+        super(OverrideFieldDataCacheTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        CountingOverrideProvider.lookups = 0
+
+    def tearDown(self):
+        super(OverrideFieldDataCacheTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({'due': 'original due'}))
+
+    def test_get_cached(self):
+        block = FakeBlock('overridden')
+        data = self.make_one()
+        self.assertEqual(data.get(block, 'due'), 'overridden due')
+        self.assertEqual(data.get(block, 'due'), 'overridden due')
+        self.assertEqual(self.make_one().get(block, 'due'), 'overridden due')
+        self.assertEqual(CountingOverrideProvider.lookups, 1)
+
+        with disable_overrides():
+            self.assertEqual(data.get(block, 'due'), 'original due')
+
+    def test_inherited_overrides_cached(self):
+        blocks = [FakeBlock('overridden')]
+        for index in range(10):
+            blocks.append(FakeBlock('block_{}'.format(index), parent=blocks[-1]))
+        data = self.make_one()
+
+        for block in blocks[1:]:
+            self.assertFalse(data.has(block, 'due'))
+            self.assertEqual(data.default(block, 'due'), 'overridden due')
+
+        # Each block's own override is looked up once, rather than once per
+        # descendant.
+        self.assertEqual(CountingOverrideProvider.lookups, len(blocks))
+
+    def test_set_clears_cache(self):
+        block = FakeBlock('overridden')
+        data = self.make_one()
+        data.get(block, 'due')
+        data.set(block, 'due', 'new due')
+        data.get(block, 'due')
+        data.delete(block, 'due')
+        data.get(block, 'due')
+        self.assertEqual(CountingOverrideProvider.lookups, 3)
+
+    def test_clear_resolved_overrides(self):
+        block = FakeBlock('overridden')
+        data = self.make_one()
+        data.get(block, 'due')
+        clear_resolved_overrides()
+        data.get(block, 'due')
+        self.assertEqual(CountingOverrideProvider.lookups, 2)
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
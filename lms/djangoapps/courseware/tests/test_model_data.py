@@ -11,7 +11,13 @@ from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    MultiUserScoresClient,
+    ScoresClient
+)
 from courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -427,3 +433,47 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestMultiUserScoresClient(TestCase):
+    """Tests for MultiUserScoresClient"""
+    def setUp(self):
+        super(TestMultiUserScoresClient, self).setUp()
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.locations = [location('problem_1'), location('problem_2')]
+        StudentModuleFactory.create(
+            student=self.users[0], module_state_key=self.locations[0], grade=1, max_grade=2,
+        )
+        StudentModuleFactory.create(
+            student=self.users[0], module_state_key=self.locations[1], grade=None, max_grade=3,
+        )
+        StudentModuleFactory.create(
+            student=self.users[1], module_state_key=self.locations[1], grade=3, max_grade=3,
+        )
+
+    def test_matches_scores_client(self):
+        user_ids = [user.id for user in self.users]
+        with self.assertNumQueries(1):
+            client = MultiUserScoresClient.create_for_locations(course_id, user_ids, self.locations)
+        for user in self.users:
+            expected = ScoresClient.create_for_locations(course_id, user.id, self.locations)
+            user_client = client.scores_client_for_user(user.id)
+            for loc in self.locations:
+                self.assertEqual(client.get(user.id, loc), expected.get(loc))
+                self.assertEqual(user_client.get(loc), expected.get(loc))
+
+        self.assertEqual(client.get(self.users[0].id, self.locations[1]).correct, None)
+        self.assertEqual(client.get(self.users[2].id, self.locations[0]), None)
+
+    def test_chunked_queries(self):
+        with patch.object(MultiUserScoresClient, 'CHUNK_SIZE', 2):
+            with self.assertNumQueries(2):
+                client = MultiUserScoresClient.create_for_locations(
+                    course_id, [user.id for user in self.users], self.locations,
+                )
+        self.assertEqual(client.get(self.users[1].id, self.locations[1]).correct, 3)
+
+    def test_get_before_fetch(self):
+        client = MultiUserScoresClient(course_id, [self.users[0].id])
+        with self.assertRaises(ValueError):
+            client.get(self.users[0].id, self.locations[0])
@@ -20,6 +20,7 @@ from django.urls import reverse
 from django.http import Http404, HttpResponse
 from django.test.utils import override_settings
 from edx_oauth2_provider.tests.factories import AccessTokenFactory, ClientFactory
+from edx_when import api as when_api
 from edx_proctoring.api import create_exam, create_exam_attempt, update_attempt_status
 from edx_proctoring.runtime import set_runtime_service
 from edx_proctoring.tests.test_services import MockCreditService, MockGradesService, MockCertificateService
@@ -50,8 +51,9 @@ from courseware.courses import get_course_info_section, get_course_with_access
 from courseware.access_response import AccessResponse
 from courseware.masquerade import CourseMasquerade
 from courseware.model_data import FieldDataCache
-from courseware.models import StudentModule
+from courseware.models import StudentFieldOverride, StudentModule
 from courseware.module_render import get_module_for_descriptor, hash_resource
+from courseware import toc_cache
 from courseware.tests.factories import GlobalStaffFactory, StudentModuleFactory, UserFactory, RequestFactoryNoCsrf
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from courseware.tests.tests import LoginEnrollmentTestCase
@@ -1069,6 +1071,76 @@ class TestTOC(ModuleStoreTestCase):
             self.assertEquals(actual['next_of_active_section']['url_name'], 'video_123456789012')
 
 
+@override_settings(COURSEWARE_TOC_CACHE={'TIMEOUT': 60})
+class TestTOCCache(ModuleStoreTestCase):
+    """Check that the Table of Contents of a course is cached"""
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestTOCCache, self).setUp()
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            self.course_key = ToyCourseFactory.create().id
+        self.request = RequestFactoryNoCsrf().get('/courses/{}/Overview'.format(self.course_key))
+        self.request.user = UserFactory()
+
+    def toc_for_course(self, section, num_finds):
+        """
+        Returns the Table of Contents of the toy course, with the given section
+        active, checking that it is built with the given number of finds.
+        """
+        course = self.store.get_course(self.course_key, depth=2)
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course_key, self.request.user, course, depth=2
+        )
+        with check_mongo_calls(num_finds):
+            return render.toc_for_course(
+                self.request.user, self.request, course, 'Overview', section, field_data_cache
+            )
+
+    # Split makes 5 queries to render the toc, see TestTOC, but only loads the
+    # active version at the start of the bulk operation when it is cached.
+    def test_toc_cached(self):
+        expected = self.toc_for_course('Welcome', 5)
+        self.assertEqual(self.toc_for_course('Welcome', 1), expected)
+
+        actual = self.toc_for_course('Toy_Videos', 1)
+        self.assertIsNone(actual['previous_of_active_section'])
+        self.assertEquals(actual['next_of_active_section']['url_name'], 'Welcome')
+        self.assertEqual(
+            [section['url_name'] for section in actual['chapters'][0]['sections'] if section['active']],
+            ['Toy_Videos']
+        )
+
+    def test_toc_invalidated_on_publish(self):
+        self.toc_for_course('Welcome', 5)
+        toc_cache.invalidate_course_toc(self.course_key)
+        self.toc_for_course('Welcome', 5)
+
+    def test_toc_invalidated_on_due_date_extension(self):
+        course = self.store.get_course(self.course_key, depth=2)
+        section_key = course.get_children()[0].get_children()[0].location
+        when_api.set_dates_for_course(self.course_key, [(section_key, {'due': datetime(2030, 1, 1, tzinfo=pytz.UTC)})])
+        self.toc_for_course('Welcome', 5)
+
+        # Due date extensions are stored by edx-when, see instructor.views.tools.set_due_date_extension.
+        when_api.set_date_for_block(
+            self.course_key, section_key, 'due', datetime(2030, 2, 1, tzinfo=pytz.UTC), user=self.request.user,
+        )
+        self.toc_for_course('Welcome', 5)
+
+    def test_toc_invalidated_on_field_override(self):
+        self.toc_for_course('Welcome', 5)
+        course = self.store.get_course(self.course_key, depth=2)
+        StudentFieldOverride.objects.create(
+            course_id=self.course_key,
+            location=course.get_children()[0].get_children()[0].location,
+            student=self.request.user,
+            field='due',
+            value='"2030-01-01T00:00:00Z"',
+        )
+        self.toc_for_course('Welcome', 5)
+
+
 @ddt.ddt
 @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SPECIAL_EXAMS': True})
 class TestProctoringRendering(SharedModuleStoreTestCase):
@@ -3,12 +3,20 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import json
 from collections import defaultdict
 
+import ddt
+from django.db.utils import IntegrityError
+from django.test import TestCase
 from edx_user_state_client.tests import UserStateClientTestBase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 
+from courseware.models import StudentModule
 from courseware.tests.factories import UserFactory
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from coursewarehistoryextended.models import StudentModuleHistoryExtended
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -33,3 +41,70 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
         super(TestDjangoUserStateClient, self).setUp()
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
+
+
+@ddt.ddt
+class TestDjangoUserStateClientBulkWrites(TestCase):
+    """
+    Tests of the bulk queries the DjangoUserStateClient writes several blocks with.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientBulkWrites, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        self.course_key = CourseLocator('org', 'course', 'run')
+
+    def _usage_keys(self, num_blocks):
+        """
+        Returns the usage keys of num_blocks problems.
+        """
+        return [self.course_key.make_usage_key('problem', 'problem_{}'.format(index)) for index in range(num_blocks)]
+
+    @ddt.data(4, 20)
+    def test_set_many_query_count(self, num_blocks):
+        usage_keys = self._usage_keys(num_blocks)
+        self.client.set_many(self.user.username, {usage_key: {'a': 1} for usage_key in usage_keys[::2]})
+
+        # One query to read the existing rows, one each to create and update
+        # rows within a savepoint, one to read the ids of the created rows,
+        # and one to write all the history entries.
+        with self.assertNumQueries(6, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                self.client.set_many(self.user.username, {usage_key: {'b': 2} for usage_key in usage_keys})
+
+        for index, usage_key in enumerate(usage_keys):
+            expected_state = {'a': 1, 'b': 2} if index % 2 == 0 else {'b': 2}
+            self.assertEqual(self.client.get(self.user.username, usage_key).state, expected_state)
+
+        student_modules = StudentModule.objects.filter(student=self.user)
+        self.assertEqual(len(student_modules), num_blocks)
+        self.assertEqual(
+            StudentModuleHistoryExtended.objects.filter(student_module__in=[module.id for module in student_modules])
+            .count(),
+            num_blocks + len(usage_keys[::2]),
+        )
+
+    def test_set_many_preserves_scores(self):
+        usage_keys = self._usage_keys(2)
+        self.client.set_many(self.user.username, {usage_key: {'a': 1} for usage_key in usage_keys})
+        StudentModule.objects.filter(student=self.user).update(grade=1.0, max_grade=2.0)
+
+        self.client.set_many(self.user.username, {usage_key: {'a': 2} for usage_key in usage_keys})
+
+        for student_module in StudentModule.objects.filter(student=self.user):
+            self.assertEqual((student_module.grade, student_module.max_grade), (1.0, 2.0))
+            self.assertEqual(json.loads(student_module.state), {'a': 2})
+
+    def test_set_many_integrity_error(self):
+        usage_keys = self._usage_keys(2)
+        self.client.set_many(self.user.username, {usage_keys[0]: {'a': 1}})
+
+        # Another process creates the row after it has been read.
+        with patch.object(StudentModule.objects, 'bulk_create', side_effect=IntegrityError):
+            self.client.set_many(self.user.username, {usage_key: {'b': 2} for usage_key in usage_keys})
+
+        self.assertEqual(self.client.get(self.user.username, usage_keys[0]).state, {'a': 1, 'b': 2})
+        self.assertEqual(self.client.get(self.user.username, usage_keys[1]).state, {'b': 2})
@@ -0,0 +1,123 @@
+"""
+Cache of the course navigation built by module_render.toc_for_course.
+
+The chapters and sections a user sees in the navigation of a course only
+change when the course is published, when the user's access to the content
+changes, or as time passes and content is released.  The cache key therefore
+holds the course version, a generation replaced when the course is published,
+a generation replaced when the user's dates or field overrides in the course
+change, e.g. when their due dates are extended, and whatever the caller knows
+about the user's access, e.g. their groups and unfulfilled milestones.
+
+Nothing invalidates the navigation when content is released, so it is only
+cached for settings.COURSEWARE_TOC_CACHE['TIMEOUT'] seconds, and not at all
+unless a TIMEOUT is set.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from six import text_type
+
+from edx_when.models import UserDate
+
+from courseware.models import StudentFieldOverride
+from openedx.core.lib.cache_utils import get_cache_generations
+from xmodule.modulestore.django import SignalHandler
+
+TOC_CACHE_KEY = u'courseware.toc.{course_id}.{user_id}.{digest}'
+TOC_GENERATION_CACHE_KEY = u'courseware.toc.generation.{course_id}'
+TOC_USER_GENERATION_CACHE_KEY = u'courseware.toc.generation.{course_id}.{user_id}'
+
+
+def is_toc_cache_enabled():
+    """
+    Returns whether the course navigation is cached.
+    """
+    return bool(_toc_cache_timeout())
+
+
+def get_toc_cache_key(user, course, access_context):
+    """
+    Returns the key of the navigation of the given course for the given user,
+    whose access to the course content is described by access_context, a
+    sequence of hashable values.
+    """
+    key_parts = (
+        getattr(course, 'course_version', None),
+        tuple(get_cache_generations([
+            TOC_GENERATION_CACHE_KEY.format(course_id=text_type(course.id)),
+            TOC_USER_GENERATION_CACHE_KEY.format(course_id=text_type(course.id), user_id=user.id),
+        ])),
+        tuple(access_context),
+    )
+    return TOC_CACHE_KEY.format(
+        course_id=text_type(course.id),
+        user_id=user.id,
+        digest=hashlib.md5(repr(key_parts)).hexdigest(),
+    )
+
+
+def get_cached_toc(cache_key):
+    """
+    Returns the navigation cached with the given key, or None.
+    """
+    return cache.get(cache_key)
+
+
+def set_cached_toc(cache_key, toc):
+    """
+    Caches the given navigation with the given key.
+    """
+    cache.set(cache_key, toc, _toc_cache_timeout())
+
+
+def invalidate_course_toc(course_key):
+    """
+    Invalidates the cached navigation of the given course, for all users.
+    """
+    cache.delete(TOC_GENERATION_CACHE_KEY.format(course_id=text_type(course_key)))
+
+
+def invalidate_user_toc(course_key, user_id):
+    """
+    Invalidates the cached navigation of the given course for the given user.
+    """
+    cache.delete(TOC_USER_GENERATION_CACHE_KEY.format(course_id=text_type(course_key), user_id=user_id))
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached navigation of a course when it is published.
+    """
+    invalidate_course_toc(course_key)
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _listen_for_student_field_override_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached navigation of a course for a user when their
+    field overrides change.
+    """
+    invalidate_user_toc(instance.course_id, instance.student_id)
+
+
+@receiver(post_save, sender=UserDate)
+@receiver(post_delete, sender=UserDate)
+def _listen_for_user_date_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached navigation of a course for a user when their
+    dates change, e.g. when their due dates are extended.
+    """
+    invalidate_user_toc(instance.content_date.course_id, instance.user_id)
+
+
+def _toc_cache_timeout():
+    """
+    Returns how long, in seconds, the navigation is cached.
+    """
+    return getattr(settings, 'COURSEWARE_TOC_CACHE', {}).get('TIMEOUT', 0)
@@ -12,7 +12,9 @@ from django.conf import settings
 from django.core.paginator import Paginator
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
@@ -241,6 +243,40 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
+        # Several blocks are written with bulk queries, falling back to writing
+        # them one at a time if another process created one of their rows.
+        saved_modules = None
+        if len(block_keys_to_state) > 1:
+            saved_modules = self._set_many_in_bulk(user, block_keys_to_state)
+        if saved_modules is None:
+            saved_modules = self._set_many_individually(user, block_keys_to_state)
+
+        for usage_key, student_module, created in saved_modules:
+            # DataDog and New Relic reporting
+
+            # record the size of state modifications
+            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+
+            # Record whether a state row has been created or updated.
+            if created:
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
+            else:
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
+
+        # Events for the entire set_many call.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('set_many', 'duration', duration)
+
+    def _set_many_individually(self, user, block_keys_to_state):
+        """
+        Overlays the given states over the stored states of the user's blocks,
+        saving the StudentModule of each block in turn.
+
+        Returns a list of (usage_key, student_module, created) tuples for the
+        StudentModules saved.
+        """
+        saved_modules = []
         for usage_key, state in block_keys_to_state.items():
             try:
                 student_module, created = StudentModule.objects.get_or_create(
@@ -260,18 +296,14 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 log.warning(u"set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
                     user, repr(unicode(usage_key.course_key)), usage_key
                 ))
-                return
+                return saved_modules
 
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
             if not created:
                 if student_module.state is None:
                     current_state = {}
                 else:
                     current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
                 current_state.update(state)
-                num_fields_after = len(current_state)
                 student_module.state = json.dumps(current_state)
                 try:
                     with transaction.atomic():
@@ -287,27 +319,91 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                         len(block_keys_to_state), block_keys_to_state.keys()
                     ))
 
-            # DataDog and New Relic reporting
-
-            # record the size of state modifications
-            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+            saved_modules.append((usage_key, student_module, created))
+        return saved_modules
 
-            # Record whether a state row has been created or updated.
-            if created:
-                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
-            else:
-                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
+    def _set_many_in_bulk(self, user, block_keys_to_state):
+        """
+        Overlays the given states over the stored states of the user's blocks,
+        with a fixed number of queries however many blocks there are: one to
+        read the existing StudentModules, one to create the missing ones, one
+        to update the existing ones, and one per history table.
 
-            # Event to record number of new fields set in set/set_many.
-            num_new_fields_set = num_fields_after - num_fields_before
+        Only the state of the existing StudentModules is updated, so that scores
+        written by other code since they were read are not overwritten.
 
-            # Event to record number of existing fields updated in set/set_many.
-            num_fields_updated = max(0, len(state) - num_new_fields_set)
+        Returns a list of (usage_key, student_module, created) tuples for the
+        StudentModules saved, or None if nothing was saved because another
+        process created one of the StudentModules concurrently.
+        """
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, block_keys_to_state.keys())
+        }
 
-        # Events for the entire set_many call.
-        finish_time = time()
-        duration = (finish_time - evt_time) * 1000  # milliseconds
-        self._nr_stat_accumulate('set_many', 'duration', duration)
+        modified = timezone.now()
+        saved_modules = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                )
+                saved_modules.append((usage_key, student_module, True))
+            else:
+                if student_module.state is None:
+                    current_state = {}
+                else:
+                    current_state = json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = modified
+                saved_modules.append((usage_key, student_module, False))
+
+        created_modules = [student_module for _, student_module, created in saved_modules if created]
+        updated_modules = [student_module for _, student_module, created in saved_modules if not created]
+        try:
+            with transaction.atomic():
+                if created_modules:
+                    StudentModule.objects.bulk_create(created_modules)
+                if updated_modules:
+                    # A single UPDATE setting each row's state with a CASE on its id.
+                    StudentModule.objects.filter(
+                        id__in=[student_module.id for student_module in updated_modules]
+                    ).update(
+                        state=Case(
+                            *[
+                                When(id=student_module.id, then=Value(student_module.state))
+                                for student_module in updated_modules
+                            ],
+                            output_field=TextField()
+                        ),
+                        modified=modified,
+                    )
+        except IntegrityError:
+            # Another process created one of the StudentModules since they were read.
+            log.warning(u"set_many: IntegrityError in bulk write for student {} - {} block keys: {}".format(
+                user, len(block_keys_to_state), block_keys_to_state.keys()
+            ))
+            return None
+
+        # Only some databases return the ids of the rows created by bulk_create,
+        # and history entries need them.
+        unsaved_history_modules = {
+            student_module.module_state_key: student_module
+            for student_module in created_modules
+            if student_module.id is None and student_module.module_type in BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+        }
+        if unsaved_history_modules:
+            for student_module, usage_key in self._get_student_modules(user.username, unsaved_history_modules.keys()):
+                unsaved_history_modules[usage_key].id = student_module.id
+
+        BaseStudentModuleHistory.save_history_many(created_modules + updated_modules)
+        return saved_modules
 
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
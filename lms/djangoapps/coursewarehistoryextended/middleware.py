@@ -0,0 +1,22 @@
+"""
+Middleware for writing the StudentModuleHistoryExtended entries buffered
+during requests.
+"""
+from .writer import flush_history_entries
+
+
+class HistoryWriterMiddleware(object):
+    """
+    Writes the StudentModuleHistoryExtended entries buffered while handling
+    a request when it ends.
+
+    Must come after RequestCacheMiddleware, which clears the buffer, and
+    after MonitoringCustomMetricsMiddleware, which reports the writer's
+    metrics.
+    """
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        """
+        Writes the entries buffered during the request.
+        """
+        flush_history_entries()
+        return response
@@ -18,6 +18,7 @@ from django.dispatch import receiver
 
 from courseware.models import BaseStudentModuleHistory, StudentModule
 from coursewarehistoryextended.fields import UnsignedBigIntAutoField
+from coursewarehistoryextended.writer import write_history_entries
 
 
 class StudentModuleHistoryExtended(BaseStudentModuleHistory):
@@ -43,15 +44,22 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
         Checks the instance's module_type, and creates & saves a
         StudentModuleHistoryExtended entry if the module_type is one that
         we save.
+
+        The entry may be buffered until the end of the request, see
+        coursewarehistoryextended.writer.
+        """
+        write_history_entries(StudentModuleHistoryExtended.build_history_entries([instance]))
+
+    @classmethod
+    def bulk_save_history(cls, student_modules):
+        """
+        Creates & saves, in a single query, an entry for each of the given
+        StudentModules whose module_type is one that we save.
+
+        The entries may be buffered until the end of the request, see
+        coursewarehistoryextended.writer.
         """
-        if instance.module_type in StudentModuleHistoryExtended.HISTORY_SAVING_TYPES:
-            history_entry = StudentModuleHistoryExtended(student_module=instance,
-                                                         version=None,
-                                                         created=instance.modified,
-                                                         state=instance.state,
-                                                         grade=instance.grade,
-                                                         max_grade=instance.max_grade)
-            history_entry.save()
+        write_history_entries(cls.build_history_entries(student_modules))
 
     @receiver(post_delete, sender=StudentModule)
     def delete_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
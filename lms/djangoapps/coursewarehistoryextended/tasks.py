@@ -0,0 +1,19 @@
+"""
+Tasks for writing StudentModuleHistoryExtended entries asynchronously.
+"""
+from celery import task
+from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
+
+from .models import StudentModuleHistoryExtended
+from .writer import deserialize_history_entry
+
+
+@task(base=LoggedPersistOnFailureTask)
+def save_history_entries(serialized_entries):
+    """
+    Saves the given serialized StudentModuleHistoryExtended entries, in order,
+    in a single query.
+    """
+    StudentModuleHistoryExtended.objects.bulk_create(
+        [deserialize_history_entry(serialized_entry) for serialized_entry in serialized_entries]
+    )
@@ -8,12 +8,18 @@ backend tables.
 import json
 from unittest import skipUnless
 
+from crum import set_current_request
 from django.conf import settings
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
 from mock import patch
 
 from courseware.models import BaseStudentModuleHistory, StudentModule, StudentModuleHistory
 from courseware.tests.factories import StudentModuleFactory, course_id, location
+from coursewarehistoryextended.middleware import HistoryWriterMiddleware
+from coursewarehistoryextended.models import StudentModuleHistoryExtended
+from coursewarehistoryextended.tasks import save_history_entries
 
 
 @skipUnless(settings.FEATURES["ENABLE_CSMH_EXTENDED"], "CSMH Extended needs to be enabled")
@@ -77,3 +83,87 @@ class TestStudentModuleHistoryBackends(TestCase):
         student_module = StudentModule.objects.all()
         history = BaseStudentModuleHistory.get_history(student_module)
         self.assertEquals(len(history), 0)
+
+
+@skipUnless(settings.FEATURES["ENABLE_CSMH_EXTENDED"], "CSMH Extended needs to be enabled")
+class TestHistoryWriter(TestCase):
+    """ Tests of the modes of writing CSMHE entries """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestHistoryWriter, self).setUp()
+        RequestCache.clear_all_namespaces()
+        set_current_request(RequestFactory().get('/'))
+        self.addCleanup(set_current_request, None)
+
+    def create_student_modules(self, num_modules):
+        """ Creates problem StudentModules, and returns them """
+        return [
+            StudentModuleFactory.create(module_state_key=location('usage_{}'.format(index)), course_id=course_id)
+            for index in range(num_modules)
+        ]
+
+    def assert_history_count(self, expected_count):
+        """ Asserts the number of CSMHE entries """
+        self.assertEquals(StudentModuleHistoryExtended.objects.count(), expected_count)
+
+    def test_sync_mode(self):
+        self.create_student_modules(2)
+        self.assert_history_count(2)
+
+    @override_settings(STUDENTMODULEHISTORYEXTENDED_WRITER={'MODE': 'request'})
+    def test_request_mode(self):
+        student_modules = self.create_student_modules(3)
+        student_modules[0].state = json.dumps({'order': 2})
+        student_modules[0].save()
+        self.assert_history_count(0)
+
+        with self.assertNumQueries(1, using='student_module_history'):
+            HistoryWriterMiddleware().process_response(None, None)
+        self.assert_history_count(4)
+        history = BaseStudentModuleHistory.get_history([student_modules[0]])
+        self.assertEquals([entry.state for entry in history], [json.dumps({'order': 2}), None])
+
+        with self.assertNumQueries(0, using='student_module_history'):
+            HistoryWriterMiddleware().process_response(None, None)
+
+    @override_settings(STUDENTMODULEHISTORYEXTENDED_WRITER={'MODE': 'request'})
+    def test_request_mode_outside_request(self):
+        set_current_request(None)
+        self.create_student_modules(2)
+        self.assert_history_count(2)
+
+    @override_settings(STUDENTMODULEHISTORYEXTENDED_WRITER={'MODE': 'request', 'MAX_BUFFERED_ENTRIES': 2})
+    def test_buffer_full(self):
+        self.create_student_modules(3)
+        self.assert_history_count(2)
+        HistoryWriterMiddleware().process_response(None, None)
+        self.assert_history_count(3)
+
+    @override_settings(STUDENTMODULEHISTORYEXTENDED_WRITER={'MODE': 'celery', 'BATCH_SIZE': 2})
+    def test_celery_mode(self):
+        student_modules = self.create_student_modules(3)
+        for order in (1, 2):
+            student_modules[1].state = json.dumps({'order': order})
+            student_modules[1].save()
+
+        with patch('coursewarehistoryextended.tasks.save_history_entries.delay') as mock_delay:
+            HistoryWriterMiddleware().process_response(None, None)
+        self.assert_history_count(0)
+
+        # The entries of each StudentModule are never split across batches.
+        batches = [batch for (batch,), _ in mock_delay.call_args_list]
+        self.assertEquals(
+            [[entry['student_module_id'] for entry in batch] for batch in batches],
+            [[student_modules[0].id], [student_modules[1].id] * 3, [student_modules[2].id]],
+        )
+
+        for batch in reversed(batches):
+            save_history_entries(batch)
+        self.assert_history_count(5)
+        history = BaseStudentModuleHistory.get_history([student_modules[1]])
+        self.assertEquals(
+            [entry.state for entry in history],
+            [json.dumps({'order': 2}), json.dumps({'order': 1}), None],
+        )
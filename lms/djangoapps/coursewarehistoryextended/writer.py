@@ -0,0 +1,150 @@
+"""
+Writes StudentModuleHistoryExtended entries, either as their StudentModules
+are saved or buffered until the end of the request that saved them.
+
+The mode is set by settings.STUDENTMODULEHISTORYEXTENDED_WRITER['MODE']:
+
+* "sync" writes each entry as its StudentModule is saved.
+* "request" buffers the entries created while handling a request, and writes
+  them with a single bulk insert when HistoryWriterMiddleware sees the request
+  end.
+* "celery" buffers the entries in the same way, and hands them to the
+  save_history_entries task in batches when the request ends.
+
+Outside of requests, e.g. in Celery tasks and management commands, entries
+are always written as their StudentModules are saved.  A request's buffer is
+flushed early once it holds MAX_BUFFERED_ENTRIES entries, so that requests
+writing many StudentModules don't hold all of their history in memory.
+
+The entries of each StudentModule keep the order it was saved in: a batch
+never splits the entries of a StudentModule, and history readers order the
+entries by the time their StudentModule was saved.
+"""
+from collections import OrderedDict
+
+from crum import get_current_request
+from dateutil.parser import parse as parse_date
+from django.conf import settings
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
+
+SYNC_MODE = u'sync'
+REQUEST_MODE = u'request'
+CELERY_MODE = u'celery'
+
+REQUEST_CACHE_NAMESPACE = u'coursewarehistoryextended.writer'
+
+
+def write_history_entries(history_entries):
+    """
+    Writes the given new StudentModuleHistoryExtended entries, or buffers
+    them until the end of the current request, depending on the mode.
+    """
+    if not history_entries:
+        return
+
+    if _writer_setting('MODE', SYNC_MODE) == SYNC_MODE or get_current_request() is None:
+        _bulk_create(history_entries)
+        return
+
+    buffered_entries = _get_buffered_entries()
+    buffered_entries.extend(history_entries)
+    if len(buffered_entries) >= _writer_setting('MAX_BUFFERED_ENTRIES', 1000):
+        set_custom_metric(u'csmhe_writer_buffer_full', True)
+        flush_history_entries()
+
+
+def flush_history_entries():
+    """
+    Writes the entries buffered during the current request, with a single
+    bulk insert or with Celery tasks, depending on the mode.
+    """
+    buffered_entries = _get_buffered_entries()
+    if not buffered_entries:
+        return
+    history_entries = list(buffered_entries)
+    del buffered_entries[:]
+
+    set_custom_metric(u'csmhe_writer_flushed_entries', len(history_entries))
+    if _writer_setting('MODE', SYNC_MODE) == CELERY_MODE:
+        from .tasks import save_history_entries
+
+        batches = _batch_history_entries(history_entries, _writer_setting('BATCH_SIZE', 100))
+        set_custom_metric(u'csmhe_writer_batches', len(batches))
+        for batch in batches:
+            save_history_entries.delay([serialize_history_entry(entry) for entry in batch])
+    else:
+        _bulk_create(history_entries)
+
+
+def serialize_history_entry(history_entry):
+    """
+    Returns a JSON-serializable dict of the fields of the given entry.
+    """
+    return {
+        'student_module_id': history_entry.student_module_id,
+        'version': history_entry.version,
+        'created': history_entry.created.isoformat(),
+        'state': history_entry.state,
+        'grade': history_entry.grade,
+        'max_grade': history_entry.max_grade,
+    }
+
+
+def deserialize_history_entry(serialized_entry):
+    """
+    Returns a new StudentModuleHistoryExtended entry from the dict returned
+    by serialize_history_entry.
+    """
+    from .models import StudentModuleHistoryExtended
+
+    fields = dict(serialized_entry)
+    fields['created'] = parse_date(fields['created'])
+    return StudentModuleHistoryExtended(**fields)
+
+
+def _batch_history_entries(history_entries, batch_size):
+    """
+    Returns the given entries split into batches of about batch_size entries,
+    each holding all the entries of its StudentModules, in their order.
+
+    A batch exceeds batch_size only if a single StudentModule has more
+    entries than that.
+    """
+    entries_by_module = OrderedDict()
+    for history_entry in history_entries:
+        entries_by_module.setdefault(history_entry.student_module_id, []).append(history_entry)
+
+    batches = []
+    batch = []
+    for module_entries in entries_by_module.itervalues():
+        if batch and len(batch) + len(module_entries) > batch_size:
+            batches.append(batch)
+            batch = []
+        batch.extend(module_entries)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _bulk_create(history_entries):
+    """
+    Saves the given entries in a single query.
+    """
+    from .models import StudentModuleHistoryExtended
+
+    StudentModuleHistoryExtended.objects.bulk_create(history_entries)
+
+
+def _get_buffered_entries():
+    """
+    Returns the list of entries buffered during the current request.
+    """
+    return RequestCache(REQUEST_CACHE_NAMESPACE).data.setdefault(u'history_entries', [])
+
+
+def _writer_setting(name, default):
+    """
+    Returns the given setting of the history writer.
+    """
+    return getattr(settings, 'STUDENTMODULEHISTORYEXTENDED_WRITER', {}).get(name, default)
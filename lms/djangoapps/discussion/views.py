@@ -297,7 +297,6 @@ def single_thread(request, course_key, discussion_id, thread_id):
     request.user.is_community_ta = utils.is_user_community_ta(request.user, course.id)
     if request.is_ajax():
         cc_user = cc.User.from_django_user(request.user)
-        user_info = cc_user.to_dict()
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
         thread = _load_thread_for_viewing(
             request,
@@ -305,7 +304,9 @@ def single_thread(request, course_key, discussion_id, thread_id):
             discussion_id=discussion_id,
             thread_id=thread_id,
             raise_event=True,
+            cc_user=cc_user,
         )
+        user_info = cc_user.to_dict()
 
         with function_trace("get_annotated_content_infos"):
             annotated_content_info = utils.get_annotated_content_infos(
@@ -329,7 +330,7 @@ def single_thread(request, course_key, discussion_id, thread_id):
         return tab_view.get(request, course_id, 'discussion', discussion_id=discussion_id, thread_id=thread_id)
 
 
-def _find_thread(request, course, discussion_id, thread_id):
+def _find_thread(request, course, discussion_id, thread_id, cc_user=None):
     """
     Finds the discussion thread with the specified ID.
 
@@ -338,19 +339,27 @@ def _find_thread(request, course, discussion_id, thread_id):
         course_id: The ID of the owning course.
         discussion_id: The ID of the owning discussion.
         thread_id: The ID of the thread.
+        cc_user: The comments service user viewing the thread, if any, who
+                 is retrieved along with the thread.
 
     Returns:
         The thread in question if the user can see it, else None.
     """
+    thread = cc.Thread.find(thread_id)
+    retrievals = [(thread, {
+        'with_responses': request.is_ajax(),
+        'recursive': request.is_ajax(),
+        'user_id': request.user.id,
+        'response_skip': request.GET.get("resp_skip"),
+        'response_limit': request.GET.get("resp_limit"),
+    })]
+    if cc_user is not None:
+        retrievals.insert(0, (cc_user, {}))
     try:
-        thread = cc.Thread.find(thread_id).retrieve(
-            with_responses=request.is_ajax(),
-            recursive=request.is_ajax(),
-            user_id=request.user.id,
-            response_skip=request.GET.get("resp_skip"),
-            response_limit=request.GET.get("resp_limit")
-        )
+        cc.retrieve_all(retrievals)
     except cc.utils.CommentClientRequestError:
+        if cc_user is not None and not cc_user.retrieved:
+            raise
         return None
     # Verify that the student has access to this thread if belongs to a course discussion module
     thread_context = getattr(thread, "context", "course")
@@ -368,7 +377,7 @@ def _find_thread(request, course, discussion_id, thread_id):
     return thread
 
 
-def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_event):
+def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_event, cc_user=None):
     """
     Loads the discussion thread with the specified ID and fires an
     edx.forum.thread.viewed event.
@@ -380,6 +389,8 @@ def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_ev
         thread_id: The ID of the thread.
         raise_event: Whether an edx.forum.thread.viewed tracking event should
                      be raised
+        cc_user: The comments service user viewing the thread, if any, who
+                 is retrieved along with the thread.
 
     Returns:
         The thread in question if the user can see it.
@@ -388,7 +399,7 @@ def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_ev
         Http404 if the thread does not exist or the user cannot
         see it.
     """
-    thread = _find_thread(request, course, discussion_id=discussion_id, thread_id=thread_id)
+    thread = _find_thread(request, course, discussion_id=discussion_id, thread_id=thread_id, cc_user=cc_user)
     if not thread:
         raise Http404
     if raise_event:
@@ -87,6 +87,34 @@ class MockCommentServiceRequestHandler(BaseHTTPRequestHandler):
             self.end_headers()
             return False
 
+    def do_GET(self):
+        '''
+        Handle a GET request from the client
+        Used by the APIs for retrieving comment threads, commentables, comments
+        and users
+        '''
+        # Log the request
+        logger.debug(u"Comment Service received GET request to path %s", self.path)
+
+        # Every good get has at least an API key
+        if 'X-Edx-Api-Key' in self.headers:
+            response = self.server._response_str
+            # Log the response
+            logger.debug(u"Comment Service: sending response %s", json.dumps(response))
+
+            # Send a response back to the client
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(response)
+
+        else:
+            # Respond with failure
+            self.send_response(500, 'Bad Request: does not contain API key')
+            self.send_header('Content-type', 'text/plain')
+            self.end_headers()
+            return False
+
 
 class MockCommentServiceServer(HTTPServer):
     '''
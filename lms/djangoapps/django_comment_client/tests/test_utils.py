@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import threading
 
 import ddt
 import mock
+import requests
 
 from django.urls import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from pytz import UTC
@@ -19,6 +22,7 @@ from courseware.tabs import get_course_tab_list
 from courseware.tests.factories import InstructorFactory
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from django_comment_client.tests.factories import RoleFactory
+from django_comment_client.tests.mock_cs_server.mock_cs_server import MockCommentServiceServer
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.tests.utils import config_course_discussions, topic_name_to_id
 from django_comment_common.models import (
@@ -33,11 +37,22 @@ from django_comment_common.utils import (
     set_course_discussion_settings
 )
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+import lms.lib.comment_client as cc
+from lms.lib.comment_client.response_cache import get_response_cache_stats, reset_response_cache_stats
+from lms.lib.comment_client.thread import Thread
+from lms.lib.comment_client.user import User
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    get_latency_histograms,
+    perform_request,
+    perform_requests,
+    reset_latency_histograms
+)
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 from student.roles import CourseStaffRole
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -1830,6 +1845,147 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+@override_settings(
+    COMMENTS_SERVICE_KEY='test-api-key',
+    COMMENTS_SERVICE_CONNECTION_POOL={
+        'ENABLED': True,
+        'POOL_SIZE': 2,
+        'MAX_RETRIES': 0,
+        'MAX_CONCURRENT_REQUESTS': 3,
+    },
+)
+class ClientTransportTestCase(TestCase):
+    """Tests the pooled, concurrent transport of the comment client against a stub comments service."""
+
+    def setUp(self):
+        super(ClientTransportTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        self.expected_response = {'id': 'test-thread', 'body': 'test body'}
+        self.server = MockCommentServiceServer(port_num=0, response=self.expected_response)
+        self.addCleanup(self.server.shutdown)
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.server_url = 'http://127.0.0.1:{}/api/v1'.format(self.server.server_address[1])
+
+        reset_latency_histograms()
+        self.addCleanup(reset_latency_histograms)
+
+    def test_perform_requests(self):
+        results = perform_requests([
+            {'method': 'get', 'url': self.server_url + '/threads/1', 'metric_action': 'model.retrieve'},
+            {'method': 'get', 'url': self.server_url + '/users/1', 'metric_action': 'user.read'},
+            {'method': 'put', 'url': self.server_url + '/threads/1', 'data_or_params': {'body': 'new body'}},
+        ])
+        self.assertEqual(results, [self.expected_response] * 3)
+
+        histograms = get_latency_histograms()
+        self.assertEqual(sorted(histograms), ['model.retrieve', 'put', 'user.read'])
+        self.assertTrue(all(sum(counts) == 1 for counts in histograms.values()))
+
+    def test_perform_request_reuses_session(self):
+        self.assertEqual(perform_request('get', self.server_url + '/threads/1'), self.expected_response)
+        self.assertEqual(perform_request('get', self.server_url + '/threads/1'), self.expected_response)
+        self.assertEqual(sum(get_latency_histograms()['get']), 2)
+
+    def test_perform_requests_error(self):
+        with self.assertRaises(requests.ConnectionError):
+            perform_requests([
+                {'method': 'get', 'url': self.server_url + '/threads/1'},
+                {'method': 'get', 'url': 'http://127.0.0.1:1/api/v1/threads/1'},
+            ])
+        self.assertEqual(sum(get_latency_histograms()['get']), 2)
+
+    def test_retrieve_all(self):
+        with patch.object(Thread, 'base_url', self.server_url + '/threads'), \
+                patch.object(User, 'base_url', self.server_url + '/users'):
+            user = User(id='1', course_id='course-v1:edX+DemoX+Demo_Course')
+            thread = Thread(id='1')
+            cc.retrieve_all([(user, {}), (thread, {'with_responses': True, 'user_id': '1'})])
+
+        self.assertTrue(user.retrieved)
+        self.assertTrue(thread.retrieved)
+        self.assertEqual(thread.body, self.expected_response['body'])
+        self.assertEqual(sum(get_latency_histograms()['model.retrieve']), 2)
+
+    def test_retrieve_all_error(self):
+        with patch.object(Thread, 'base_url', 'http://127.0.0.1:1/api/v1/threads'):
+            thread = Thread(id='1')
+            with self.assertRaises(requests.ConnectionError):
+                cc.retrieve_all([(thread, {})])
+        self.assertFalse(thread.retrieved)
+
+
+
+@override_settings(COMMENTS_SERVICE_RESPONSE_CACHE={'TIMEOUT': 60})
+class ClientResponseCacheTestCase(CacheIsolationTestCase):
+    """Tests that the comment client caches the responses to read-only requests and invalidates them on writes."""
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(ClientResponseCacheTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        patcher = patch('requests.request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request.return_value = Mock(
+            status_code=200,
+            json=lambda: {'id': 'test-thread', 'course_id': 'course-v1:x+y+z', 'collection': []},
+        )
+
+        reset_response_cache_stats()
+        self.addCleanup(reset_response_cache_stats)
+
+    def search(self, user_id='1'):
+        """Searches the threads of the test course as the given user."""
+        Thread.search({'course_id': 'course-v1:x+y+z', 'user_id': user_id})
+
+    def test_search_cached(self):
+        self.search()
+        self.search()
+        self.assertEqual(self.mock_request.call_count, 1)
+        self.assertEqual(
+            get_response_cache_stats(), {'thread.search': {'hits': 1, 'misses': 1, 'hit_rate': 0.5}}
+        )
+
+    def test_search_keyed_by_user(self):
+        self.search(user_id='1')
+        self.search(user_id='2')
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    @override_settings(COMMENTS_SERVICE_RESPONSE_CACHE={'TIMEOUT': 0})
+    def test_disabled(self):
+        self.search()
+        self.search()
+        self.assertEqual(self.mock_request.call_count, 2)
+        self.assertEqual(get_response_cache_stats(), {})
+
+    def test_thread_save_invalidates(self):
+        self.search()
+        Thread(id='test-thread', course_id='course-v1:x+y+z', title='new title').save()
+        self.search()
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_vote_invalidates(self):
+        self.search()
+        User(id='1').vote(Thread(id='test-thread', course_id='course-v1:x+y+z'), 'up')
+        self.search()
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_retrieve_marking_as_read_not_cached(self):
+        Thread(id='test-thread').retrieve(user_id='1', mark_as_read=True)
+        Thread(id='test-thread').retrieve(user_id='1', mark_as_read=False)
+        Thread(id='test-thread').retrieve(user_id='1', mark_as_read=False)
+        Thread(id='test-thread').retrieve(user_id='1', mark_as_read=True)
+        self.assertEqual(self.mock_request.call_count, 3)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -11,7 +11,7 @@ from ccx_keys.locator import CCXLocator
 from xmodule import block_metadata_utils
 
 from .config import assume_zero_if_absent
-from .subsection_grade import ZeroSubsectionGrade
+from .subsection_grade import PrecomputedSubsectionGrade, ZeroSubsectionGrade
 from .subsection_grade_factory import SubsectionGradeFactory
 from .scores import compute_percent
 
@@ -242,8 +242,11 @@ class CourseGrade(CourseGradeBase):
     Course Grade class when grades are updated or read from storage.
     """
     def __init__(self, user, course_data, *args, **kwargs):
+        csm_scores = kwargs.pop('csm_scores', None)
         super(CourseGrade, self).__init__(user, course_data, *args, **kwargs)
-        self._subsection_grade_factory = SubsectionGradeFactory(user, course_data=course_data)
+        self._subsection_grade_factory = SubsectionGradeFactory(
+            user, course_data=course_data, csm_scores=csm_scores,
+        )
 
     def update(self):
         """
@@ -321,5 +324,47 @@ class CourseGrade(CourseGradeBase):
         return success_cutoff and percent >= success_cutoff
 
 
+class PrecomputedCourseGradeMixin(object):
+    """
+    Mixin for Course Grades computed in another process, e.g. by a worker
+    of a parallel CourseGradeFactory.iter, which sent back whether the
+    user attempted the course and the total scores of some of their
+    subsection grades, keyed by subsection location.
+
+    The grades of other subsections are computed as usual, when needed.
+    """
+    def __init__(self, user, course_data, attempted, subsection_totals, *args, **kwargs):
+        super(PrecomputedCourseGradeMixin, self).__init__(user, course_data, *args, **kwargs)
+        self._attempted = attempted
+        self._subsection_totals = subsection_totals
+
+    @property
+    def attempted(self):
+        return self._attempted
+
+    def _get_subsection_grade(self, subsection, force_update_subsections=False):
+        try:
+            all_total, graded_total = self._subsection_totals[subsection.location]
+        except KeyError:
+            return super(PrecomputedCourseGradeMixin, self)._get_subsection_grade(
+                subsection, force_update_subsections,
+            )
+        return PrecomputedSubsectionGrade(subsection, all_total, graded_total)
+
+
+class PrecomputedCourseGrade(PrecomputedCourseGradeMixin, CourseGrade):
+    """
+    Course Grade class for grades computed in another process.
+    """
+    pass
+
+
+class PrecomputedZeroCourseGrade(PrecomputedCourseGradeMixin, ZeroCourseGrade):
+    """
+    Course Grade class for Zero-value grades computed in another process.
+    """
+    pass
+
+
 def _uniqueify_and_keep_order(iterable):
     return OrderedDict([(item, None) for item in iterable]).keys()
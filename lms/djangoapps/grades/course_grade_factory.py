@@ -1,22 +1,48 @@
 """
 Course Grade Factory Class
 """
-from collections import namedtuple
+import itertools
+import multiprocessing
+import pickle
+from collections import deque, namedtuple
 from logging import getLogger
+from time import time
 
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connections
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
 from six import text_type
 
+from courseware.model_data import MultiUserScoresClient
 from openedx.core.djangoapps.signals.signals import (COURSE_GRADE_CHANGED,
                                                      COURSE_GRADE_NOW_PASSED,
                                                      COURSE_GRADE_NOW_FAILED)
 
 from .config import assume_zero_if_absent, should_persist_grades
+from .context import graded_subsections_for_course
 from .course_data import CourseData
-from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade, prefetch
+from .course_grade import CourseGrade, PrecomputedCourseGrade, PrecomputedZeroCourseGrade, ZeroCourseGrade
+from .exceptions import ParallelGradingError
+from .models import PersistentCourseGrade, bulk_prefetch, prefetch
+from .scores import possibly_scored
 
 log = getLogger(__name__)
 
+# The course data and options shared with the worker processes of a
+# parallel CourseGradeFactory.iter.  Set in the parent process before the
+# workers are forked, so they inherit the pre-fetched collected block
+# structure rather than receiving it through a pipe.
+_parallel_iter_context = None
+
+# The database connections a worker process of a parallel
+# CourseGradeFactory.iter inherited from the parent process.  They are kept,
+# unused, until the worker exits, since closing them would also end the
+# parent's sessions.
+_inherited_db_connections = []
+
 
 class CourseGradeFactory(object):
     """
@@ -62,19 +88,22 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             force_update_subsections=False,
+            csm_scores=None,
     ):
         """
         Computes, updates, and returns the CourseGrade for the given
         user in the course.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        or course_key should be provided.  csm_scores, if given, is a
+        ScoresClient already holding the user's scores in the course.
         """
         course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
         return self._update(
             user,
             course_data,
-            force_update_subsections=force_update_subsections
+            force_update_subsections=force_update_subsections,
+            csm_scores=csm_scores,
         )
 
     def iter(
@@ -84,6 +113,7 @@ class CourseGradeFactory(object):
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            workers=1,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -93,6 +123,17 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If workers is greater than 1, the students are graded in shards by
+        a pool of that many worker processes, unless this process is
+        daemonic, e.g. a worker of Celery's prefork pool, and so cannot
+        start any.  Only callers that grade many students outside of a
+        request, such as the course grade report, should use workers.
+        Results are yielded in the order of the given students either way.
+
+        When force_update is True, the scores stored in the user state of
+        each shard of settings.GRADES_PARALLEL_SHARD_SIZE students are
+        fetched at once.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -102,11 +143,125 @@ class CourseGradeFactory(object):
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
-        stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if workers > 1 and not _can_start_worker_processes():
+            log.warning(
+                u'Grades: Cannot start worker processes in a daemonic process, grading serially, %s',
+                unicode(course_data),
+            )
+            workers = 1
+
+        start_time = time()
+        num_graded = 0
+        if workers > 1:
+            results = self._iter_parallel(users, course_data, force_update, workers)
+        elif force_update:
+            results = self._iter_update_shards(users, course_data)
+        else:
+            results = (self._iter_grade_result(user, course_data, force_update) for user in users)
+        for result in results:
+            num_graded += 1
+            yield result
+        self._log_iter_throughput(course_data, num_graded, time() - start_time, workers)
+
+    def _iter_update_shards(self, users, course_data):
+        """
+        Yields a GradeResult for each of the given users, in order,
+        updating the grades of shards of settings.GRADES_PARALLEL_SHARD_SIZE
+        users whose scores are fetched at once.
+        """
+        user_iterator = iter(users)
+        while True:
+            shard = list(itertools.islice(user_iterator, settings.GRADES_PARALLEL_SHARD_SIZE))
+            if not shard:
+                return
+            csm_scores = _fetch_csm_scores(shard, course_data)
+            for user in shard:
+                yield self._iter_grade_result(
+                    user, course_data, True,
+                    csm_scores=csm_scores.scores_client_for_user(user.id) if csm_scores is not None else None,
+                )
+
+    def _iter_parallel(self, users, course_data, force_update, workers):
+        """
+        Yields a GradeResult for each of the given users, in order, grading
+        shards of settings.GRADES_PARALLEL_SHARD_SIZE users in a pool of
+        the given number of worker processes.
+
+        The users are read, and their shards sent to the workers, by the
+        calling thread, at most two shards per worker ahead of the results
+        yielded.  The workers compute and persist the grades; the parent
+        process builds the yielded CourseGrades from the values they send
+        back, see _grade_shard.
+        """
+        global _parallel_iter_context  # pylint: disable=global-statement
+
+        # Load the shared course data before forking.  The workers open their
+        # own database and cache connections; see _init_parallel_iter_worker.
+        course_data.collected_structure  # pylint: disable=pointless-statement
+        course_data.course  # pylint: disable=pointless-statement
+        _parallel_iter_context = (course_data, force_update)
+
+        user_iterator = iter(users)
+        shard_size = settings.GRADES_PARALLEL_SHARD_SIZE
+        pending_shards = deque()
+
+        pool = multiprocessing.Pool(processes=workers, initializer=_init_parallel_iter_worker)
+        try:
+            while True:
+                while len(pending_shards) < 2 * workers:
+                    shard = list(itertools.islice(user_iterator, shard_size))
+                    if not shard:
+                        break
+                    pending_shards.append((shard, pool.apply_async(_grade_shard, ([user.id for user in shard],))))
+                if not pending_shards:
+                    break
+                shard, shard_results = pending_shards.popleft()
+                for user, result in zip(shard, shard_results.get()):
+                    yield self._grade_result_from_shard(user, course_data, result)
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            _parallel_iter_context = None
+
+    def _grade_result_from_shard(self, user, course_data, result):
+        """
+        Returns the GradeResult for the given user from the given result
+        values computed by a parallel worker.
+        """
+        if isinstance(result, Exception):
+            return self.GradeResult(user, None, result)
+
+        percent, letter_grade, passed, is_zero, attempted, subsection_totals = result
+        user_course_data = CourseData(
+            user,
+            course=course_data.course,
+            collected_block_structure=course_data.collected_structure,
+            course_key=course_data.course_key,
+        )
+        course_grade_class = PrecomputedZeroCourseGrade if is_zero else PrecomputedCourseGrade
+        course_grade = course_grade_class(
+            user, user_course_data, attempted, subsection_totals, percent, letter_grade, passed,
+        )
+        return self.GradeResult(user, course_grade, None)
+
+    @staticmethod
+    def _log_iter_throughput(course_data, num_graded, elapsed, workers):
+        """
+        Logs and reports as custom metrics the throughput of a call to iter.
+        """
+        users_per_second = num_graded / elapsed if elapsed else 0.0
+        log.info(
+            u'Grades: Iter, %s, users: %d, seconds: %.2f, users/second: %.2f, workers: %d',
+            unicode(course_data), num_graded, elapsed, users_per_second, workers,
+        )
+        set_custom_metric('grades_iter_num_users', num_graded)
+        set_custom_metric('grades_iter_users_per_second', round(users_per_second, 2))
+        set_custom_metric('grades_iter_workers', workers)
 
-    def _iter_grade_result(self, user, course_data, force_update):
+    def _iter_grade_result(self, user, course_data, force_update, csm_scores=None):
         try:
             kwargs = {
                 'user': user,
@@ -116,6 +271,8 @@ class CourseGradeFactory(object):
             }
             if force_update:
                 kwargs['force_update_subsections'] = True
+                if csm_scores is not None:
+                    kwargs['csm_scores'] = csm_scores
 
             method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
             course_grade = method(**kwargs)
@@ -160,7 +317,7 @@ class CourseGradeFactory(object):
         )
 
     @staticmethod
-    def _update(user, course_data, force_update_subsections=False):
+    def _update(user, course_data, force_update_subsections=False, csm_scores=None):
         """
         Computes, saves, and returns a CourseGrade object for the
         given user and course.
@@ -175,7 +332,8 @@ class CourseGradeFactory(object):
         course_grade = CourseGrade(
             user,
             course_data,
-            force_update_subsections=force_update_subsections
+            force_update_subsections=force_update_subsections,
+            csm_scores=csm_scores,
         )
         course_grade = course_grade.update()
 
@@ -220,3 +378,145 @@ class CourseGradeFactory(object):
         )
 
         return course_grade
+
+
+def _init_parallel_iter_worker():
+    """
+    Initializes a worker process of a parallel CourseGradeFactory.iter,
+    so it opens its own database and cache connections rather than sharing
+    those inherited from the parent process.
+
+    The inherited database connections are set aside rather than closed,
+    so that the parent's connections, and any transaction it is in, are
+    left intact.
+    """
+    for connection in connections.all():
+        if connection.connection is not None:
+            _inherited_db_connections.append(connection.connection)
+            connection.connection = None
+    for cache in caches.all():
+        cache.close()
+
+
+def _grade_shard(user_ids):
+    """
+    Computes, in a worker process, the course grades of the users with
+    the given ids, after prefetching their persisted grade data in bulk.
+
+    Returns, in the order of the given ids, either the values of the
+    user's course grade read by the consumers of a parallel iter, see
+    _course_grade_values, or the error that prevented grading the user.
+    """
+    course_data, force_update = _parallel_iter_context
+    users_by_id = User.objects.in_bulk(user_ids)
+    users = [users_by_id[user_id] for user_id in user_ids]
+
+    try:
+        if should_persist_grades(course_data.course_key):
+            try:
+                bulk_prefetch(users, course_data.course_key)
+            except Exception:  # pylint: disable=broad-except
+                # Grade the users without the prefetched data, so that any
+                # errors are reported per user.
+                log.exception(u'Grades: Failed to prefetch grades of %d users, %s', len(users), unicode(course_data))
+                RequestCache.clear_all_namespaces()
+        csm_scores = _fetch_csm_scores(users, course_data) if force_update else None
+
+        results = []
+        for user in users:
+            _, course_grade, error = CourseGradeFactory()._iter_grade_result(  # pylint: disable=protected-access
+                user, course_data, force_update,
+                csm_scores=csm_scores.scores_client_for_user(user.id) if csm_scores is not None else None,
+            )
+            if error is None:
+                try:
+                    results.append(_course_grade_values(course_grade, course_data))
+                except Exception as exc:  # pylint: disable=broad-except
+                    log.exception(
+                        u'Cannot grade student %s in course %s because of exception: %s',
+                        user.id,
+                        course_data.course_key,
+                        text_type(exc)
+                    )
+                    error = exc
+            if error is not None:
+                results.append(_picklable_error(error))
+        return results
+    finally:
+        RequestCache.clear_all_namespaces()
+
+
+def _course_grade_values(course_grade, course_data):
+    """
+    Returns a tuple of the values of the given course grade that the
+    consumers of a parallel iter, such as the course grade report, read:
+    (percent, letter_grade, passed, is_zero, attempted, subsection_totals),
+    where subsection_totals maps the location of each graded subsection
+    of the course to its (all_total, graded_total).
+
+    Computing these in the worker keeps the parent process from computing
+    the subsection grades again, one user at a time.
+    """
+    subsection_totals = {}
+    for subsection in graded_subsections_for_course(course_data.collected_structure):
+        try:
+            subsection_grade = course_grade.subsection_grade(subsection.location)
+        except KeyError:
+            # Not in the user's course structure; computed, if ever needed, by the parent.
+            continue
+        subsection_totals[subsection.location] = (subsection_grade.all_total, subsection_grade.graded_total)
+    return (
+        course_grade.percent,
+        course_grade.letter_grade,
+        course_grade.passed,
+        isinstance(course_grade, ZeroCourseGrade),
+        course_grade.attempted,
+        subsection_totals,
+    )
+
+
+def _can_start_worker_processes():
+    """
+    Returns whether this process may start worker processes, which
+    daemonic processes, such as the workers of Celery's prefork pool,
+    may not.
+    """
+    if multiprocessing.current_process().daemon:
+        return False
+    try:
+        import billiard
+    except ImportError:
+        return True
+    return not billiard.current_process().daemon
+
+
+def _picklable_error(error):
+    """
+    Returns the given error, or a ParallelGradingError with its message
+    and type name if it cannot be sent back to the parent process.
+    """
+    try:
+        return pickle.loads(pickle.dumps(error, pickle.HIGHEST_PROTOCOL))
+    except Exception:  # pylint: disable=broad-except
+        return ParallelGradingError(text_type(error), type(error).__name__)
+
+
+def _fetch_csm_scores(users, course_data):
+    """
+    Returns a MultiUserScoresClient holding the scores stored in the user
+    state of the given users, for all the possibly scored blocks of the course.
+
+    Returns None if the scores could not be fetched, in which case each
+    user's scores are read as they are graded, so that any errors are
+    reported per user.
+    """
+    scorable_locations = [
+        block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+    ]
+    try:
+        return MultiUserScoresClient.create_for_locations(
+            course_data.course_key, [user.id for user in users], scorable_locations,
+        )
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u'Grades: Failed to fetch scores of %d users, %s', len(users), unicode(course_data))
+        return None
@@ -9,3 +9,18 @@ class DatabaseNotReadyError(IOError):
     the data we're trying to find.
     """
     pass
+
+
+class ParallelGradingError(Exception):
+    """
+    Error that prevented grading a user in a worker process of a parallel
+    CourseGradeFactory.iter, standing in for an error which could not be
+    sent back to the parent process.  error_type is the name of the class
+    of the original error.
+    """
+    def __init__(self, message, error_type):
+        super(ParallelGradingError, self).__init__(message)
+        self.error_type = error_type
+
+    def __reduce__(self):
+        return self.__class__, (self.args[0], self.error_type)
@@ -243,6 +243,22 @@ class VisibleBlocks(models.Model):
         get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(user_id, course_key)] = prefetched
         return prefetched
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches visible blocks for all the given users in the given
+        course, in a single query, and stores them in the cache.
+        """
+        prefetched = {user.id: {} for user in users}
+        grades_with_blocks = PersistentSubsectionGrade.objects.select_related('visible_blocks').filter(
+            user_id__in=list(prefetched),
+            course_id=course_key,
+        )
+        for grade in grades_with_blocks:
+            prefetched[grade.user_id][grade.visible_blocks.hashed] = grade.visible_blocks
+        for user_id, user_prefetched in prefetched.iteritems():
+            get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(user_id, course_key)] = user_prefetched
+
     @classmethod
     def _update_cache(cls, user_id, course_key, visible_blocks):
         """
@@ -673,6 +689,22 @@ class PersistentSubsectionGradeOverride(models.Model):
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches overrides for all the given users in the given
+        course, in a single query.
+        """
+        prefetched = {user.id: {} for user in users}
+        overrides = cls.objects.select_related('grade').filter(
+            grade__user_id__in=list(prefetched),
+            grade__course_id=course_key,
+        )
+        for override in overrides:
+            prefetched[override.grade.user_id][override.grade.usage_key] = override
+        for user_id, user_prefetched in prefetched.iteritems():
+            get_cache(cls._CACHE_NAMESPACE)[(user_id, str(course_key))] = user_prefetched
+
     @classmethod
     def get_override(cls, user_id, usage_key):
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
@@ -798,3 +830,15 @@ class PersistentSubsectionGradeOverrideHistory(models.Model):
 def prefetch(user, course_key):
     PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
     VisibleBlocks.bulk_read(user.id, course_key)
+
+
+def bulk_prefetch(users, course_key):
+    """
+    Prefetches the persisted course grades, subsection grades, overrides
+    and visible blocks of all the given users in the given course, in a
+    fixed number of queries.
+    """
+    PersistentCourseGrade.prefetch(course_key, users)
+    PersistentSubsectionGrade.prefetch(course_key, users)
+    PersistentSubsectionGradeOverride.bulk_prefetch(course_key, users)
+    VisibleBlocks.bulk_prefetch(course_key, users)
@@ -4,3 +4,13 @@ def plugin_settings(settings):
 
     # Queue to use for updating grades due to grading policy change
     settings.POLICY_CHANGE_GRADES_ROUTING_KEY = settings.DEFAULT_PRIORITY_QUEUE
+
+    # Number of worker processes the course grade report uses to compute
+    # course grades in parallel; 1 computes them serially.  Workers cannot be
+    # started by daemonic processes, such as the workers of Celery's prefork
+    # pool, which compute the grades serially.
+    settings.GRADES_PARALLEL_WORKERS = 1
+
+    # Number of users graded per task by each parallel worker process, and
+    # whose scores are fetched at once when CourseGradeFactory.iter updates grades.
+    settings.GRADES_PARALLEL_SHARD_SIZE = 100
@@ -12,3 +12,11 @@ def plugin_settings(settings):
     settings.POLICY_CHANGE_GRADES_ROUTING_KEY = settings.ENV_TOKENS.get(
         'POLICY_CHANGE_GRADES_ROUTING_KEY', settings.DEFAULT_PRIORITY_QUEUE,
     )
+
+    # Parallel computation of course grades
+    settings.GRADES_PARALLEL_WORKERS = settings.ENV_TOKENS.get(
+        'GRADES_PARALLEL_WORKERS', settings.GRADES_PARALLEL_WORKERS,
+    )
+    settings.GRADES_PARALLEL_SHARD_SIZE = settings.ENV_TOKENS.get(
+        'GRADES_PARALLEL_SHARD_SIZE', settings.GRADES_PARALLEL_SHARD_SIZE,
+    )
@@ -345,3 +345,12 @@ class CreateSubsectionGrade(NonZeroSubsectionGrade):
             for location, score in
             self.problem_scores.iteritems()
         ]
+
+
+class PrecomputedSubsectionGrade(NonZeroSubsectionGrade):
+    """
+    Class for Subsection grades computed in another process, of which
+    only the total scores are known, see PrecomputedCourseGrade.
+    """
+    def __init__(self, subsection, all_total, graded_total):
+        super(PrecomputedSubsectionGrade, self).__init__(subsection, all_total, graded_total)
@@ -21,9 +21,14 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course=None, course_structure=None, course_data=None):
+    def __init__(self, student, course=None, course_structure=None, course_data=None, csm_scores=None):
+        """
+        csm_scores, if given, is a ScoresClient already holding the
+        student's scores in the course, e.g. from a MultiUserScoresClient.
+        """
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
+        self._prefetched_csm_scores = csm_scores
 
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = OrderedDict()
@@ -104,6 +109,8 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        if self._prefetched_csm_scores is not None:
+            return self._prefetched_csm_scores
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
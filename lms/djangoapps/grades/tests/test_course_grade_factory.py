@@ -2,10 +2,15 @@
 Tests for the CourseGradeFactory class.
 """
 import itertools
+import os
+import threading
 
 import ddt
 from courseware.access import has_access
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection
+from django.test.utils import override_settings
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from mock import patch
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
@@ -15,14 +20,70 @@ from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from .. import course_grade_factory
 from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
-from ..course_grade import CourseGrade, ZeroCourseGrade
+from ..course_grade import CourseGrade, PrecomputedCourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
-from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
+from ..exceptions import ParallelGradingError
+from ..subsection_grade import PrecomputedSubsectionGrade, ReadSubsectionGrade, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
 
 
+class InlinePool(object):
+    """
+    Stand-in for multiprocessing.Pool that runs the tasks in the calling
+    process, so they share its test database transaction.
+    """
+    def __init__(self, processes, initializer):
+        self.processes = processes
+
+    def apply_async(self, func, args):
+        return InlineResult(func(*args))
+
+    def close(self):
+        pass
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+class InlineResult(object):
+    """
+    Stand-in for the AsyncResult of a task run by an InlinePool.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class UnpicklableError(Exception):
+    """
+    Error which cannot be sent back from a worker process as is.
+    """
+    def __reduce__(self):
+        raise TypeError('cannot pickle UnpicklableError')
+
+
+def grade_shard_in_worker(user_ids):
+    """
+    Stand-in for course_grade_factory._grade_shard which grades the users
+    without the database, giving the id of the worker process as their
+    letter grade, and fails to grade the third user.
+    """
+    return [
+        course_grade_factory._picklable_error(UnpicklableError(u'Error for {}.'.format(user_id)))  # pylint: disable=protected-access
+        if user_id == grade_shard_in_worker.failing_user_id
+        else (0.5, text_type(os.getpid()), True, False, True, {})
+        for user_id in user_ids
+    ]
+
+
 @ddt.ddt
 class TestCourseGradeFactory(GradeTestBase):
     """
@@ -185,6 +246,30 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         self.assertEqual(mock_update.called, force_update)
 
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool', InlinePool)
+    def test_parallel_iter_subsection_grades(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course, force_update_subsections=True)
+        [(_, serial_grade, _)] = CourseGradeFactory().iter([self.request.user], self.course)
+        [(_, parallel_grade, _)] = CourseGradeFactory().iter([self.request.user], self.course, workers=2)
+        subsection_keys = [self.sequence.location, self.sequence2.location]
+        serial_subsection_grades = [serial_grade.subsection_grade(key) for key in subsection_keys]
+
+        self.assertIsInstance(parallel_grade, PrecomputedCourseGrade)
+        self.assertEqual(parallel_grade.attempted, serial_grade.attempted)
+
+        # The workers computed the subsection grades, so the parent does not compute them again.
+        with patch('lms.djangoapps.grades.subsection_grade_factory.SubsectionGradeFactory.create') as mock_create:
+            parallel_subsection_grades = [parallel_grade.subsection_grade(key) for key in subsection_keys]
+        self.assertFalse(mock_create.called)
+        for serial_subsection_grade, parallel_subsection_grade in zip(
+                serial_subsection_grades, parallel_subsection_grades,
+        ):
+            self.assertIsInstance(parallel_subsection_grade, PrecomputedSubsectionGrade)
+            self.assertEqual(parallel_subsection_grade.location, serial_subsection_grade.location)
+            self.assertEqual(parallel_subsection_grade.attempted_graded, serial_subsection_grade.attempted_graded)
+            self.assertEqual(parallel_subsection_grade.percent_graded, serial_subsection_grade.percent_graded)
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -335,6 +420,132 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         self.assertIsNotNone(all_course_grades[student2])
         self.assertIsNotNone(all_course_grades[student5])
 
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool', InlinePool)
+    def test_parallel_iter(self):
+        serial_results = list(CourseGradeFactory().iter(self.students, self.course, workers=1))
+        parallel_results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+
+        self.assertEqual([result.student for result in parallel_results], self.students)
+        for serial_result, parallel_result in zip(serial_results, parallel_results):
+            self.assertIsNone(parallel_result.error)
+            self.assertIsInstance(parallel_result.course_grade, type(serial_result.course_grade))
+            self.assertEqual(parallel_result.course_grade.percent, serial_result.course_grade.percent)
+            self.assertEqual(parallel_result.course_grade.letter_grade, serial_result.course_grade.letter_grade)
+            self.assertEqual(parallel_result.course_grade.user, parallel_result.student)
+
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool')
+    def test_iter_serial_by_default(self, mock_pool):
+        results = list(CourseGradeFactory().iter(self.students, self.course))
+
+        self.assertFalse(mock_pool.called)
+        self.assertEqual([result.student for result in results], self.students)
+
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool')
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.current_process')
+    def test_parallel_iter_in_daemonic_process(self, mock_current_process, mock_pool):
+        mock_current_process.return_value.daemon = True
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+
+        self.assertFalse(mock_pool.called)
+        self.assertEqual([result.student for result in results], self.students)
+        self.assertTrue(all(result.error is None for result in results))
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=1)
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool', InlinePool)
+    def test_parallel_iter_reads_users_ahead(self):
+        read_users = []
+
+        def users():
+            """
+            Yields the students, recording the thread reading each.
+            """
+            for student in self.students:
+                read_users.append((student, threading.current_thread()))
+                yield student
+
+        results = CourseGradeFactory().iter(users(), self.course, workers=2)
+        self.assertEqual(next(results).student, self.students[0])
+
+        # Two shards of one user per worker are read ahead, by the calling thread.
+        self.assertEqual(read_users, [(student, threading.current_thread()) for student in self.students[:4]])
+        self.assertEqual([result.student for result in results], self.students[1:])
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool', InlinePool)
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
+    def test_parallel_iter_grading_exception(self, mock_course_grade):
+        mock_course_grade.side_effect = [
+            ValueError(u"Error for {}.".format(student.username))
+            if student.username == 'student3'
+            else mock_course_grade.return_value
+            for student in self.students
+        ]
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertEqual(text_type(results[2].error), u"Error for student3.")
+        self.assertIsNone(results[2].course_grade)
+        self.assertEqual(len([result for result in results if result.error]), 1)
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch('lms.djangoapps.grades.course_grade_factory.multiprocessing.Pool', InlinePool)
+    @patch('lms.djangoapps.grades.course_grade_factory.should_persist_grades', return_value=True)
+    @patch('lms.djangoapps.grades.course_grade_factory.bulk_prefetch', side_effect=DatabaseError)
+    def test_parallel_iter_prefetch_exception(self, mock_bulk_prefetch, _mock_should_persist_grades):
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+
+        self.assertTrue(mock_bulk_prefetch.called)
+        self.assertEqual([result.student for result in results], self.students)
+        self.assertTrue(all(result.error is None for result in results))
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch('lms.djangoapps.grades.course_grade_factory._grade_shard', grade_shard_in_worker)
+    def test_parallel_iter_forks(self):
+        """
+        Grade in actual worker processes, which must leave the test's
+        database transaction intact.
+        """
+        grade_shard_in_worker.failing_user_id = self.students[2].id
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+
+        self.assertEqual([result.student for result in results], self.students)
+        self.assertIsInstance(results[2].error, ParallelGradingError)
+        self.assertEqual(results[2].error.error_type, 'UnpicklableError')
+        self.assertEqual(text_type(results[2].error), u'Error for {}.'.format(self.students[2].id))
+        for result in results[:2] + results[3:]:
+            self.assertIsNone(result.error)
+            self.assertNotEqual(result.course_grade.letter_grade, text_type(os.getpid()))
+        self.assertTrue(connection.in_atomic_block)
+        self.assertEqual(User.objects.filter(id__in=[student.id for student in self.students]).count(), 5)
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch(
+        'lms.djangoapps.grades.course_grade_factory._fetch_csm_scores',
+        wraps=course_grade_factory._fetch_csm_scores,
+    )
+    def test_iter_update_fetches_scores_per_shard(self, mock_fetch_csm_scores):
+        results = list(CourseGradeFactory().iter(self.students, self.course, force_update=True, workers=1))
+
+        self.assertEqual([result.student for result in results], self.students)
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(
+            [[user.id for user in call_args[0][0]] for call_args in mock_fetch_csm_scores.call_args_list],
+            [[user.id for user in self.students[index:index + 2]] for index in range(0, len(self.students), 2)],
+        )
+
+    @override_settings(GRADES_PARALLEL_SHARD_SIZE=2)
+    @patch(
+        'lms.djangoapps.grades.course_grade_factory.MultiUserScoresClient.create_for_locations',
+        side_effect=DatabaseError,
+    )
+    def test_iter_update_scores_fetch_exception(self, mock_create_for_locations):
+        results = list(CourseGradeFactory().iter(self.students, self.course, force_update=True, workers=1))
+
+        self.assertEqual(mock_create_for_locations.call_count, 3)
+        self.assertEqual([result.student for result in results], self.students)
+        self.assertTrue(all(result.error is None for result in results))
+
     def _course_grades_and_errors_for(self, course, students):
         """
         Simple helper method to iterate through student grades and give us
@@ -0,0 +1,69 @@
+"""
+Tests for the vectorized module.
+"""
+# pylint: disable=protected-access
+import ddt
+import numpy as np
+from django.test import TestCase
+from mock import Mock
+from xmodule.graders import AssignmentFormatGrader
+
+from ..vectorized import VectorizedCourseGrades
+
+
+@ddt.ddt
+class TestVectorizedCourseGrades(TestCase):
+    """
+    Tests the array operations of VectorizedCourseGrades against the
+    course grader's computations.
+    """
+    PERCENTS = np.array([
+        [0.5, 0.0, 1.0, 0.25, 0.75],
+        [0.0, 0.0, 0.0, 0.0, 0.0],
+        [0.9, 0.33, 0.33, 0.1, 1.0],
+    ])
+    INCLUDED = np.array([
+        [True, True, True, True, True],
+        [True, False, True, False, False],
+        [False, True, True, True, False],
+    ])
+
+    @ddt.data(
+        (0, 0),
+        (3, 0),
+        (5, 2),
+        (8, 1),
+        (2, 4),
+        (1, 9),
+    )
+    @ddt.unpack
+    def test_total_with_drops(self, min_count, drop_count):
+        grader = AssignmentFormatGrader(u'Homework', min_count, drop_count)
+        totals = VectorizedCourseGrades._total_with_drops(self.PERCENTS, self.INCLUDED, min_count, drop_count)
+
+        for percents, included, total in zip(self.PERCENTS, self.INCLUDED, totals):
+            scores = [percent for percent, is_included in zip(percents, included) if is_included]
+            scores += [0.0] * (min_count - len(scores))
+            expected_total, _ = grader.total_with_drops([{'percent': score} for score in scores])
+            self.assertAlmostEqual(total, expected_total)
+
+    def test_percent_graded(self):
+        percent_graded = VectorizedCourseGrades._percent_graded(
+            np.array([[1.0, 2.0, 0.0]]),
+            np.array([[3.0, 0.0, 0.0]]),
+        )
+        self.assertEqual(percent_graded.tolist(), [[0.33, 0.0, 0.0]])
+
+    @ddt.data(
+        ({u'A': 0.9, u'B': 0.8, u'F': 0.0}, [u'A', u'B', u'F', u'A'], [True, True, False, True]),
+        ({u'Pass': 0.5}, [u'Pass', u'Pass', None, u'Pass'], [True, True, False, True]),
+        ({}, [None, None, None, None], [False, False, False, False]),
+    )
+    @ddt.unpack
+    def test_letter_grades(self, grade_cutoffs, expected_letter_grades, expected_passed):
+        vectorized_grades = VectorizedCourseGrades.__new__(VectorizedCourseGrades)
+        vectorized_grades.course = Mock(grade_cutoffs=grade_cutoffs)
+
+        letter_grades, passed = vectorized_grades._letter_grades(np.array([0.95, 0.85, 0.4, 0.9]))
+        self.assertEqual(letter_grades, expected_letter_grades)
+        self.assertEqual(passed.tolist(), expected_passed)
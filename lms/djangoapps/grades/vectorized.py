@@ -0,0 +1,293 @@
+"""
+Vectorized computation of course grades for batches of learners.
+
+Instead of building a course structure and a tree of grade objects per
+learner, the persisted subsection grades of a batch of learners are
+loaded into (users x subsections) NumPy arrays, and the course grader's
+assignment type weights, drop-lowest and min_count rules and the grade
+cutoffs are applied as array operations.
+
+A learner's grade is only computed here when it agrees with the
+learner's persisted course grade.  All other learners are reported as
+stale, and should be graded with the CourseGradeFactory instead.
+"""
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+from xmodule.graders import AssignmentFormatGrader, WeightedSubsectionsGrader
+
+from .config import assume_zero_if_absent, should_persist_grades
+from .context import grading_context
+from .course_data import CourseData
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
+
+
+VectorizedCourseGrade = namedtuple(
+    'VectorizedCourseGrade',
+    [
+        'percent',
+        'letter_grade',
+        'passed',
+        'attempted',
+        # Graded percent of each subsection, in the order of
+        # VectorizedCourseGrades.subsection_locations, or None if
+        # the subsection was not attempted.
+        'subsection_grades',
+        # Average, after drops, of each assignment type's subsection
+        # grades, keyed by assignment type.
+        'assignment_averages',
+    ],
+)
+
+
+class VectorizedCourseGrades(object):
+    """
+    Computes the course grades of batches of learners in a course from
+    their persisted subsection grades.
+    """
+    def __init__(self, course, collected_block_structure, grading_cxt=None):
+        self.course = course
+        self.course_key = course.id
+        self.course_data = CourseData(
+            user=None, course=course, collected_block_structure=collected_block_structure,
+        )
+        if grading_cxt is None:
+            grading_cxt = grading_context(course, collected_block_structure)
+
+        # get_subsection_type_graders applies any grading policy
+        # overrides to the course, so course.grader is read after it.
+        self.subsection_type_graders = grading_cxt['subsection_type_graders']
+        self.grader = course.grader
+
+        self.subsection_locations = []
+        self._has_scored_descendants = []
+        self._columns_by_type = {}
+        for assignment_type, subsection_infos in grading_cxt['all_graded_subsections_by_type'].iteritems():
+            start = len(self.subsection_locations)
+            for subsection_info in subsection_infos:
+                self.subsection_locations.append(subsection_info['subsection_block'].location)
+                self._has_scored_descendants.append(bool(subsection_info['scored_descendants']))
+            self._columns_by_type[assignment_type] = np.arange(start, len(self.subsection_locations))
+        self._has_scored_descendants = np.array(self._has_scored_descendants, dtype=bool)
+        self._column_index = {location: index for index, location in enumerate(self.subsection_locations)}
+
+    @classmethod
+    def is_supported(cls, course):
+        """
+        Returns whether the grades of the given course can be computed
+        with array operations.
+        """
+        return (
+            should_persist_grades(course.id) and
+            not settings.GENERATE_PROFILE_SCORES and
+            isinstance(course.grader, WeightedSubsectionsGrader) and
+            all(isinstance(subgrader, AssignmentFormatGrader) for subgrader, _, _ in course.grader.subgraders)
+        )
+
+    def grade_users(self, users):
+        """
+        Returns a tuple of a dict of VectorizedCourseGrades keyed by
+        user id, and the list of the given users whose grades are stale
+        and must be computed with the CourseGradeFactory.
+        """
+        user_ids = [user.id for user in users]
+        user_index = {user_id: index for index, user_id in enumerate(user_ids)}
+
+        earned, possible, present, attempted_graded, attempted = self._load_subsection_grades(user_ids, user_index)
+        percent_graded = self._percent_graded(earned, possible)
+
+        raw_percents = self._grader_percents(percent_graded, possible, present)
+        percents = np.array([round(raw_percent * 100 + 0.05) / 100 for raw_percent in raw_percents.tolist()])
+        letter_grades, passed = self._letter_grades(percents)
+        persisted_percents = self._persisted_percents(user_ids, user_index, percents, letter_grades)
+
+        if assume_zero_if_absent(self.course_key):
+            attempted[:] = True
+        assignment_averages = self._assignment_averages(np.where(present, percent_graded, 0.0), attempted)
+        subsection_grades = np.where(attempted_graded, percent_graded, np.nan)
+
+        grades = {}
+        stale_users = []
+        for index, user in enumerate(users):
+            if persisted_percents[index] is None:
+                stale_users.append(user)
+                continue
+            grades[user.id] = VectorizedCourseGrade(
+                percent=persisted_percents[index],
+                letter_grade=letter_grades[index],
+                passed=bool(passed[index]),
+                attempted=bool(attempted[index]),
+                subsection_grades=[
+                    None if np.isnan(percent) else percent for percent in subsection_grades[index].tolist()
+                ],
+                assignment_averages={
+                    assignment_type: averages[index] for assignment_type, averages in assignment_averages.iteritems()
+                },
+            )
+        return grades, stale_users
+
+    def _load_subsection_grades(self, user_ids, user_index):
+        """
+        Returns the graded earned and possible values of the persisted
+        subsection grades of the given users as (users x subsections)
+        arrays, with arrays of whether each grade is present and was
+        attempted, and of whether each user attempted any subsection.
+        """
+        shape = (len(user_ids), len(self.subsection_locations))
+        earned = np.zeros(shape)
+        possible = np.zeros(shape)
+        present = np.zeros(shape, dtype=bool)
+        attempted_graded = np.zeros(shape, dtype=bool)
+        attempted = np.zeros(len(user_ids), dtype=bool)
+
+        rows = PersistentSubsectionGrade.objects.filter(
+            user_id__in=user_ids,
+            course_id=self.course_key,
+        ).values_list(
+            'user_id',
+            'usage_key',
+            'earned_graded',
+            'possible_graded',
+            'first_attempted',
+            'override__earned_graded_override',
+            'override__possible_graded_override',
+        )
+        for (
+                user_id, usage_key, earned_value, possible_value, first_attempted, earned_override, possible_override,
+        ) in rows:
+            row = user_index[user_id]
+            if first_attempted is not None:
+                attempted[row] = True
+            if usage_key.run is None:
+                usage_key = usage_key.replace(course_key=self.course_key)
+            column = self._column_index.get(usage_key)
+            if column is None:
+                continue
+            earned[row, column] = earned_value if earned_override is None else earned_override
+            possible[row, column] = possible_value if possible_override is None else possible_override
+            present[row, column] = True
+            attempted_graded[row, column] = first_attempted is not None
+        return earned, possible, present, attempted_graded, attempted
+
+    @staticmethod
+    def _percent_graded(earned, possible):
+        """
+        Returns the rounded graded percent of each subsection grade, as
+        computed by scores.compute_percent.
+        """
+        percent_graded = np.zeros(earned.shape)
+        np.divide(earned, possible, out=percent_graded, where=possible > 0)
+        return np.around(percent_graded, decimals=2)
+
+    def _grader_percents(self, percent_graded, possible, present):
+        """
+        Returns the unrounded course percent of each user, as computed by
+        the course's WeightedSubsectionsGrader.
+
+        As in CourseGrade.graded_subsections_by_format, the grader only
+        sees subsections that are worth points.  Subsections without a
+        persisted grade count as zero when they have scored content.
+        """
+        in_grade_sheet = np.where(present, possible > 0, self._has_scored_descendants)
+        total = np.zeros(percent_graded.shape[0])
+        for subgrader, assignment_type, weight in self.grader.subgraders:
+            columns = self._columns_by_type.get(assignment_type, np.arange(0))
+            total += weight * self._total_with_drops(
+                percent_graded[:, columns],
+                in_grade_sheet[:, columns],
+                subgrader.min_count,
+                subgrader.drop_count,
+            )
+        return total
+
+    def _assignment_averages(self, percent_graded, attempted):
+        """
+        Returns the average, after drops, of all the subsection grades of
+        each assignment type, keyed by assignment type, as reported by
+        the grade report.
+        """
+        averages = {}
+        for assignment_type, columns in self._columns_by_type.iteritems():
+            subgrader = self.subsection_type_graders.get(assignment_type)
+            if subgrader:
+                average = self._total_with_drops(
+                    percent_graded[:, columns],
+                    np.ones((percent_graded.shape[0], len(columns)), dtype=bool),
+                    0,
+                    subgrader.drop_count,
+                )
+                averages[assignment_type] = np.where(attempted, average, 0.0).tolist()
+        return averages
+
+    @staticmethod
+    def _total_with_drops(percents, included, min_count, drop_count):
+        """
+        Returns, for each row, the average of the included percents
+        padded with zeros up to min_count, after dropping the lowest
+        drop_count of them, as AssignmentFormatGrader does.
+        """
+        num_rows = percents.shape[0]
+        num_included = included.sum(axis=1)
+        num_padded = np.maximum(min_count - num_included, 0)
+        num_scores = num_included + num_padded
+
+        # Sorting moves the excluded percents to the end of each row.
+        sorted_percents = np.sort(np.where(included, percents, np.inf), axis=1)
+        sorted_percents[np.isinf(sorted_percents)] = 0.0
+        cumulative = np.concatenate([np.zeros((num_rows, 1)), np.cumsum(sorted_percents, axis=1)], axis=1)
+
+        # The padded zeros are always among the lowest scores, so only
+        # the drops beyond them remove included percents.
+        rows = np.arange(num_rows)
+        num_dropped_included = np.clip(drop_count - num_padded, 0, num_included)
+        aggregate = cumulative[rows, num_included] - cumulative[rows, num_dropped_included]
+
+        num_kept = num_scores - drop_count
+        return np.where(num_kept > 0, aggregate / np.maximum(num_kept, 1), aggregate)
+
+    def _letter_grades(self, percents):
+        """
+        Returns the letter grade of each of the given percents, or None,
+        and whether each percent is passing, per the course's grade
+        cutoffs.
+        """
+        grade_cutoffs = self.course.grade_cutoffs
+        descending_grades = sorted(grade_cutoffs, key=lambda grade: grade_cutoffs[grade], reverse=True)
+        cutoffs = np.array([grade_cutoffs[grade] for grade in descending_grades], dtype=float)
+
+        meets_cutoff = percents[:, np.newaxis] >= cutoffs[np.newaxis, :]
+        first_met = meets_cutoff.argmax(axis=1) if len(cutoffs) else np.zeros(len(percents), dtype=int)
+        letter_grades = [
+            descending_grades[first_met[index]] if met_any else None
+            for index, met_any in enumerate(meets_cutoff.any(axis=1).tolist())
+        ]
+
+        nonzero_cutoffs = cutoffs[cutoffs > 0]
+        if len(nonzero_cutoffs):
+            passed = percents >= nonzero_cutoffs.min()
+        else:
+            passed = np.zeros(len(percents), dtype=bool)
+        return letter_grades, passed
+
+    def _persisted_percents(self, user_ids, user_index, percents, letter_grades):
+        """
+        Returns, for each user, the persisted course percent when it
+        agrees with the given computed percent and letter grade, or
+        None when the user's grades are stale.
+        """
+        persisted_percents = [None] * len(user_ids)
+        grading_policy_hash = self.course_data.grading_policy_hash
+        persisted_grades = PersistentCourseGrade.objects.filter(
+            user_id__in=user_ids,
+            course_id=self.course_key,
+        ).values_list('user_id', 'percent_grade', 'letter_grade', 'grading_policy_hash')
+        for user_id, percent_grade, letter_grade, persisted_policy_hash in persisted_grades:
+            index = user_index[user_id]
+            if (
+                persisted_policy_hash == grading_policy_hash and
+                np.isclose(percent_grade, percents[index]) and
+                (letter_grade or None) == letter_grades[index]
+            ):
+                persisted_percents[index] = percent_grade
+        return persisted_percents
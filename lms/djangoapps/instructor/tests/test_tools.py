@@ -266,6 +266,16 @@ class TestSetDueDateExtension(ModuleStoreTestCase):
         tools.set_due_date_extension(self.course, self.week1, self.user, None)
         self.assertEqual(self.week1.due, self.due)
 
+    @mock.patch('courseware.toc_cache.invalidate_user_toc')
+    def test_due_date_extension_invalidates_toc(self, mock_invalidate_user_toc):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=UTC)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        mock_invalidate_user_toc.assert_called_with(self.course.id, self.user.id)
+
+        mock_invalidate_user_toc.reset_mock()
+        tools.set_due_date_extension(self.course, self.week1, self.user, None)
+        mock_invalidate_user_toc.assert_called_with(self.course.id, self.user.id)
+
 
 class TestDataDumps(ModuleStoreTestCase):
     """
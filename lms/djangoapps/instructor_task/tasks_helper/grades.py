@@ -24,6 +24,7 @@ from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCe
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.vectorized import VectorizedCourseGrades
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -42,6 +43,7 @@ from .utils import upload_csv_to_report_store
 WAFFLE_NAMESPACE = 'instructor_task'
 WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = 'optimize_get_learners_for_course'
+VECTORIZED_COURSE_GRADES = 'vectorized_course_grades'
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -108,13 +110,17 @@ class _CourseGradeReportContext(object):
     def cohorts_enabled(self):
         return is_course_cohorted(self.course_id)
 
+    @lazy
+    def grading_context(self):
+        return grading_context(self.course, self.course_structure)
+
     @lazy
     def graded_assignments(self):
         """
         Returns an OrderedDict that maps an assignment type to a dict of
         subsection-headers and average-header.
         """
-        grading_cxt = grading_context(self.course, self.course_structure)
+        grading_cxt = self.grading_context
         graded_assignments_map = OrderedDict()
         for assignment_type_name, subsection_infos in grading_cxt['all_graded_subsections_by_type'].iteritems():
             graded_subsections_map = OrderedDict()
@@ -143,6 +149,16 @@ class _CourseGradeReportContext(object):
             }
         return graded_assignments_map
 
+    @lazy
+    def vectorized_course_grades(self):
+        """
+        Returns the VectorizedCourseGrades for this course, or None if
+        course grades are to be computed per learner.
+        """
+        if WAFFLE_SWITCHES.is_enabled(VECTORIZED_COURSE_GRADES) and VectorizedCourseGrades.is_supported(self.course):
+            return VectorizedCourseGrades(self.course, self.course_structure, self.grading_context)
+        return None
+
     def update_status(self, message):
         """
         Updates the status on the celery task to the given message.
@@ -183,14 +199,20 @@ class _EnrollmentBulkContext(object):
 
 
 class _CourseGradeBulkContext(object):
-    def __init__(self, context, users):
+    def __init__(self, context, users, graded_users=None):
+        """
+        Prefetches the data of the given users for the report.  Grades
+        are only prefetched for graded_users, if given, as the others
+        are graded without the CourseGradeFactory.
+        """
+        graded_users = users if graded_users is None else graded_users
         self.certs = _CertificateBulkContext(context, users)
         self.teams = _TeamBulkContext(context, users)
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
-        PersistentCourseGrade.prefetch(context.course_id, users)
-        PersistentSubsectionGrade.prefetch(context.course_id, users)
+        PersistentCourseGrade.prefetch(context.course_id, graded_users)
+        PersistentSubsectionGrade.prefetch(context.course_id, graded_users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -368,6 +390,24 @@ class CourseGradeReport(object):
 
         return [course_grade.percent] + _flatten(grade_results)
 
+    def _vectorized_user_grades(self, vectorized_grade, context):
+        """
+        Returns a list of grade results for the given VectorizedCourseGrade
+        corresponding to the headers for this report, as _user_grades does
+        for a course grade.
+        """
+        grade_results = []
+        subsection_grades = iter(vectorized_grade.subsection_grades)
+        for assignment_type, assignment_info in context.graded_assignments.iteritems():
+            for _ in assignment_info['subsection_headers']:
+                percent_graded = next(subsection_grades)
+                grade_results.append(u'Not Attempted' if percent_graded is None else percent_graded)
+
+            if assignment_info['separate_subsection_avg_headers'] and assignment_info['grader']:
+                grade_results.append(vectorized_grade.assignment_averages[assignment_type])
+
+        return [vectorized_grade.percent] + grade_results
+
     def _user_subsection_grades(self, course_grade, subsection_headers):
         """
         Returns a list of grade results for the given course_grade corresponding
@@ -474,22 +514,37 @@ class CourseGradeReport(object):
         Returns a list of rows for the given users for this report.
         """
         with modulestore().bulk_operations(context.course_id):
-            bulk_context = _CourseGradeBulkContext(context, users)
+            users = list(users)
+            vectorized_grades, stale_users = self._vectorized_grades(context, users)
+            bulk_context = _CourseGradeBulkContext(context, users, stale_users)
+
+            grade_results = {
+                user.id: (course_grade, error)
+                for user, course_grade, error in CourseGradeFactory().iter(
+                    stale_users,
+                    course=context.course,
+                    collected_block_structure=context.course_structure,
+                    course_key=context.course_id,
+                    workers=settings.GRADES_PARALLEL_WORKERS,
+                )
+            }
 
             success_rows, error_rows = [], []
-            for user, course_grade, error in CourseGradeFactory().iter(
-                users,
-                course=context.course,
-                collected_block_structure=context.course_structure,
-                course_key=context.course_id,
-            ):
+            for user in users:
+                if user.id in vectorized_grades:
+                    course_grade = vectorized_grades[user.id]
+                    user_grades = self._vectorized_user_grades(course_grade, context)
+                else:
+                    course_grade, error = grade_results[user.id]
+                    user_grades = self._user_grades(course_grade, context) if course_grade else None
+
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
                     success_rows.append(
                         [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
+                        user_grades +
                         self._user_cohort_group_names(user, context) +
                         self._user_experiment_group_names(user, context) +
                         self._user_team_names(user, bulk_context.teams) +
@@ -499,6 +554,25 @@ class CourseGradeReport(object):
                     )
             return success_rows, error_rows
 
+    def _vectorized_grades(self, context, users):
+        """
+        Returns a tuple of a dict of the VectorizedCourseGrades of the
+        given users that could be computed with array operations, keyed
+        by user id, and the list of the remaining users.
+        """
+        if context.vectorized_course_grades is None:
+            return {}, users
+
+        vectorized_grades, stale_users = context.vectorized_course_grades.grade_users(users)
+        TASK_LOG.info(
+            u'%s, Task type: %s, Vectorized grades for %d learners, %d learners with stale grades',
+            context.task_info_string,
+            context.action_name,
+            len(vectorized_grades),
+            len(stale_users),
+        )
+        return vectorized_grades, stale_users
+
 
 class ProblemGradeReport(object):
     @classmethod
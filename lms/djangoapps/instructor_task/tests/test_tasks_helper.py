@@ -56,6 +56,7 @@ from xmodule.partitions.partitions import Group, UserPartition
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
 from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
 from lms.djangoapps.certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
@@ -68,6 +69,8 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
     NOT_ENROLLED_IN_COURSE,
+    VECTORIZED_COURSE_GRADES,
+    WAFFLE_SWITCHES,
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
@@ -1950,11 +1953,13 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             display_name='Empty',
         )
 
-    def test_grade_report(self):
+    @ddt.data(True, False)
+    def test_grade_report(self, vectorized):
         self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
 
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
-            result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+            with WAFFLE_SWITCHES.override(VECTORIZED_COURSE_GRADES, active=vectorized):
+                result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
             self.assertDictContainsSubset(
                 {'action_name': 'graded', 'attempted': 1, 'succeeded': 1, 'failed': 0},
                 result,
@@ -1975,6 +1980,36 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
                 ignore_other_columns=True,
             )
 
+    @ddt.data(True, False)
+    def test_vectorized_grade_report(self, stale):
+        self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
+        if stale:
+            PersistentCourseGrade.objects.filter(user_id=self.student.id).update(percent_grade=0.5)
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with WAFFLE_SWITCHES.override(VECTORIZED_COURSE_GRADES, active=True):
+                with patch(
+                    'lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeFactory.iter',
+                    side_effect=CourseGradeFactory().iter,
+                ) as mock_iter:
+                    CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+                    graded_users = list(mock_iter.call_args[0][0])
+
+        self.assertEqual(graded_users, [self.student] if stale else [])
+        self.assertEqual(mock_iter.call_args[1]['workers'], settings.GRADES_PARALLEL_WORKERS)
+        self.verify_rows_in_csv(
+            [
+                {
+                    u'Student ID': unicode(self.student.id),
+                    u'Grade': '0.5' if stale else '0.13',
+                    u'Homework 1: Subsection': '0.5',
+                    u'Homework 2: Unattempted': 'Not Attempted',
+                    u'Homework (Avg)': text_type(1.0 / 6.0),
+                },
+            ],
+            ignore_other_columns=True,
+        )
+
     @ddt.data(True, False)
     def test_fast_generation(self, create_non_zero_grade):
         if create_non_zero_grade:
@@ -862,6 +862,37 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 
 MODULESTORE_BRANCH = 'published-only'
 CONTENTSTORE = None
+
+# Process-local cache of small course assets served by the contentserver, in
+# front of the "course_assets" cache.  MAX_SIZE bounds the total bytes cached
+# in each process (0 disables the cache), MAX_ASSET_SIZE the size of each
+# cached asset, and TIMEOUT, in seconds, how long an asset may be served from
+# it after being changed in another process.
+CONTENTSERVER_PROCESS_CACHE = {
+    'MAX_SIZE': 0,
+    'MAX_ASSET_SIZE': 256 * 1024,
+    'TIMEOUT': 60,
+}
+
+# Process-local cache of the static urls resolved by static_replace, by course.
+# A TIMEOUT of 0 disables it.
+STATIC_REPLACE_URL_CACHE = {
+    'MAX_COURSES': 100,
+    'MAX_PATHS_PER_COURSE': 1000,
+    'TIMEOUT': 0,
+}
+
+# Process-local cache of CourseOverviews used by CourseOverview.get_from_ids.  MAX_SIZE
+# bounds the number of CourseOverviews cached in each process (0 disables the cache),
+# and TIMEOUT, in seconds, how long each may be served before being refetched.
+COURSE_OVERVIEW_PROCESS_CACHE = {
+    'MAX_SIZE': 0,
+    'TIMEOUT': 300,
+}
+
+# How many threads CourseOverview.get_from_ids uses to load missing CourseOverviews
+# from the modulestore.
+COURSE_OVERVIEW_LOAD_THREADS = 1
 DOC_STORE_CONFIG = {
     'host': 'localhost',
     'db': 'xmodule',
@@ -914,6 +945,15 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Number of warm sandbox workers to keep per process.  0 starts a new
+    # sandbox for every execution.
+    'pool_size': 0,
+    # How many executions a sandbox worker runs before it is replaced.
+    'pool_max_jobs_per_worker': 100,
+    # Number of execution results to cache in each process, in front of
+    # the shared cache.  0 disables the process cache.
+    'result_cache_size': 0,
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1236,6 +1276,10 @@ MIDDLEWARE_CLASSES = [
     'edx_django_utils.cache.middleware.RequestCacheMiddleware',
     'edx_django_utils.monitoring.middleware.MonitoringCustomMetricsMiddleware',
 
+    # Writes the StudentModule history buffered during the request.
+    # Must come after RequestCacheMiddleware and MonitoringCustomMetricsMiddleware.
+    'coursewarehistoryextended.middleware.HistoryWriterMiddleware',
+
     # Cookie monitoring
     'openedx.core.lib.request_utils.CookieMetricsMiddleware',
 
@@ -1927,6 +1971,16 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Backend storage options
     PRUNING_ACTIVE=False,
+
+    # Maximum total number of blocks of the deserialized block structures
+    # held in each process, when the block_structure.process_cache waffle
+    # switch is enabled.
+    PROCESS_CACHE_MAX_BLOCKS=50000,
+
+    # Time, in seconds, that a deserialized block structure is held in each
+    # process when storage backing is disabled, since its cache key does
+    # not then identify the version of the course.
+    PROCESS_CACHE_TIMEOUT=60,
 )
 
 ################################ Bulk Email ###################################
@@ -3047,6 +3101,13 @@ ECOMMERCE_SERVICE_WORKER_USERNAME = 'ecommerce_worker'
 
 COURSE_CATALOG_API_URL = None
 
+# Whether the programs dashboard and the learner dashboard find a learner's
+# programs in a per-process index of each site's cached programs, rebuilt when
+# the cache_programs management command recaches them.
+CATALOG_PROGRAM_INDEX = {
+    'ENABLED': False,
+}
+
 CREDENTIALS_INTERNAL_SERVICE_URL = None
 CREDENTIALS_PUBLIC_SERVICE_URL = None
 
@@ -3237,6 +3298,50 @@ APP_UPGRADE_CACHE_TIMEOUT = 3600
 # if you want to avoid an overlap in ids while searching for history across the two tables.
 STUDENTMODULEHISTORYEXTENDED_OFFSET = 10000
 
+# How coursewarehistoryextended.StudentModuleHistoryExtended entries are written.
+# MODE is 'sync' to write each entry as its StudentModule is saved, 'request' to
+# buffer the entries of a request and bulk insert them when it ends, or 'celery'
+# to hand the buffered entries to Celery tasks in batches of BATCH_SIZE entries.
+# A request's buffer is flushed early once it holds MAX_BUFFERED_ENTRIES entries.
+STUDENTMODULEHISTORYEXTENDED_WRITER = {
+    'MODE': 'sync',
+    'MAX_BUFFERED_ENTRIES': 1000,
+    'BATCH_SIZE': 100,
+}
+
+# How long, in seconds, the course navigation built for each user is cached.  This
+# also bounds how late newly released content appears in it.  0 disables the cache.
+COURSEWARE_TOC_CACHE = {
+    'TIMEOUT': 0,
+}
+
+# How long, in seconds, the snapshots of learner dashboards are cached.  This also
+# bounds how late statuses that depend on the time, e.g. missed verification
+# deadlines, appear on the dashboard.  0 disables the snapshots.
+STUDENT_DASHBOARD_SNAPSHOT = {
+    'TIMEOUT': 0,
+}
+
+# HTTP transport of the comments service client.  When ENABLED, requests share a
+# requests.Session keeping up to POOL_SIZE connections alive per host, and are
+# retried up to MAX_RETRIES times on connection errors.  comment_client's
+# perform_requests performs up to MAX_CONCURRENT_REQUESTS requests at once.
+COMMENTS_SERVICE_CONNECTION_POOL = {
+    'ENABLED': False,
+    'POOL_SIZE': 10,
+    'MAX_RETRIES': 1,
+    'RETRY_BACKOFF': 0.1,
+    'MAX_CONCURRENT_REQUESTS': 1,
+}
+
+# How long, in seconds, comment_client caches the responses to read-only requests
+# to the comments service.  Writes made through the client invalidate the cached
+# responses they affect, so this only bounds how late other changes appear.
+# 0 disables the cache.
+COMMENTS_SERVICE_RESPONSE_CACHE = {
+    'TIMEOUT': 0,
+}
+
 # Cutoff date for granting audit certificates
 
 AUDIT_CERT_CUTOFF_DATE = None
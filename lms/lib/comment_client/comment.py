@@ -1,5 +1,6 @@
 from lms.lib.comment_client import models, settings
 
+from .response_cache import course_scope, thread_scope
 from .thread import Thread, _url_for_flag_abuse_thread, _url_for_unflag_abuse_thread
 from .utils import CommentClientRequestError, perform_request
 
@@ -41,6 +42,14 @@ class Comment(models.Model):
         """Return the context of the thread which this comment belongs to."""
         return self.thread.context
 
+    def _response_cache_scopes(self):
+        scopes = []
+        if self.attributes.get('thread_id'):
+            scopes.append(thread_scope(self.attributes['thread_id']))
+        if self.attributes.get('course_id'):
+            scopes.append(course_scope(self.attributes['course_id']))
+        return scopes
+
     @classmethod
     def url_for_comments(cls, params={}):
         if params.get('parent_id'):
@@ -71,6 +80,7 @@ class Comment(models.Model):
             metric_action='comment.abuse.flagged'
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
 
     def unFlagAbuse(self, user, voteable, removeAll):
         if voteable.type == 'thread':
@@ -92,6 +102,7 @@ class Comment(models.Model):
             metric_action='comment.abuse.unflagged'
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
 
 
 def _url_for_thread_comments(thread_id):
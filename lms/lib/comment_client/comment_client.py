@@ -2,5 +2,6 @@
 # pylint: disable=unused-import
 from .comment import Comment
 from .commentable import Commentable
+from .models import retrieve_all
 from .thread import Thread
 from .user import User
@@ -1,6 +1,7 @@
 import logging
 
-from .utils import CommentClientRequestError, extract, perform_request
+from . import response_cache
+from .utils import CommentClientRequestError, extract, perform_request, perform_requests
 
 log = logging.getLogger(__name__)
 
@@ -66,15 +67,40 @@ class Model(object):
         return self
 
     def _retrieve(self, *args, **kwargs):
-        url = self.url(action='get', params=self.attributes)
-        response = perform_request(
-            'get',
-            url,
-            self.default_retrieve_params,
-            metric_tags=self._metric_tags,
-            metric_action='model.retrieve'
-        )
-        self._update_from_response(response)
+        request = self._retrieve_request(*args, **kwargs)
+        self._update_from_response(perform_request(**request))
+        self._after_retrieve(request)
+
+    def _retrieve_request(self, *args, **kwargs):
+        """
+        Returns the arguments of perform_request for retrieving this model.
+        """
+        return {
+            'method': 'get',
+            'url': self.url(action='get', params=self.attributes),
+            'data_or_params': self.default_retrieve_params,
+            'metric_tags': self._metric_tags,
+            'metric_action': 'model.retrieve',
+        }
+
+    def _after_retrieve(self, request):
+        """
+        Called once this model is retrieved with the given request.
+        """
+        pass
+
+    def _response_cache_scopes(self):
+        """
+        Returns the scopes of the response cache, e.g. the thread or the
+        course, whose cached responses changes to this model invalidate.
+        """
+        return []
+
+    def _invalidate_response_cache(self):
+        """
+        Invalidates the cached responses that changes to this model affect.
+        """
+        response_cache.invalidate_scopes(self._response_cache_scopes())
 
     @property
     def _metric_tags(self):
@@ -151,6 +177,7 @@ class Model(object):
             )
         self.retrieved = True
         self._update_from_response(response)
+        self._invalidate_response_cache()
         self.after_save(self)
 
     def delete(self):
@@ -158,6 +185,7 @@ class Model(object):
         response = perform_request('delete', url, metric_tags=self._metric_tags, metric_action='model.delete')
         self.retrieved = True
         self._update_from_response(response)
+        self._invalidate_response_cache()
 
     @classmethod
     def url_with_id(cls, params={}):
@@ -180,3 +208,26 @@ class Model(object):
                 raise CommentClientRequestError(u"Cannot perform action {0} without id".format(action))
         else:   # action must be in DEFAULT_ACTIONS_WITHOUT_ID now
             return cls.url_without_id()
+
+
+def retrieve_all(retrievals):
+    """
+    Retrieves several models at once, e.g. a thread and the user viewing
+    it, performing their requests concurrently, see perform_requests.
+
+    retrievals is a list of (model, retrieve kwargs) pairs.  If any of
+    the requests fails, the models are retrieved one after the other, in
+    order, so that each fails, or recovers, as its retrieve would.
+    """
+    pending = [(model, kwargs) for model, kwargs in retrievals if not model.retrieved]
+    requests = [model._retrieve_request(**kwargs) for model, kwargs in pending]  # pylint: disable=protected-access
+    try:
+        responses = perform_requests(requests)
+    except CommentClientRequestError:
+        for model, kwargs in pending:
+            model.retrieve(**kwargs)
+        return
+    for (model, _), request, response in zip(pending, requests, responses):
+        model._update_from_response(response)  # pylint: disable=protected-access
+        model._after_retrieve(request)  # pylint: disable=protected-access
+        model.retrieved = True
@@ -0,0 +1,134 @@
+"""
+Short-lived cache of the responses to read-only requests to the comments service.
+
+Cacheable GET requests name the scopes their responses depend on, e.g. a
+thread, a course or a user.  The cache key holds the URL, the parameters of
+the request, which include the requesting user and their group when the
+comments service filters on them, and the current generation of each scope.
+Writes made through the Thread, Comment and User models replace the
+generations of the scopes they change, so that the next reads miss.
+
+Changes not made through the models, e.g. by other services, don't replace
+any generation and only show once the cached responses expire, after
+settings.COMMENTS_SERVICE_RESPONSE_CACHE['TIMEOUT'] seconds.  Without a
+TIMEOUT, responses are not cached.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from six import text_type
+
+from openedx.core.lib.cache_utils import get_cache_generations
+
+RESPONSE_CACHE_KEY = u'comment_client.response.{digest}'
+SCOPE_GENERATION_CACHE_KEY = u'comment_client.generation.{scope}'
+
+_cache_stats = {}
+_cache_stats_lock = threading.Lock()
+
+
+def is_response_cache_enabled():
+    """
+    Returns whether responses to read-only requests are cached.
+    """
+    return bool(_response_cache_timeout())
+
+
+def course_scope(course_id):
+    """
+    Returns the scope of the threads of the given course.
+    """
+    return u'course:{}'.format(course_id)
+
+
+def thread_scope(thread_id):
+    """
+    Returns the scope of the given thread and its responses.
+    """
+    return u'thread:{}'.format(thread_id)
+
+
+def user_scope(user_id):
+    """
+    Returns the scope of the given user's own data, e.g. their votes,
+    subscriptions and read threads.
+    """
+    return u'user:{}'.format(user_id)
+
+
+def get_response_cache_key(url, params, language, scopes):
+    """
+    Returns the key of the response to a GET request with the given URL,
+    parameters and language, whose response depends on the given scopes.
+    """
+    generation_keys = [SCOPE_GENERATION_CACHE_KEY.format(scope=scope) for scope in sorted(set(scopes))]
+    key_parts = (
+        text_type(url),
+        sorted((text_type(name), text_type(value)) for name, value in params.items()),
+        language,
+        get_cache_generations(generation_keys),
+    )
+    return RESPONSE_CACHE_KEY.format(digest=hashlib.md5(repr(key_parts)).hexdigest())
+
+
+def get_cached_response(cache_key):
+    """
+    Returns the response cached with the given key, or None.
+    """
+    return cache.get(cache_key)
+
+
+def set_cached_response(cache_key, response):
+    """
+    Caches the given response with the given key.
+    """
+    cache.set(cache_key, response, _response_cache_timeout())
+
+
+def invalidate_scopes(scopes):
+    """
+    Invalidates the cached responses which depend on any of the given scopes.
+    """
+    if scopes and is_response_cache_enabled():
+        cache.delete_many([SCOPE_GENERATION_CACHE_KEY.format(scope=scope) for scope in set(scopes)])
+
+
+def record_lookup(endpoint, hit):
+    """
+    Counts a hit or a miss of the cache for a request to the given endpoint.
+    """
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        stats['hits' if hit else 'misses'] += 1
+
+
+def get_response_cache_stats():
+    """
+    Returns the number of hits and misses of the cache in this process, keyed
+    by endpoint, along with the hit rate of each endpoint.
+    """
+    with _cache_stats_lock:
+        return {
+            endpoint: dict(
+                stats,
+                hit_rate=float(stats['hits']) / (stats['hits'] + stats['misses']),
+            )
+            for endpoint, stats in _cache_stats.iteritems()
+        }
+
+
+def reset_response_cache_stats():
+    """
+    Clears the hit and miss counts of the cache.
+    """
+    with _cache_stats_lock:
+        _cache_stats.clear()
+
+
+def _response_cache_timeout():
+    """
+    Returns how long, in seconds, responses are cached.
+    """
+    return getattr(settings, 'COMMENTS_SERVICE_RESPONSE_CACHE', {}).get('TIMEOUT', 0)
@@ -6,6 +6,7 @@ import models
 from eventtracking import tracker
 
 import utils
+from .response_cache import course_scope, invalidate_scopes, thread_scope, user_scope
 
 log = logging.getLogger(__name__)
 
@@ -71,7 +72,8 @@ class Thread(models.Model):
             params,
             metric_tags=[u'course_id:{}'.format(query_params['course_id'])],
             metric_action='thread.search',
-            paged_results=True
+            paged_results=True,
+            cache_scopes=_search_cache_scopes(params),
         )
         if query_params.get('text'):
             search_query = query_params['text']
@@ -132,10 +134,10 @@ class Thread(models.Model):
         else:
             return super(Thread, cls).url(action, params)
 
-    # TODO: This is currently overriding Model._retrieve only to add parameters
-    # for the request. Model._retrieve should be modified to handle this such
-    # that subclasses don't need to override for this.
-    def _retrieve(self, *args, **kwargs):
+    # TODO: This is currently overriding Model._retrieve_request only to add
+    # parameters for the request. Model._retrieve_request should be modified to
+    # handle this such that subclasses don't need to override for this.
+    def _retrieve_request(self, *args, **kwargs):
         url = self.url(action='get', params=self.attributes)
         request_params = {
             'recursive': kwargs.get('recursive'),
@@ -147,14 +149,38 @@ class Thread(models.Model):
         }
         request_params = utils.strip_none(request_params)
 
-        response = utils.perform_request(
-            'get',
-            url,
-            request_params,
-            metric_action='model.retrieve',
-            metric_tags=self._metric_tags
-        )
-        self._update_from_response(response)
+        # Marking the thread as read changes it for the user, so such
+        # requests are never served from the response cache.
+        cache_scopes = None
+        if not request_params['mark_as_read']:
+            cache_scopes = [thread_scope(self.id)]
+            if 'user_id' in request_params:
+                cache_scopes.append(user_scope(request_params['user_id']))
+
+        return {
+            'method': 'get',
+            'url': url,
+            'data_or_params': request_params,
+            'metric_action': 'model.retrieve',
+            'metric_tags': self._metric_tags,
+            'cache_scopes': cache_scopes,
+        }
+
+    def _retrieve(self, *args, **kwargs):
+        request = self._retrieve_request(*args, **kwargs)
+        self._update_from_response(utils.perform_request(**request))
+        self._after_retrieve(request)
+
+    def _after_retrieve(self, request):
+        request_params = request['data_or_params']
+        if request_params['mark_as_read'] and 'user_id' in request_params:
+            invalidate_scopes([user_scope(request_params['user_id'])])
+
+    def _response_cache_scopes(self):
+        scopes = [thread_scope(self.id)]
+        if self.attributes.get('course_id'):
+            scopes.append(course_scope(self.attributes['course_id']))
+        return scopes
 
     def flagAbuse(self, user, voteable):
         if voteable.type == 'thread':
@@ -172,6 +198,7 @@ class Thread(models.Model):
             metric_tags=self._metric_tags
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
 
     def unFlagAbuse(self, user, voteable, removeAll):
         if voteable.type == 'thread':
@@ -193,6 +220,7 @@ class Thread(models.Model):
             metric_action='thread.abuse.unflagged'
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
 
     def pin(self, user, thread_id):
         url = _url_for_pin_thread(thread_id)
@@ -205,6 +233,7 @@ class Thread(models.Model):
             metric_action='thread.pin'
         )
         self._update_from_response(response)
+        self._invalidate_response_cache()
 
     def un_pin(self, user, thread_id):
         url = _url_for_un_pin_thread(thread_id)
@@ -217,6 +246,18 @@ class Thread(models.Model):
             metric_action='thread.unpin'
         )
         self._update_from_response(response)
+        self._invalidate_response_cache()
+
+
+def _search_cache_scopes(params):
+    """
+    Returns the scopes of the response cache that the results of a search
+    with the given params depend on.
+    """
+    scopes = [course_scope(params['course_id'])]
+    if params.get('user_id'):
+        scopes.append(user_scope(params['user_id']))
+    return scopes
 
 
 def _url_for_flag_abuse_thread(thread_id):
@@ -4,6 +4,7 @@ from six import text_type
 import settings
 import models
 import utils
+from .response_cache import course_scope, user_scope
 
 
 class User(models.Model):
@@ -43,6 +44,7 @@ class User(models.Model):
             metric_action='user.read',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        self._invalidate_response_cache()
 
     def follow(self, source):
         params = {'source_type': source.type, 'source_id': source.id}
@@ -53,6 +55,7 @@ class User(models.Model):
             metric_action='user.follow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        self._invalidate_response_cache()
 
     def unfollow(self, source):
         params = {'source_type': source.type, 'source_id': source.id}
@@ -63,6 +66,7 @@ class User(models.Model):
             metric_action='user.unfollow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        self._invalidate_response_cache()
 
     def vote(self, voteable, value):
         if voteable.type == 'thread':
@@ -80,6 +84,8 @@ class User(models.Model):
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
+        self._invalidate_response_cache()
 
     def unvote(self, voteable):
         if voteable.type == 'thread':
@@ -97,6 +103,8 @@ class User(models.Model):
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
         voteable._update_from_response(response)
+        voteable._invalidate_response_cache()
+        self._invalidate_response_cache()
 
     def active_threads(self, query_params={}):
         if not self.course_id:
@@ -111,6 +119,7 @@ class User(models.Model):
             metric_action='user.active_threads',
             metric_tags=self._metric_tags,
             paged_results=True,
+            cache_scopes=self._read_cache_scopes(),
         )
         return response.get('collection', []), response.get('page', 1), response.get('num_pages', 1)
 
@@ -126,7 +135,8 @@ class User(models.Model):
             params,
             metric_action='user.subscribed_threads',
             metric_tags=self._metric_tags,
-            paged_results=True
+            paged_results=True,
+            cache_scopes=self._read_cache_scopes()
         )
         return utils.CommentClientPaginatedResult(
             collection=response.get('collection', []),
@@ -135,38 +145,49 @@ class User(models.Model):
             thread_count=response.get('thread_count', 0)
         )
 
-    def _retrieve(self, *args, **kwargs):
-        url = self.url(action='get', params=self.attributes)
+    def _retrieve_request(self, *args, **kwargs):
         retrieve_params = self.default_retrieve_params.copy()
         retrieve_params.update(kwargs)
         if self.attributes.get('course_id'):
             retrieve_params['course_id'] = text_type(self.course_id)
         if self.attributes.get('group_id'):
             retrieve_params['group_id'] = self.group_id
+        return {
+            'method': 'get',
+            'url': self.url(action='get', params=self.attributes),
+            'data_or_params': retrieve_params,
+            'metric_action': 'model.retrieve',
+            'metric_tags': self._metric_tags,
+            'cache_scopes': self._read_cache_scopes(),
+        }
+
+    def _retrieve(self, *args, **kwargs):
         try:
-            response = utils.perform_request(
-                'get',
-                url,
-                retrieve_params,
-                metric_action='model.retrieve',
-                metric_tags=self._metric_tags,
-            )
+            response = utils.perform_request(**self._retrieve_request(*args, **kwargs))
         except utils.CommentClientRequestError as e:
             if e.status_code == 404:
                 # attempt to gracefully recover from a previous failure
                 # to sync this user to the comments service.
                 self.save()
-                response = utils.perform_request(
-                    'get',
-                    url,
-                    retrieve_params,
-                    metric_action='model.retrieve',
-                    metric_tags=self._metric_tags,
-                )
+                response = utils.perform_request(**self._retrieve_request(*args, **kwargs))
             else:
                 raise
         self._update_from_response(response)
 
+    def _response_cache_scopes(self):
+        return [user_scope(self.id)]
+
+    def _read_cache_scopes(self):
+        """
+        Returns the scopes of the response cache that the user's profile and
+        threads depend on, which include the course the user is read in, as
+        posts to the course change the user's counts.
+        """
+        scopes = self._response_cache_scopes()
+        if self.attributes.get('course_id'):
+            scopes.append(course_scope(self.attributes['course_id']))
+        return scopes
+
     def retire(self, retired_username):
         url = _url_for_retire(self.id)
         params = {'retired_username': retired_username}
@@ -179,6 +200,7 @@ class User(models.Model):
             metric_action='user.retire',
             metric_tags=self._metric_tags
         )
+        self._invalidate_response_cache()
 
     def replace_username(self, new_username):
         url = _url_for_username_replacement(self.id)
@@ -190,6 +212,7 @@ class User(models.Model):
             params,
             raw=True,
         )
+        self._invalidate_response_cache()
 
 
 def _url_for_vote_comment(comment_id):
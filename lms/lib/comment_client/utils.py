@@ -1,16 +1,32 @@
 """" Common utilities for comment client wrapper """
+import bisect
 import logging
+import threading
 from contextlib import contextmanager
 from time import time
 from uuid import uuid4
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 from django.utils.translation import get_language
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from . import response_cache
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# Upper bounds, in seconds, of the buckets of the request latency histograms.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_latency_histograms = {}
+_latency_histograms_lock = threading.Lock()
+
+_transport = None
+_transport_lock = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -30,14 +46,127 @@ def extract(dic, keys):
 
 
 def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+                    metric_action=None, metric_tags=None, paged_results=False, cache_scopes=None):
+    """
+    Performs a request to the comments service and returns its result.
+
+    GET requests given the cache_scopes their responses depend on are served
+    from the response cache when it is enabled; see response_cache.
+    """
+    config = _get_forums_config()
+    return _send_request(
+        config, get_language(), method, url, data_or_params, raw, metric_action, metric_tags, paged_results,
+        cache_scopes,
+    )
+
+
+def perform_requests(requests_kwargs):
+    """
+    Performs several independent requests to the comments service, e.g.
+    lookups of a thread, a user and a commentable, and returns their results
+    in order.
+
+    Each item of requests_kwargs is a dict of the arguments of
+    perform_request.  Up to settings.COMMENTS_SERVICE_CONNECTION_POOL
+    ['MAX_CONCURRENT_REQUESTS'] requests are performed at once, in threads.
+    If any requests fail, the error of the first of them is raised once all
+    the requests are done.
+    """
+    config = _get_forums_config()
+    language = get_language()
+
+    def _send(kwargs):
+        """
+        Performs the request with the given arguments of perform_request.
+        """
+        return _send_request(
+            config,
+            language,
+            kwargs['method'],
+            kwargs['url'],
+            kwargs.get('data_or_params'),
+            kwargs.get('raw', False),
+            kwargs.get('metric_action'),
+            kwargs.get('metric_tags'),
+            kwargs.get('paged_results', False),
+            kwargs.get('cache_scopes'),
+        )
+
+    executor = _get_transport()[1] if len(requests_kwargs) > 1 else None
+    if executor is None:
+        return [_send(kwargs) for kwargs in requests_kwargs]
+
+    futures = [executor.submit(_send, kwargs) for kwargs in requests_kwargs]
+    # Wait for all the requests, so none is left running once this returns.
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
+
+
+def get_latency_histograms():
+    """
+    Returns the latency histograms of the requests to the comments service
+    made by this process, keyed by metric action, or by method for requests
+    without one.  Each histogram is a list of the number of requests whose
+    latency fell in each of the LATENCY_BUCKETS.
+    """
+    with _latency_histograms_lock:
+        return {endpoint: list(counts) for endpoint, counts in _latency_histograms.iteritems()}
+
+
+def reset_latency_histograms():
+    """
+    Clears the latency histograms of the requests to the comments service.
+    """
+    with _latency_histograms_lock:
+        _latency_histograms.clear()
+
+
+def _get_forums_config():
+    """
+    Returns the current ForumsConfig, raising CommentClientMaintenanceError
+    if the comments service is disabled.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
     config = ForumsConfig.current()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
+    return config
+
+
+def _send_request(config, language, method, url, data_or_params, raw,
+                  metric_action, metric_tags, paged_results, cache_scopes=None):
+    """
+    Implements perform_request, with the ForumsConfig and language read by
+    the caller, so it can run outside of the request's thread.
+    """
+    if method != 'get' or cache_scopes is None or not response_cache.is_response_cache_enabled():
+        return _send_uncached_request(
+            config, language, method, url, data_or_params, raw, metric_action, metric_tags, paged_results
+        )
 
+    cache_key = response_cache.get_response_cache_key(
+        url, dict(data_or_params or {}, raw=raw), language, cache_scopes
+    )
+    result = response_cache.get_cached_response(cache_key)
+    response_cache.record_lookup(metric_action or method, hit=result is not None)
+    if result is None:
+        result = _send_uncached_request(
+            config, language, method, url, data_or_params, raw, metric_action, metric_tags, paged_results
+        )
+        response_cache.set_cached_response(cache_key, result)
+    return result
+
+
+def _send_uncached_request(config, language, method, url, data_or_params, raw,
+                           metric_action, metric_tags, paged_results):  # pylint: disable=unused-argument
+    """
+    Sends a request to the comments service, bypassing the response cache.
+    """
     if metric_tags is None:
         metric_tags = []
 
@@ -49,7 +178,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data_or_params = {}
     headers = {
         'X-Edx-Api-Key': config.api_key,
-        'Accept-Language': get_language(),
+        'Accept-Language': language,
     }
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
@@ -61,14 +190,21 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
-        method,
-        url,
-        data=data,
-        params=params,
-        headers=headers,
-        timeout=config.connection_timeout
-    )
+
+    session = _get_transport()[0]
+    send = session.request if session is not None else requests.request
+    start = time()
+    try:
+        response = send(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=config.connection_timeout
+        )
+    finally:
+        _record_latency(metric_action or method, time() - start)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -99,6 +235,66 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def _record_latency(endpoint, seconds):
+    """
+    Adds a request to the given endpoint that took the given number of
+    seconds to the latency histograms.
+    """
+    bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+    with _latency_histograms_lock:
+        counts = _latency_histograms.setdefault(endpoint, [0] * len(LATENCY_BUCKETS))
+        counts[bucket] += 1
+
+
+def _get_transport():
+    """
+    Returns a tuple of the pooled requests.Session and the executor of
+    concurrent requests configured by settings.COMMENTS_SERVICE_CONNECTION_POOL,
+    either of which is None when disabled.
+
+    The session keeps up to POOL_SIZE connections to each host alive, and
+    retries requests up to MAX_RETRIES times on connection errors.
+    """
+    global _transport  # pylint: disable=global-statement
+    pool_settings = getattr(settings, 'COMMENTS_SERVICE_CONNECTION_POOL', {})
+    with _transport_lock:
+        if _transport is None or _transport[0] != pool_settings:
+            session = None
+            if pool_settings.get('ENABLED', False):
+                adapter = HTTPAdapter(
+                    pool_connections=pool_settings.get('POOL_SIZE', 10),
+                    pool_maxsize=pool_settings.get('POOL_SIZE', 10),
+                    max_retries=Retry(
+                        total=pool_settings.get('MAX_RETRIES', 0),
+                        backoff_factor=pool_settings.get('RETRY_BACKOFF', 0),
+                        raise_on_status=False,
+                    ),
+                )
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+
+            executor = None
+            max_concurrent_requests = pool_settings.get('MAX_CONCURRENT_REQUESTS', 1)
+            if max_concurrent_requests > 1:
+                executor = ThreadPoolExecutor(max_workers=max_concurrent_requests)
+
+            if _transport is not None:
+                _close_transport(*_transport[1:])
+            _transport = (dict(pool_settings), session, executor)
+        return _transport[1:]
+
+
+def _close_transport(session, executor):
+    """
+    Closes the given session and executor of a replaced transport.
+    """
+    if session is not None:
+        session.close()
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
 class CommentClientError(Exception):
     pass
 
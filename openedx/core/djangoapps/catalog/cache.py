@@ -12,3 +12,6 @@ SITE_PATHWAY_IDS_CACHE_KEY_TPL = 'pathway-ids-{domain}'
 
 # Template used to create cache keys for individual courses to program uuids.
 COURSE_PROGRAMS_CACHE_KEY_TPL = 'course-programs-{course_run_id}'
+
+# Cache key used to locate the version of the programs cached for a site, replaced whenever they are recached.
+SITE_PROGRAMS_VERSION_CACHE_KEY_TPL = 'program-version-{domain}'
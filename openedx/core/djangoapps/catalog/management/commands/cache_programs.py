@@ -15,6 +15,7 @@ from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL,
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.catalog.utils import create_catalog_api_client
@@ -51,7 +52,8 @@ class Command(BaseCommand):
         programs = {}
         pathways = {}
         courses = {}
-        for site in Site.objects.all():
+        sites = Site.objects.all()
+        for site in sites:
             site_config = getattr(site, 'configuration', None)
             if site_config is None or not site_config.get_value('COURSE_CATALOG_API_URL'):
                 logger.info(u'Skipping site {domain}. No configuration.'.format(domain=site.domain))
@@ -107,6 +109,10 @@ class Command(BaseCommand):
             successful_courses=successful_courses))
         cache.set_many(courses, None)
 
+        # Replace the versions of the sites' programs last, so that processes
+        # reindex them only once all of them are recached.
+        cache.delete_many([SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=site.domain) for site in sites])
+
         if failure:
             # This will fail a Jenkins job running this command, letting site
             # operators know that there was a problem.
@@ -4,10 +4,13 @@ from __future__ import absolute_import
 import copy
 import datetime
 import logging
+import threading
 import uuid
+from collections import OrderedDict, namedtuple
 
 import pycountry
 import six
+from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from edx_rest_api_client.client import EdxRestApiClient
@@ -21,7 +24,8 @@ from openedx.core.djangoapps.catalog.cache import (
     PATHWAY_CACHE_KEY_TPL,
     PROGRAM_CACHE_KEY_TPL,
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.oauth_dispatch.jwt import create_jwt_for_user
@@ -30,6 +34,13 @@ from student.models import CourseEnrollment
 
 logger = logging.getLogger(__name__)
 
+# The programs of a site, keyed by UUID in the order they were cached, along with the UUIDs of the programs
+# containing each course run and each course, sorted by program title.
+ProgramIndex = namedtuple('ProgramIndex', ['version', 'programs', 'course_run_programs', 'course_programs'])
+
+_program_indexes = {}
+_program_indexes_lock = threading.Lock()
+
 
 def create_catalog_api_client(user, site=None):
     """Returns an API client which can be used to make Catalog API requests."""
@@ -145,6 +156,74 @@ def get_programs(site=None, uuid=None, course=None):  # pylint: disable=redefine
     return programs
 
 
+def is_program_index_enabled():
+    """
+    Returns whether programs are read through get_program_index, per
+    settings.CATALOG_PROGRAM_INDEX.
+    """
+    return getattr(settings, 'CATALOG_PROGRAM_INDEX', {}).get('ENABLED', False)
+
+
+def get_program_index(site):
+    """Returns the ProgramIndex of the programs cached for the given site.
+
+    The index is built from a single get_many of the site's programs and kept
+    in this process until the cache_programs management command recaches the
+    programs, which replaces the version of the site's programs.  An index
+    missing any of the site's programs, e.g. because the get_many failed to
+    bring back all of them, is only used for this call.  The index is shared,
+    so the programs in it must not be modified.
+
+    Arguments:
+        site (Site): django.contrib.sites.models object
+
+    Returns:
+        ProgramIndex
+    """
+    version_key = SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=site.domain)
+    version = cache.get(version_key)
+    if version is None:
+        # Programs cached before versions were, or evicted versions, start a new version.
+        cache.add(version_key, uuid.uuid4().hex, None)
+        version = cache.get(version_key)
+
+    with _program_indexes_lock:
+        program_index = _program_indexes.get(site.domain)
+    if version is not None and program_index is not None and program_index.version == version:
+        return program_index
+
+    uuids = cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain))
+    program_index = _build_program_index(version, get_programs(site))
+    if uuids is not None and set(uuids) == set(program_index.programs):
+        with _program_indexes_lock:
+            _program_indexes[site.domain] = program_index
+    return program_index
+
+
+def _build_program_index(version, programs):
+    """
+    Returns a ProgramIndex of the given version of the given programs.
+    """
+    course_run_programs = {}
+    course_programs = {}
+    for program in sorted(programs, key=lambda p: p['title']):
+        for course in program['courses']:
+            program_uuids = course_programs.setdefault(course['uuid'], [])
+            if program['uuid'] not in program_uuids:
+                program_uuids.append(program['uuid'])
+            for course_run in course['course_runs']:
+                program_uuids = course_run_programs.setdefault(course_run['key'], [])
+                if program['uuid'] not in program_uuids:
+                    program_uuids.append(program['uuid'])
+
+    return ProgramIndex(
+        version=version,
+        programs=OrderedDict((program['uuid'], program) for program in programs),
+        course_run_programs=course_run_programs,
+        course_programs=course_programs,
+    )
+
+
 def get_program_types(name=None):
     """Retrieve program types from the catalog service.
 
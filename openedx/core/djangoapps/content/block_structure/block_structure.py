@@ -39,6 +39,16 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a new instance of _BlockRelations with copies of this
+        instance's lists of parents and children.
+        """
+        block_relations = _BlockRelations()
+        block_relations.parents = list(self.parents)
+        block_relations.children = list(self.children)
+        return block_relations
+
 
 class BlockStructure(object):
     """
@@ -427,6 +437,32 @@ class BlockStructureBlockData(BlockStructure):
             deepcopy(self._block_data_map),
         )
 
+    def shallow_copy(self):
+        """
+        Returns a new instance of BlockStructureBlockData with its own
+        copies of this instance's relations, block data and transformer
+        data containers, whose collected values are copied from this
+        instance only when they are first read.
+
+        This is considerably cheaper than copy, since most values are
+        never read, and immutable values are never copied, while
+        changing the copy, even in place, never changes this instance.
+        """
+        from .factory import BlockStructureFactory
+        block_data_map = {}
+        for usage_key, block_data in self._block_data_map.iteritems():
+            block_data_copy = BlockData(usage_key)
+            block_data_copy.fields = _CopyOnReadFields(block_data.fields)
+            block_data_copy.transformer_data = _shallow_copy_transformer_data(block_data.transformer_data)
+            block_data_map[usage_key] = block_data_copy
+
+        return BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            {usage_key: relations.copy() for usage_key, relations in self._block_relations.iteritems()},
+            _shallow_copy_transformer_data(self.transformer_data),
+            block_data_map,
+        )
+
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
@@ -764,6 +800,128 @@ class BlockStructureBlockData(BlockStructure):
             return block_data
 
 
+def _shallow_copy_transformer_data(transformer_data_map):
+    """
+    Returns a new TransformerDataMap with copies of the given map's
+    TransformerData containers, copying their values on first read.
+    """
+    transformer_data_map_copy = TransformerDataMap()
+    for transformer_name, transformer_data in transformer_data_map.iteritems():
+        transformer_data_copy = TransformerData()
+        transformer_data_copy.fields = _CopyOnReadFields(transformer_data.fields)
+        transformer_data_map_copy[transformer_name] = transformer_data_copy
+    return transformer_data_map_copy
+
+
+# The types of collected values that can be changed in place, and so are
+# copied by _CopyOnReadFields.  All other collected values, e.g. strings,
+# numbers, dates and usage keys, are immutable.
+_MUTABLE_TYPES = (dict, list, set, bytearray)
+
+
+def _copy_if_mutable(value):
+    """
+    Returns a deep copy of the given value if it can be changed in
+    place, or the value itself.
+    """
+    return deepcopy(value) if isinstance(value, _MUTABLE_TYPES) else value
+
+
+def _copying_all_fields(method_name):
+    """
+    Returns a method of _CopyOnReadFields that copies all remaining
+    fields before calling the dict method of the given name.
+    """
+    dict_method = getattr(dict, method_name)
+
+    def method(self, *args, **kwargs):
+        return dict_method(self._copy_all(), *args, **kwargs)  # pylint: disable=protected-access
+
+    method.__name__ = method_name
+    return method
+
+
+class _CopyOnReadFields(dict):
+    """
+    The fields dict of a BlockData or TransformerData of a shallow copy
+    of a block structure.
+
+    A value is read from the fields of the copied structure and stored
+    in the dict the first time it is looked up, deep-copied if it can be
+    changed in place.  Operations that need to see every field and
+    destructive operations first copy all remaining fields, after which
+    the object behaves as a plain dict.
+    """
+    __slots__ = ('_shared',)
+
+    def __init__(self, shared):
+        super(_CopyOnReadFields, self).__init__()
+        self._shared = shared
+
+    def __missing__(self, field_name):
+        if self._shared is None:
+            raise KeyError(field_name)
+        value = _copy_if_mutable(self._shared[field_name])
+        dict.__setitem__(self, field_name, value)
+        return value
+
+    def __contains__(self, field_name):
+        if dict.__contains__(self, field_name):
+            return True
+        return self._shared is not None and field_name in self._shared
+
+    def __eq__(self, other):
+        return dict(self._copy_all()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return dict, (dict(self._copy_all()),)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self._copy_all()), memo)
+
+    def get(self, field_name, default=None):
+        try:
+            return self[field_name]
+        except KeyError:
+            return default
+
+    def copy(self):
+        return dict(self._copy_all())
+
+    def _copy_all(self):
+        """
+        Copies the values of all the remaining fields, after which the
+        copied fields are no longer consulted.  Returns self.
+        """
+        if self._shared is not None:
+            for field_name in self._shared:
+                if not dict.__contains__(self, field_name):
+                    dict.__setitem__(self, field_name, _copy_if_mutable(self._shared[field_name]))
+            self._shared = None
+        return self
+
+    __hash__ = None
+    __iter__ = _copying_all_fields('__iter__')
+    __len__ = _copying_all_fields('__len__')
+    __repr__ = _copying_all_fields('__repr__')
+    __delitem__ = _copying_all_fields('__delitem__')
+    keys = _copying_all_fields('keys')
+    values = _copying_all_fields('values')
+    items = _copying_all_fields('items')
+    pop = _copying_all_fields('pop')
+    popitem = _copying_all_fields('popitem')
+    setdefault = _copying_all_fields('setdefault')
+    clear = _copying_all_fields('clear')
+    update = _copying_all_fields('update')
+    iterkeys = _copying_all_fields('iterkeys')
+    itervalues = _copying_all_fields('itervalues')
+    iteritems = _copying_all_fields('iteritems')
+    has_key = _copying_all_fields('has_key')
+
+
 class BlockStructureModulestoreData(BlockStructureBlockData):
     """
     Subclass of BlockStructureBlockData that is responsible for managing
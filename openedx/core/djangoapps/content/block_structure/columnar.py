@@ -0,0 +1,575 @@
+"""
+Module for the columnar serialization format of BlockStructure objects.
+
+Unlike the zpickle format, which pickles the full graph of
+_BlockRelations, BlockData and TransformerData objects, this format
+stores:
+
+    * the usage keys of all blocks once, so that every other section
+      can refer to a block by its integer index,
+    * the parents and children relations as adjacency arrays of block
+      indexes, and
+    * each collected xBlock field and each transformer's block field as
+      its own typed column.
+
+Each column is compressed separately and is only decoded when a block's
+value for that field is first accessed, so callers that only need a
+handful of fields from a large course do not pay for decoding the rest.
+
+Serialized layout:
+
+    preamble: MAGIC, FORMAT_VERSION, header length
+    header:   zlib-compressed pickle of the section table and metadata
+    sections: concatenated, individually zlib-compressed payloads
+"""
+from __future__ import absolute_import
+
+import struct
+import sys
+import zlib
+from array import array
+from collections import defaultdict
+from copy import deepcopy
+
+import six
+from six.moves import cPickle as pickle
+from six.moves import range
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+
+
+# Leading bytes that identify serialized data in the columnar format.
+# A zlib stream never starts with a null byte, so these can never be
+# confused with data serialized with zpickle.
+MAGIC = b'\x00BSC'
+
+# The version of the columnar format.  Incrementally update this value
+# whenever the layout changes so older data is rejected, rather than
+# misread.
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct('>4sHI')
+
+# Type codes of the typed columns.
+_BOOL_COLUMN = b'b'
+_INT_COLUMN = b'i'
+_TEXT_COLUMN = b'u'
+_PICKLE_COLUMN = b'p'
+
+# Bounds of the values that can be stored in an int column.
+_INT_MIN = -2 ** 31
+_INT_MAX = 2 ** 31 - 1
+
+# Section names.
+_KEYS_SECTION = u'keys'
+_CHILDREN_SECTION = u'children'
+_PARENTS_SECTION = u'parents'
+_BLOCK_DATA_SECTION = u'block_data'
+_TRANSFORMER_DATA_SECTION = u'transformer_data'
+_XBLOCK_FIELD_SECTION = u'x:{field_name}'
+_TRANSFORMER_BLOCKS_SECTION = u't:{transformer_name}'
+_TRANSFORMER_FIELD_SECTION = u't:{transformer_name}:{field_name}'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the data for the given block_structure into the
+    columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Blocks with relations come first, so the relations arrays only
+    # need to cover the first num_related_blocks indexes.
+    block_keys = list(block_relations)
+    block_keys.extend(key for key in block_data_map if key not in block_relations)
+    block_index = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    sections = _SectionWriter()
+    sections.add(_KEYS_SECTION, _pickle(block_keys))
+    sections.add(_CHILDREN_SECTION, _encode_adjacency(
+        (block_relations[block_key].children for block_key in block_keys[:len(block_relations)]),
+        block_index,
+    ))
+    sections.add(_PARENTS_SECTION, _encode_adjacency(
+        (block_relations[block_key].parents for block_key in block_keys[:len(block_relations)]),
+        block_index,
+    ))
+    sections.add(_TRANSFORMER_DATA_SECTION, _pickle({
+        transformer_name: dict(transformer_data.fields)
+        for transformer_name, transformer_data in six.iteritems(block_structure.transformer_data)
+    }))
+
+    blocks_with_data = array('i')
+    xblock_columns = defaultdict(_ColumnBuilder)
+    transformer_blocks = defaultdict(lambda: array('i'))
+    transformer_columns = defaultdict(lambda: defaultdict(_ColumnBuilder))
+
+    for block_key, block_data in six.iteritems(block_data_map):
+        index = block_index[block_key]
+        blocks_with_data.append(index)
+        for field_name, value in six.iteritems(block_data.fields):
+            xblock_columns[field_name].append(index, value)
+        for transformer_name, transformer_data in six.iteritems(block_data.transformer_data):
+            transformer_blocks[transformer_name].append(index)
+            for field_name, value in six.iteritems(transformer_data.fields):
+                transformer_columns[transformer_name][field_name].append(index, value)
+
+    sections.add(_BLOCK_DATA_SECTION, _array_to_bytes(blocks_with_data))
+    for field_name, column in six.iteritems(xblock_columns):
+        sections.add(_XBLOCK_FIELD_SECTION.format(field_name=field_name), column.encode())
+    for transformer_name, indexes in six.iteritems(transformer_blocks):
+        sections.add(
+            _TRANSFORMER_BLOCKS_SECTION.format(transformer_name=transformer_name),
+            _array_to_bytes(indexes),
+        )
+        for field_name, column in six.iteritems(transformer_columns[transformer_name]):
+            sections.add(
+                _TRANSFORMER_FIELD_SECTION.format(transformer_name=transformer_name, field_name=field_name),
+                column.encode(),
+            )
+
+    header = dict(
+        byteorder=sys.byteorder,
+        num_blocks=len(block_keys),
+        num_related_blocks=len(block_relations),
+        xblock_fields=list(xblock_columns),
+        transformer_fields={
+            transformer_name: list(transformer_columns[transformer_name])
+            for transformer_name in transformer_blocks
+        },
+    )
+    return sections.write(header)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given columnar data and returns the parsed
+    block_structure.
+
+    Block relations and the set of blocks and transformers with data
+    are decoded immediately.  The values of the xBlock and transformer
+    block fields are decoded lazily, one column at a time.
+
+    Arguments:
+        serialized_data (bytes) - Data previously returned by serialize.
+
+        root_block_usage_key (UsageKey) - The usage key of the root of
+            the block structure.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure.
+
+    Raises:
+        ValueError if the data is not in a supported columnar format.
+    """
+    from .factory import BlockStructureFactory
+
+    reader = _SectionReader(serialized_data)
+    header = reader.header
+
+    block_keys = pickle.loads(reader.read(_KEYS_SECTION))
+    block_relations = _decode_relations(
+        block_keys,
+        header['num_related_blocks'],
+        reader.read_array(_CHILDREN_SECTION),
+        reader.read_array(_PARENTS_SECTION),
+    )
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in six.iteritems(pickle.loads(reader.read(_TRANSFORMER_DATA_SECTION))):
+        transformer_data[transformer_name] = _field_data_with(TransformerData(), fields)
+
+    xblock_columns = _LazyColumns(
+        reader,
+        header['xblock_fields'],
+        lambda field_name: _XBLOCK_FIELD_SECTION.format(field_name=field_name),
+    )
+    block_data_map = {}
+    for index in reader.read_array(_BLOCK_DATA_SECTION):
+        block_key = block_keys[index]
+        block_data_map[block_key] = _field_data_with(BlockData(block_key), _LazyFields(xblock_columns, index))
+
+    for transformer_name, field_names in six.iteritems(header['transformer_fields']):
+        transformer_columns = _LazyColumns(
+            reader,
+            field_names,
+            lambda field_name, transformer_name=transformer_name: _TRANSFORMER_FIELD_SECTION.format(
+                transformer_name=transformer_name, field_name=field_name,
+            ),
+        )
+        for index in reader.read_array(_TRANSFORMER_BLOCKS_SECTION.format(transformer_name=transformer_name)):
+            block_data_map[block_keys[index]].transformer_data[transformer_name] = _field_data_with(
+                TransformerData(), _LazyFields(transformer_columns, index),
+            )
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        block_data_map,
+    )
+
+
+def _loading_all_fields(method_name):
+    """
+    Returns the given dict method, wrapped so that it first loads all
+    the fields of a _LazyFields object.
+    """
+    dict_method = getattr(dict, method_name)
+
+    def method(self, *args, **kwargs):
+        return dict_method(self._load_all(), *args, **kwargs)  # pylint: disable=protected-access
+
+    method.__name__ = method_name
+    return method
+
+
+class _LazyFields(dict):
+    """
+    The fields dict of a deserialized BlockData or TransformerData.
+
+    A value is decoded from its column and stored in the dict the first
+    time it is looked up.  Operations that need to see every field
+    (iteration, length, equality, pickling, copying) and destructive
+    operations first load all remaining fields of the block, after which
+    the object behaves as a plain dict.
+    """
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        super(_LazyFields, self).__init__()
+        self._columns = columns
+        self._index = index
+
+    def __missing__(self, field_name):
+        if self._columns is None:
+            raise KeyError(field_name)
+        value = self._columns.get_value(field_name, self._index)
+        dict.__setitem__(self, field_name, value)
+        return value
+
+    def __contains__(self, field_name):
+        if dict.__contains__(self, field_name):
+            return True
+        return self._columns is not None and self._columns.has_value(field_name, self._index)
+
+    def __eq__(self, other):
+        if isinstance(other, _LazyFields):
+            other._load_all()  # pylint: disable=protected-access
+        return dict.__eq__(self._load_all(), other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return dict, (dict(self._load_all()),)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self._load_all()), memo)
+
+    def get(self, field_name, default=None):
+        try:
+            return self[field_name]
+        except KeyError:
+            return default
+
+    def copy(self):
+        """
+        Returns a shallow copy that shares the columns of this object, so
+        the copy also decodes its values lazily.
+        """
+        if self._columns is None:
+            return dict(self)
+        fields_copy = _LazyFields(self._columns, self._index)
+        dict.update(fields_copy, dict.items(self))
+        return fields_copy
+
+    def _load_all(self):
+        """
+        Loads the values of all the fields of this block, after which
+        the columns are no longer consulted.  Returns self.
+        """
+        if self._columns is not None:
+            for field_name in self._columns.field_names:
+                if not dict.__contains__(self, field_name) and self._columns.has_value(field_name, self._index):
+                    dict.__setitem__(self, field_name, self._columns.get_value(field_name, self._index))
+            self._columns = None
+        return self
+
+    __hash__ = None
+    __iter__ = _loading_all_fields('__iter__')
+    __len__ = _loading_all_fields('__len__')
+    __repr__ = _loading_all_fields('__repr__')
+    __delitem__ = _loading_all_fields('__delitem__')
+    keys = _loading_all_fields('keys')
+    values = _loading_all_fields('values')
+    items = _loading_all_fields('items')
+    pop = _loading_all_fields('pop')
+    popitem = _loading_all_fields('popitem')
+    setdefault = _loading_all_fields('setdefault')
+    clear = _loading_all_fields('clear')
+    update = _loading_all_fields('update')
+    if six.PY2:
+        iterkeys = _loading_all_fields('iterkeys')
+        itervalues = _loading_all_fields('itervalues')
+        iteritems = _loading_all_fields('iteritems')
+        has_key = _loading_all_fields('has_key')
+
+
+class _LazyColumns(object):
+    """
+    The columns of a single namespace of fields (xBlock fields, or a
+    single transformer's block fields), each decoded on first access.
+    """
+    def __init__(self, reader, field_names, section_name):
+        self._reader = reader
+        self._section_name = section_name
+        self.field_names = field_names
+
+        # Map of field name to the decoded column.
+        # dict {string: dict {block index: value}}
+        self._decoded = {}
+
+    def has_value(self, field_name, index):
+        """
+        Returns whether the block with the given index has a value for
+        the given field.
+        """
+        return index in self._column(field_name)
+
+    def get_value(self, field_name, index):
+        """
+        Returns the value of the given field for the block with the
+        given index.
+
+        Raises KeyError if the block has no value for the field.
+        """
+        return self._column(field_name)[index]
+
+    def _column(self, field_name):
+        """
+        Returns the decoded column for the given field name.
+        """
+        try:
+            return self._decoded[field_name]
+        except KeyError:
+            if field_name in self.field_names:
+                column = _decode_column(self._reader.read(self._section_name(field_name)), self._reader.swap_bytes)
+            else:
+                column = {}
+            self._decoded[field_name] = column
+            return column
+
+
+class _ColumnBuilder(object):
+    """
+    Accumulates the values of a single field across blocks and encodes
+    them as a typed column.
+    """
+    def __init__(self):
+        self.indexes = array('i')
+        self.values = []
+
+    def append(self, index, value):
+        """
+        Adds the value of the field for the block with the given index.
+        """
+        self.indexes.append(index)
+        self.values.append(value)
+
+    def encode(self):
+        """
+        Returns the encoded column.  The type of the column is chosen
+        from the types of its values, falling back to pickle for values
+        that have no compact representation.
+        """
+        values = self.values
+        if all(type(value) is bool for value in values):  # pylint: disable=unidiomatic-typecheck
+            type_code, encoded_values = _BOOL_COLUMN, _array_to_bytes(array('b', values))
+        elif all(type(value) is int and _INT_MIN <= value <= _INT_MAX for value in values):  # pylint: disable=unidiomatic-typecheck
+            type_code, encoded_values = _INT_COLUMN, _array_to_bytes(array('i', values))
+        elif all(type(value) is six.text_type for value in values):  # pylint: disable=unidiomatic-typecheck
+            encoded = [value.encode('utf-8') for value in values]
+            lengths = array('i', [len(value) for value in encoded])
+            type_code, encoded_values = _TEXT_COLUMN, _array_to_bytes(lengths) + b''.join(encoded)
+        else:
+            type_code, encoded_values = _PICKLE_COLUMN, _pickle(values)
+
+        return type_code + struct.pack('>I', len(self.indexes)) + _array_to_bytes(self.indexes) + encoded_values
+
+
+def _decode_column(data, swap_bytes):
+    """
+    Decodes the given column, returning a dict of block index to value.
+    """
+    type_code = data[:1]
+    count, = struct.unpack('>I', data[1:5])
+    offset = 5
+    indexes, offset = _read_array('i', data, offset, count, swap_bytes)
+
+    if type_code == _BOOL_COLUMN:
+        values, _ = _read_array('b', data, offset, count, swap_bytes)
+        values = [bool(value) for value in values]
+    elif type_code == _INT_COLUMN:
+        values, _ = _read_array('i', data, offset, count, swap_bytes)
+    elif type_code == _TEXT_COLUMN:
+        lengths, offset = _read_array('i', data, offset, count, swap_bytes)
+        values = []
+        for length in lengths:
+            values.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+    elif type_code == _PICKLE_COLUMN:
+        values = pickle.loads(data[offset:])
+    else:
+        raise ValueError(u'Unknown column type {!r}.'.format(type_code))
+
+    return dict(six.moves.zip(indexes, values))
+
+
+def _encode_adjacency(neighbors_per_block, block_index):
+    """
+    Encodes the given neighbor lists as a single array of block indexes:
+    the offsets of each block's neighbors, followed by the neighbors.
+    """
+    offsets = array('i', [0])
+    neighbors = array('i')
+    for block_neighbors in neighbors_per_block:
+        neighbors.extend(block_index[neighbor] for neighbor in block_neighbors)
+        offsets.append(len(neighbors))
+    return _array_to_bytes(offsets + neighbors)
+
+
+def _decode_relations(block_keys, num_related_blocks, children, parents):
+    """
+    Returns the dict of block relations for the given adjacency arrays.
+    """
+    # Neighbors follow the num_related_blocks + 1 offsets.
+    start = num_related_blocks + 1
+    block_relations = {}
+    for index in range(num_related_blocks):
+        relations = _BlockRelations()
+        relations.children = [
+            block_keys[child] for child in children[start + children[index]:start + children[index + 1]]
+        ]
+        relations.parents = [
+            block_keys[parent] for parent in parents[start + parents[index]:start + parents[index + 1]]
+        ]
+        block_relations[block_keys[index]] = relations
+    return block_relations
+
+
+def _field_data_with(field_data, fields):
+    """
+    Sets the given fields dict on the given FieldData object and returns
+    the object.
+    """
+    field_data.fields = fields
+    return field_data
+
+
+class _SectionWriter(object):
+    """
+    Accumulates compressed sections and writes the serialized data.
+    """
+    def __init__(self):
+        self._sections = []
+        self._table = {}
+        self._offset = 0
+
+    def add(self, name, data):
+        """
+        Compresses and adds the given section.
+        """
+        compressed = zlib.compress(data)
+        self._table[name] = (self._offset, len(compressed))
+        self._offset += len(compressed)
+        self._sections.append(compressed)
+
+    def write(self, header):
+        """
+        Returns the serialized data with the given header metadata.
+        """
+        header = dict(header, sections=self._table)
+        encoded_header = zlib.compress(_pickle(header))
+        return b''.join(
+            [_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded_header)), encoded_header] + self._sections
+        )
+
+
+class _SectionReader(object):
+    """
+    Provides access to the header and to the decompressed sections of
+    serialized data.
+    """
+    def __init__(self, serialized_data):
+        magic, version, header_length = _PREAMBLE.unpack_from(serialized_data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(u'Unsupported block structure format version {}.'.format(version))
+
+        self._data = serialized_data
+        self._start = _PREAMBLE.size + header_length
+        self.header = pickle.loads(zlib.decompress(serialized_data[_PREAMBLE.size:self._start]))
+        self.swap_bytes = self.header['byteorder'] != sys.byteorder
+
+    def read(self, name):
+        """
+        Returns the decompressed section with the given name.
+        """
+        offset, length = self.header['sections'][name]
+        start = self._start + offset
+        return zlib.decompress(self._data[start:start + length])
+
+    def read_array(self, name):
+        """
+        Returns the decompressed section with the given name as an
+        array of ints.
+        """
+        data = self.read(name)
+        values, _ = _read_array('i', data, 0, len(data) // array('i').itemsize, self.swap_bytes)
+        return values
+
+
+def _read_array(type_code, data, offset, count, swap_bytes):
+    """
+    Reads an array of count items of the given type code from data,
+    starting at offset.  Returns the array and the offset following it.
+    """
+    values = array(type_code)
+    end = offset + count * values.itemsize
+    if six.PY2:
+        values.fromstring(data[offset:end])
+    else:
+        values.frombytes(data[offset:end])
+    if swap_bytes:
+        values.byteswap()
+    return values, end
+
+
+def _array_to_bytes(values):
+    """
+    Returns the machine representation of the given array.
+    """
+    return values.tostring() if six.PY2 else values.tobytes()
+
+
+def _pickle(data):
+    """
+    Returns the pickled serialization of the given data.
+    """
+    return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
@@ -2,12 +2,19 @@
 This module contains various configuration settings via
 waffle switches for the Block Structure framework.
 """
+from django.conf import settings
+
 from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
 from openedx.core.lib.cache_utils import request_cached
 
 from .models import BlockStructureConfiguration
 
 
+# Defaults for the process-local cache of deserialized block structures,
+# overridable in settings.BLOCK_STRUCTURES_SETTINGS.
+DEFAULT_PROCESS_CACHE_MAX_BLOCKS = 50000
+DEFAULT_PROCESS_CACHE_TIMEOUT = 60
+
 # Namespace
 WAFFLE_NAMESPACE = u'block_structure'
 
@@ -15,6 +22,8 @@ WAFFLE_NAMESPACE = u'block_structure'
 INVALIDATE_CACHE_ON_PUBLISH = u'invalidate_cache_on_publish'
 STORAGE_BACKING_FOR_CACHE = u'storage_backing_for_cache'
 RAISE_ERROR_WHEN_NOT_FOUND = u'raise_error_when_not_found'
+COLUMNAR_SERIALIZATION = u'columnar_serialization'
+PROCESS_CACHE = u'process_cache'
 
 
 def waffle():
@@ -38,3 +47,20 @@ def cache_timeout_in_seconds():
     Returns and caches the current setting for cache_timeout_in_seconds.
     """
     return BlockStructureConfiguration.current().cache_timeout_in_seconds
+
+
+def process_cache_max_blocks():
+    """
+    Returns the maximum total number of blocks of the block structures
+    held in the process-local cache.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_MAX_BLOCKS', DEFAULT_PROCESS_CACHE_MAX_BLOCKS)
+
+
+def process_cache_timeout_in_seconds():
+    """
+    Returns the number of seconds that a block structure is held in the
+    process-local cache when its cache key does not identify the
+    version of its data.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_TIMEOUT', DEFAULT_PROCESS_CACHE_TIMEOUT)
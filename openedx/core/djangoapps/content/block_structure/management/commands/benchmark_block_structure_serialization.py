@@ -0,0 +1,183 @@
+"""
+Command to compare the block structure serialization formats.
+"""
+from datetime import datetime
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+from pytz import UTC
+
+from openedx.core.djangoapps.content.block_structure import columnar
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+
+# Block type and number of children per parent of the upper levels of
+# the generated courses.  The leaf problems make up the rest.
+BRANCHING = ((u'chapter', 10), (u'sequential', 5), (u'vertical', 4))
+
+# Name of the transformer whose data is generated.
+TRANSFORMER_NAME = u'benchmark'
+
+
+class Command(BaseCommand):
+    """
+    Generates block structures of the requested sizes and reports the
+    serialized size and the load times of the zpickle and columnar
+    formats.
+
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 1000 5000 --settings=devstack
+    """
+    help = u'Compares the size and load time of block structure serialization formats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            nargs='+',
+            type=int,
+            default=[1000, 5000, 20000],
+            help=u'Number of blocks in each generated course.',
+        )
+        parser.add_argument(
+            '--iterations',
+            dest='iterations',
+            type=int,
+            default=10,
+            help=u'Number of times each load is timed; the best time is reported.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            u'{:>8} {:>10} {:>12} {:>12} {:>12} {:>12}'.format(
+                u'blocks', u'format', u'size (B)', u'load (ms)', u'1 field (ms)', u'all (ms)',
+            )
+        )
+        for num_blocks in options['num_blocks']:
+            block_structure = generate_block_structure(num_blocks)
+            for format_name, serialize, deserialize in (
+                    (u'zpickle', _zpickle_serialize, _zpickle_deserialize),
+                    (u'columnar', columnar.serialize, columnar.deserialize),
+            ):
+                serialized_data = serialize(block_structure)
+                load, one_field, all_fields = _time_loads(
+                    serialized_data, deserialize, block_structure.root_block_usage_key, options['iterations'],
+                )
+                self.stdout.write(
+                    u'{:>8} {:>10} {:>12} {:>12.1f} {:>12.1f} {:>12.1f}'.format(
+                        len(block_structure), format_name, len(serialized_data), load, one_field, all_fields,
+                    )
+                )
+
+
+def generate_block_structure(num_blocks):
+    """
+    Returns a block structure of approximately num_blocks blocks, shaped
+    like a course, with typical collected xBlock fields and transformer
+    block data.
+    """
+    course_key = CourseLocator(u'benchmark', u'course', u'run{}'.format(num_blocks))
+    root_key = BlockUsageLocator(course_key, u'course', u'course')
+    block_structure = BlockStructureBlockData(root_key)
+    _add_block_data(block_structure, root_key, 0)
+
+    parents = [root_key]
+    for block_type, num_children in BRANCHING + ((u'problem', _leaf_count(num_blocks)),):
+        children = []
+        for parent_index, parent_key in enumerate(parents):
+            for child_index in range(num_children):
+                if len(block_structure) >= num_blocks:
+                    break
+                child_key = BlockUsageLocator(
+                    course_key, block_type, u'{}_{}_{}'.format(block_type, parent_index, child_index),
+                )
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                _add_block_data(block_structure, child_key, len(block_structure))
+                children.append(child_key)
+        parents = children
+    return block_structure
+
+
+def _leaf_count(num_blocks):
+    """
+    Returns the number of leaf blocks per vertical needed to reach
+    num_blocks.
+    """
+    num_verticals = 1
+    for _, num_children in BRANCHING:
+        num_verticals *= num_children
+    return max(1, num_blocks // num_verticals)
+
+
+def _add_block_data(block_structure, block_key, index):
+    """
+    Adds collected xBlock fields and transformer data to the given block.
+    """
+    # pylint: disable=protected-access
+    block_data = block_structure._get_or_create_block(block_key)
+    block_data.display_name = u'{} {}'.format(block_key.block_type, index)
+    block_data.graded = index % 3 == 0
+    block_data.weight = float(index % 5) if index % 2 else None
+    block_data.format = u'Homework' if index % 3 == 0 else None
+    block_data.due = datetime(2030, 1, 1 + index % 28, tzinfo=UTC)
+    block_data.visible_to_staff_only = False
+    block_data.group_access = {50: [1, 2]} if index % 10 == 0 else {}
+    block_structure.set_transformer_block_field(block_key, TRANSFORMER_NAME, u'merged_start', block_data.due)
+    block_structure.set_transformer_block_field(block_key, TRANSFORMER_NAME, u'num_descendants', index % 50)
+
+
+def _time_loads(serialized_data, deserialize, root_block_usage_key, iterations):
+    """
+    Returns the best times, in milliseconds, to deserialize the given
+    data, to additionally read a single field of every block and to
+    read all the fields of every block.
+    """
+    def load():
+        return deserialize(serialized_data, root_block_usage_key)
+
+    def load_one_field():
+        block_structure = load()
+        for block_key in block_structure:
+            block_structure.get_xblock_field(block_key, u'display_name')
+
+    def load_all_fields():
+        block_structure = load()
+        for block_data in block_structure.itervalues():
+            block_data.fields.items()
+            for transformer_data in block_data.transformer_data.itervalues():
+                transformer_data.fields.items()
+
+    return tuple(_best_time(func, iterations) for func in (load, load_one_field, load_all_fields))
+
+
+def _best_time(func, iterations):
+    """
+    Returns the best time, in milliseconds, of calling func.
+    """
+    best = None
+    for _ in range(iterations):
+        start = default_timer()
+        func()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def _zpickle_serialize(block_structure):
+    """
+    Serializes the given block structure as BlockStructureStore does
+    with zpickle.
+    """
+    # pylint: disable=protected-access
+    return zpickle((block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map))
+
+
+def _zpickle_deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given zpickled data.
+    """
+    block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+    return BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
@@ -0,0 +1,27 @@
+"""
+Tests for benchmark_block_structure_serialization management command.
+"""
+from unittest import TestCase
+
+from django.core.management import call_command
+from six import StringIO
+
+from .. import benchmark_block_structure_serialization
+
+
+class TestBenchmarkBlockStructureSerialization(TestCase):
+    """
+    Tests benchmark block structure serialization management command.
+    """
+    def test_generate_block_structure(self):
+        block_structure = benchmark_block_structure_serialization.generate_block_structure(500)
+        self.assertEqual(len(block_structure), 500)
+        self.assertEqual(len(list(block_structure.topological_traversal())), 500)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('benchmark_block_structure_serialization', num_blocks=[300], iterations=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn(u'zpickle', lines[1])
+        self.assertIn(u'columnar', lines[2])
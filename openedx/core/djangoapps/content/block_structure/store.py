@@ -3,10 +3,13 @@ Module for the Storage of BlockStructure objects.
 """
 # pylint: disable=protected-access
 from logging import getLogger
+from time import time
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from edx_django_utils.monitoring import set_custom_metric
 
-from . import config
+from openedx.core.lib.cache_utils import LRUCache, zpickle, zunpickle
+
+from . import columnar, config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -16,6 +19,9 @@ from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
+# Process-local cache of deserialized block structures, created on first use.
+_PROCESS_CACHE = None
+
 
 class StubModel(object):
     """
@@ -65,12 +71,19 @@ class BlockStructureStore(object):
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        get_process_cache().delete(self._encode_process_cache_key(bs_model))
 
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key, if found in the cache or storage.
 
+        When the process cache is enabled, block structures that were
+        already deserialized by this process are returned from memory.
+        Each caller gets its own shallow copy of the cached structure,
+        which it is free to transform, even changing its collected values
+        in place.
+
         The given root_block_usage_key must equate the
         root_block_usage_key previously passed to the `add` method.
 
@@ -88,6 +101,12 @@ class BlockStructureStore(object):
             found.
         """
         bs_model = self._get_model(root_block_usage_key)
+        use_process_cache = _is_process_cache_enabled()
+
+        if use_process_cache:
+            block_structure = self._get_from_process_cache(bs_model)
+            if block_structure is not None:
+                return block_structure.shallow_copy()
 
         try:
             serialized_data = self._get_from_cache(bs_model)
@@ -95,7 +114,11 @@ class BlockStructureStore(object):
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+        if use_process_cache:
+            self._add_to_process_cache(block_structure, bs_model)
+            return block_structure.shallow_copy()
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -108,6 +131,7 @@ class BlockStructureStore(object):
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        get_process_cache().delete(self._encode_process_cache_key(bs_model))
         bs_model.delete()
         logger.info(u"BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -187,10 +211,57 @@ class BlockStructureStore(object):
 
         return bs_model.get_serialized_data()
 
+    def _get_from_process_cache(self, bs_model):
+        """
+        Returns the deserialized block structure for the given
+        BlockStructureModel from the process cache, or None if not
+        found or expired.
+        """
+        process_cache = get_process_cache()
+        cache_key = self._encode_process_cache_key(bs_model)
+        entry = process_cache.get(cache_key)
+
+        if entry is None:
+            result = u'miss'
+            block_structure = None
+        else:
+            block_structure, expiration = entry
+            if expiration is not None and expiration < time():
+                result = u'expired'
+                block_structure = None
+                process_cache.delete(cache_key)
+            else:
+                result = u'hit'
+
+        set_custom_metric(u'block_structure_process_cache', result)
+        for counter_name, value in process_cache.stats().iteritems():
+            set_custom_metric(u'block_structure_process_cache_{}'.format(counter_name), value)
+        return block_structure
+
+    def _add_to_process_cache(self, block_structure, bs_model):
+        """
+        Adds the given deserialized block_structure for the given
+        BlockStructureModel to the process cache.
+
+        When storage backing is enabled, the cache key identifies the
+        version of the collected data, so a newer version is never
+        served from an outdated entry.  Otherwise, entries expire after
+        a short timeout.
+        """
+        if isinstance(bs_model, StubModel):
+            expiration = time() + config.process_cache_timeout_in_seconds()
+        else:
+            expiration = None
+        get_process_cache().set(self._encode_process_cache_key(bs_model), (block_structure, expiration))
+
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, in the
+        columnar format if enabled, else with zpickle.
         """
+        if config.waffle().is_enabled(config.COLUMNAR_SERIALIZATION):
+            return columnar.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -201,7 +272,12 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the columnar or the zpickle format is accepted,
+        regardless of which format is currently enabled for writes.
         """
+        if columnar.is_columnar(serialized_data):
+            return columnar.deserialize(serialized_data, root_block_usage_key)
+
         block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
@@ -225,6 +301,15 @@ class BlockStructureStore(object):
                 root_usage_key=unicode(bs_model.data_usage_key),
             )
 
+    @classmethod
+    def _encode_process_cache_key(cls, bs_model):
+        """
+        Returns the process cache key to use for the given
+        BlockStructureModel or StubModel, which includes the current
+        schema version of the Transformers.
+        """
+        return cls._encode_root_cache_key(bs_model), TransformerRegistry.get_write_version_hash()
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
@@ -249,6 +334,28 @@ class BlockStructureStore(object):
         }
 
 
+def get_process_cache():
+    """
+    Returns the process-local cache of deserialized block structures,
+    bounded by the total number of blocks it holds.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    if _PROCESS_CACHE is None:
+        _PROCESS_CACHE = LRUCache(
+            max_size=config.process_cache_max_blocks(),
+            size_func=lambda entry: len(entry[0]),
+        )
+    return _PROCESS_CACHE
+
+
+def _is_process_cache_enabled():
+    """
+    Returns whether the process-local cache of deserialized Block
+    Structures is enabled.
+    """
+    return config.waffle().is_enabled(config.PROCESS_CACHE)
+
+
 def _is_storage_backing_enabled():
     """
     Returns whether storage backing for Block Structures is enabled.
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for columnar.py
+"""
+from __future__ import absolute_import
+
+# pylint: disable=protected-access
+import pickle
+from copy import deepcopy
+from datetime import datetime
+from unittest import TestCase
+
+import ddt
+
+from .. import columnar
+from ..block_structure import BlockStructureBlockData
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestColumnarSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format.
+    """
+    FIELD_VALUES = {
+        'display_name': lambda index: u'Block é {}'.format(index),
+        'graded': lambda index: index % 2 == 0,
+        'weight': lambda index: index if index % 3 else None,
+        'count': lambda index: index,
+        'due': lambda index: datetime(2030, 1, index + 1),
+    }
+
+    def create_collected_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with xBlock
+        fields and transformer data set on its blocks.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for index in range(len(children_map)):
+            block_key = self.block_key_factory(index)
+            block_data = block_structure._get_or_create_block(block_key)
+            for field_name, value_func in self.FIELD_VALUES.items():
+                setattr(block_data, field_name, value_func(index))
+            if index % 2:
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'merged', {'index': [index]})
+        return block_structure
+
+    def serialize_and_deserialize(self, block_structure):
+        """
+        Returns a copy of the given block structure, round-tripped
+        through the columnar format.
+        """
+        serialized_data = columnar.serialize(block_structure)
+        self.assertTrue(columnar.is_columnar(serialized_data))
+        return columnar.deserialize(serialized_data, block_structure.root_block_usage_key)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_structure(children_map)
+        deserialized = self.serialize_and_deserialize(block_structure)
+
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEqual(deserialized.root_block_usage_key, block_structure.root_block_usage_key)
+        self.assertEqual(
+            deserialized._get_transformer_data_version(MockTransformer),
+            MockTransformer.WRITE_VERSION,
+        )
+        for index in range(len(children_map)):
+            block_key = self.block_key_factory(index)
+            for field_name, value_func in self.FIELD_VALUES.items():
+                self.assertEqual(deserialized.get_xblock_field(block_key, field_name), value_func(index))
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'merged'),
+                {'index': [index]} if index % 2 else None,
+            )
+            self.assertEqual(deserialized[block_key].fields, block_structure[block_key].fields)
+
+    def test_missing_fields(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = self.serialize_and_deserialize(block_structure)
+        block_key = self.block_key_factory(0)
+
+        self.assertIsNone(deserialized.get_xblock_field(block_key, 'not_collected'))
+        self.assertEqual(deserialized.get_xblock_field(block_key, 'not_collected', 'default'), 'default')
+        self.assertNotIn('not_collected', deserialized[block_key].fields)
+        with self.assertRaises(KeyError):
+            deserialized.get_transformer_block_data(block_key, MockTransformer)
+
+    def test_lazy_decoding(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = self.serialize_and_deserialize(block_structure)
+        block_key = self.block_key_factory(1)
+
+        xblock_columns = deserialized[block_key].fields._columns
+
+        self.assertEqual(deserialized.get_xblock_field(block_key, 'count'), 1)
+        self.assertEqual(set(xblock_columns._decoded), {'count'})
+        self.assertEqual(len(deserialized[block_key].fields), len(self.FIELD_VALUES))
+        self.assertEqual(set(xblock_columns._decoded), set(self.FIELD_VALUES))
+
+    def test_modifications(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = self.serialize_and_deserialize(block_structure)
+        block_key = self.block_key_factory(1)
+
+        deserialized.override_xblock_field(block_key, 'display_name', u'overridden')
+        delattr(deserialized[block_key], 'graded')
+        deserialized.remove_transformer_block_field(block_key, MockTransformer, 'merged')
+
+        self.assertEqual(deserialized.get_xblock_field(block_key, 'display_name'), u'overridden')
+        self.assertIsNone(deserialized.get_xblock_field(block_key, 'graded'))
+        self.assertIsNone(deserialized.get_transformer_block_field(block_key, MockTransformer, 'merged'))
+
+        reserialized = self.serialize_and_deserialize(deserialized)
+        self.assertEqual(reserialized.get_xblock_field(block_key, 'display_name'), u'overridden')
+        self.assertIsNone(reserialized.get_xblock_field(block_key, 'graded'))
+        self.assertEqual(reserialized.get_xblock_field(block_key, 'count'), 1)
+
+    def test_copy_and_pickle(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = self.serialize_and_deserialize(block_structure)
+        block_key = self.block_key_factory(3)
+
+        for block_data in (deserialized.copy()[block_key], deepcopy(deserialized[block_key])):
+            self.assertIs(type(block_data.fields), dict)
+            self.assertEqual(block_data.fields, block_structure[block_key].fields)
+
+        unpickled_fields = pickle.loads(pickle.dumps(deserialized[block_key].fields))
+        self.assertIs(type(unpickled_fields), dict)
+        self.assertEqual(unpickled_fields, block_structure[block_key].fields)
+
+    def test_removed_blocks(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure.remove_block(self.block_key_factory(1), keep_descendants=False)
+        deserialized = self.serialize_and_deserialize(block_structure)
+        self.assert_block_structure(deserialized, [[2], [], [], [], []], missing_blocks=[1])
+
+    def test_empty_structure(self):
+        block_structure = BlockStructureBlockData(self.block_key_factory(0))
+        deserialized = self.serialize_and_deserialize(block_structure)
+        self.assertEqual(list(deserialized), [self.block_key_factory(0)])
+
+    def test_not_columnar(self):
+        self.assertFalse(columnar.is_columnar(b'x\x9c'))
+
+    def test_unsupported_version(self):
+        serialized_data = columnar.serialize(self.create_collected_structure(self.SIMPLE_CHILDREN_MAP))
+        unsupported = columnar._PREAMBLE.pack(columnar.MAGIC, columnar.FORMAT_VERSION + 1, 0)
+        with self.assertRaises(ValueError):
+            columnar.deserialize(unsupported + serialized_data[columnar._PREAMBLE.size:], self.block_key_factory(0))
@@ -3,14 +3,17 @@ Tests for block_structure/cache.py
 """
 from __future__ import absolute_import
 
+from time import time
+
 import ddt
+from mock import patch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_SERIALIZATION, PROCESS_CACHE, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
-from ..store import BlockStructureStore
+from ..store import BlockStructureStore, get_process_cache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
 
@@ -30,6 +33,7 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
 
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
+        get_process_cache().clear()
 
     def add_transformers(self):
         """
@@ -59,6 +63,18 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_add_and_get_columnar(self, with_storage_backing):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(COLUMNAR_SERIALIZATION, active=True):
+                self.store.add(self.block_structure)
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEqual(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                u'{} val'.format(MockTransformer.name()),
+            )
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -90,3 +106,70 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.assertEquals(self.mock_cache.timeout_from_last_call, 0)
         self.store.add(self.block_structure)
         self.assertEquals(self.mock_cache.timeout_from_last_call, timeout)
+
+    @ddt.data(True, False)
+    def test_process_cache(self, with_storage_backing):
+        root_key = self.block_structure.root_block_usage_key
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(PROCESS_CACHE, active=True):
+                self.store.add(self.block_structure)
+                first_value = self.store.get(root_key)
+                self.mock_cache.map.clear()
+                second_value = self.store.get(root_key)
+
+        self.assertEqual(get_process_cache().stats()['hits'], 1)
+        self.assertIsNot(first_value, second_value)
+        self.assert_block_structure(second_value, self.children_map)
+
+        # Transforming one of the returned structures does not affect the other.
+        first_value.remove_block(self.block_key_factory(1), keep_descendants=False)
+        self.assert_block_structure(second_value, self.children_map)
+
+    @ddt.data(True, False)
+    def test_process_cache_values_not_shared(self, columnar):
+        root_key = self.block_structure.root_block_usage_key
+        block_key = self.block_key_factory(0)
+        self.block_structure.override_xblock_field(block_key, 'group_access', {1: [2]})
+        self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'ids', [1])
+        with waffle().override(PROCESS_CACHE, active=True):
+            with waffle().override(COLUMNAR_SERIALIZATION, active=columnar):
+                self.store.add(self.block_structure)
+            first_value = self.store.get(root_key)
+
+            # Changing the collected values of one returned structure in place,
+            # as transformers do, does not affect the structures returned later.
+            first_value.get_xblock_field(block_key, 'group_access').setdefault(3, [4])
+            first_value.get_transformer_block_field(block_key, MockTransformer, 'ids').append(2)
+            self.assertEqual(first_value.get_xblock_field(block_key, 'group_access'), {1: [2], 3: [4]})
+
+            second_value = self.store.get(root_key)
+
+        self.assertEqual(get_process_cache().stats()['hits'], 1)
+        self.assertEqual(second_value.get_xblock_field(block_key, 'group_access'), {1: [2]})
+        self.assertEqual(second_value.get_transformer_block_field(block_key, MockTransformer, 'ids'), [1])
+
+    def test_process_cache_invalidated_on_add_and_delete(self):
+        root_key = self.block_structure.root_block_usage_key
+        with waffle().override(PROCESS_CACHE, active=True):
+            self.store.add(self.block_structure)
+            self.store.get(root_key)
+            self.assertEqual(len(get_process_cache()), 1)
+
+            self.store.add(self.block_structure)
+            self.assertEqual(len(get_process_cache()), 0)
+
+            self.store.get(root_key)
+            self.store.delete(root_key)
+            self.assertEqual(len(get_process_cache()), 0)
+            with self.assertRaises(BlockStructureNotFound):
+                self.store.get(root_key)
+
+    def test_process_cache_timeout(self):
+        root_key = self.block_structure.root_block_usage_key
+        with waffle().override(PROCESS_CACHE, active=True):
+            self.store.add(self.block_structure)
+            self.store.get(root_key)
+            self.mock_cache.map.clear()
+            with patch('openedx.core.djangoapps.content.block_structure.store.time', return_value=time() + 3600):
+                with self.assertRaises(BlockStructureNotFound):
+                    self.store.get(root_key)
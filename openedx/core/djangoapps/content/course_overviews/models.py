@@ -3,10 +3,12 @@ Declaration of CourseOverview model
 """
 import json
 import logging
+from multiprocessing.pool import ThreadPool
+from time import time
 from urlparse import urlparse, urlunparse
 
 from django.conf import settings
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
 from django.template import defaultfilters
@@ -21,6 +23,7 @@ from lms.djangoapps import django_comment_client
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.lang_pref.api import get_closest_released_language
 from openedx.core.djangoapps.models.course_details import CourseDetails
+from openedx.core.lib.cache_utils import LRUCache
 from static_replace.models import AssetBaseUrlConfig
 from xmodule import course_metadata_utils, block_metadata_utils
 from xmodule.course_module import CourseDescriptor, DEFAULT_START_DATE
@@ -29,6 +32,10 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
 
+# Process-local cache of CourseOverviews, created on first use, see
+# CourseOverview.get_from_ids.
+_PROCESS_CACHE = None
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -326,6 +333,128 @@ class CourseOverview(TimeStampedModel):
             )
         }
 
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping each of the given course_ids to its
+        CourseOverview, or to None if the course was not found or could not be
+        loaded.
+
+        As with get_from_id, missing and outdated CourseOverviews are loaded
+        from the modulestore, using up to settings.COURSE_OVERVIEW_LOAD_THREADS
+        threads at once.  The tabs and image sets of the CourseOverviews are
+        prefetched, so that the number of queries made to get the
+        CourseOverviews that exist does not depend on the number of courses.
+
+        If settings.COURSE_OVERVIEW_PROCESS_CACHE has a MAX_SIZE, the
+        CourseOverviews are also kept in a process-local cache, and served from
+        it for up to TIMEOUT seconds as long as they were not modified since.
+        Callers must not modify the CourseOverviews they get.
+        """
+        course_ids = list(course_ids)
+        overviews = cls._get_process_cached_overviews(course_ids)
+
+        uncached_ids = [course_id for course_id in course_ids if course_id not in overviews]
+        if uncached_ids:
+            overviews.update(
+                (overview.id, overview)
+                for overview in cls.objects.select_related('image_set').prefetch_related('tabs').filter(
+                    id__in=uncached_ids,
+                    version__gte=cls.VERSION
+                )
+            )
+
+        missing_ids = [course_id for course_id in course_ids if course_id not in overviews]
+        if missing_ids:
+            overviews.update(cls._load_many_from_module_store(missing_ids))
+
+        for course_id in uncached_ids:
+            overview = overviews[course_id]
+            if overview is None:
+                continue
+            # Regenerate the thumbnail images if they're missing, as
+            # get_from_id does.
+            if not hasattr(overview, 'image_set'):
+                CourseOverviewImageSet.create(overview)
+            cls._set_process_cached_overview(overview)
+
+        return {course_id: overviews[course_id] for course_id in course_ids}
+
+    @classmethod
+    def _load_many_from_module_store(cls, course_ids):
+        """
+        Return a dict mapping each of the given course_ids to the
+        CourseOverview loaded from the modulestore, or to None if the course
+        was not found or could not be loaded.
+        """
+        def load(course_id):
+            """
+            Load the CourseOverview of the course from the modulestore.
+            """
+            try:
+                return course_id, cls.load_from_module_store(course_id)
+            except (cls.DoesNotExist, IOError):
+                return course_id, None
+
+        def load_in_thread(course_id):
+            """
+            Load the CourseOverview of the course from the modulestore, closing
+            the database connection of the thread afterwards.
+            """
+            try:
+                return load(course_id)
+            finally:
+                connection.close()
+
+        num_threads = min(len(course_ids), getattr(settings, 'COURSE_OVERVIEW_LOAD_THREADS', 1))
+        if num_threads <= 1:
+            return dict(load(course_id) for course_id in course_ids)
+
+        pool = ThreadPool(num_threads)
+        try:
+            return dict(pool.map(load_in_thread, course_ids))
+        finally:
+            pool.close()
+
+    @classmethod
+    def _get_process_cached_overviews(cls, course_ids):
+        """
+        Return a dict mapping the given course_ids to the CourseOverviews
+        cached in the process-local cache that are still current.
+        """
+        process_cache = get_process_cache()
+        if not process_cache.max_size or not course_ids:
+            return {}
+
+        now = time()
+        cached_overviews = {}
+        for course_id in course_ids:
+            entry = process_cache.get(course_id)
+            if entry is not None and entry[2] >= now:
+                cached_overviews[course_id] = entry
+        if not cached_overviews:
+            return {}
+
+        # A single query tells which of the cached overviews are still current.
+        modified_by_id = dict(
+            cls.objects.filter(id__in=cached_overviews.keys(), version__gte=cls.VERSION).values_list('id', 'modified')
+        )
+        return {
+            course_id: overview
+            for course_id, (overview, modified, __) in cached_overviews.iteritems()
+            if modified_by_id.get(course_id) == modified
+        }
+
+    @classmethod
+    def _set_process_cached_overview(cls, overview):
+        """
+        Keep the given CourseOverview in the process-local cache.
+        """
+        process_cache = get_process_cache()
+        if process_cache.max_size:
+            timeout = getattr(settings, 'COURSE_OVERVIEW_PROCESS_CACHE', {}).get('TIMEOUT', 0)
+            process_cache.set(overview.id, (overview, overview.modified, time() + timeout))
+
     @classmethod
     def get_from_id_if_exists(cls, course_id):
         """
@@ -706,6 +835,19 @@ class CourseOverview(TimeStampedModel):
         return unicode(self.id)
 
 
+def get_process_cache():
+    """
+    Returns the process-local cache of CourseOverviews, bounded by the number
+    of CourseOverviews it holds.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    if _PROCESS_CACHE is None:
+        _PROCESS_CACHE = LRUCache(
+            max_size=getattr(settings, 'COURSE_OVERVIEW_PROCESS_CACHE', {}).get('MAX_SIZE', 0)
+        )
+    return _PROCESS_CACHE
+
+
 class CourseOverviewTab(models.Model):
     """
     Model for storing and caching tabs information of a course.
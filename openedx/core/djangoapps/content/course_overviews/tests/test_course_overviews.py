@@ -13,6 +13,7 @@ from django.conf import settings
 from django.db.utils import IntegrityError
 from django.test.utils import override_settings
 from django.utils import timezone
+from opaque_keys.edx.locator import CourseLocator
 from PIL import Image
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
@@ -556,6 +557,45 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         course_id_to_overview = CourseOverview.get_from_id_if_exists(course_with_overview.id)
         self.assertEqual(course_id_to_overview, None)
 
+    def test_get_from_ids(self):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        missing_course_key = CourseLocator('edX', 'missing', 'course')
+
+        course_ids_to_overviews = CourseOverview.get_from_ids(
+            [course_with_overview.id, course_without_overview.id, missing_course_key]
+        )
+
+        # Missing overviews are loaded from the modulestore.
+        self.assertEqual(course_ids_to_overviews[course_with_overview.id].id, course_with_overview.id)
+        self.assertEqual(course_ids_to_overviews[course_without_overview.id].id, course_without_overview.id)
+        self.assertIsNone(course_ids_to_overviews[missing_course_key])
+
+        # The tabs and image sets of the existing overviews are prefetched.
+        with self.assertNumQueries(0):
+            overview = course_ids_to_overviews[course_with_overview.id]
+            self.assertEqual(
+                {tab.tab_id for tab in overview.tabs.all()},
+                {tab.tab_id for tab in course_with_overview.tabs}
+            )
+            hasattr(overview, 'image_set')
+
+    def test_get_from_ids_process_cache(self):
+        course = CourseFactory.create(emit_signals=True)
+
+        with override_settings(COURSE_OVERVIEW_PROCESS_CACHE={'MAX_SIZE': 10, 'TIMEOUT': 60}):
+            with mock.patch('openedx.core.djangoapps.content.course_overviews.models._PROCESS_CACHE', None):
+                overview = CourseOverview.get_from_ids([course.id])[course.id]
+
+                # Only the modification times of the cached overviews are queried.
+                with self.assertNumQueries(1):
+                    self.assertIs(CourseOverview.get_from_ids([course.id])[course.id], overview)
+
+                CourseOverview.objects.filter(id=course.id).update(display_name='Updated', modified=timezone.now())
+                updated_overview = CourseOverview.get_from_ids([course.id])[course.id]
+                self.assertIsNot(updated_overview, overview)
+                self.assertEqual(updated_overview.display_name, 'Updated')
+
 
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
@@ -1,10 +1,14 @@
 """
 Helper functions for caching course assets.
 """
+from time import time
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
+from openedx.core.lib.cache_utils import LRUCache
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
@@ -14,6 +18,9 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# Process-local cache of small, in-memory course assets, created on first use.
+_PROCESS_CACHE = None
+
 
 def set_cached_content(content):
     """
@@ -48,3 +55,68 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    for location_key in locations:
+        get_process_cache().delete(location_key)
+
+
+def get_process_cache():
+    """
+    Returns the process-local cache of course assets, bounded by the total
+    number of bytes of asset data it holds.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    if _PROCESS_CACHE is None:
+        _PROCESS_CACHE = LRUCache(
+            max_size=_process_cache_setting('MAX_SIZE', 0),
+            size_func=lambda entry: entry[0].length or 0,
+        )
+    return _PROCESS_CACHE
+
+
+def is_process_cacheable(content):
+    """
+    Returns whether the given in-memory content is small enough to be kept
+    in the process-local cache.
+    """
+    return (
+        get_process_cache().max_size > 0 and
+        content.length is not None and
+        content.length <= _process_cache_setting('MAX_ASSET_SIZE', 0)
+    )
+
+
+def set_process_cached_content(content):
+    """
+    Stores the given in-memory content in the process-local cache, using its
+    location as the key.
+
+    Other processes do not see the deletions made by del_cached_content, so
+    the content expires after the configured timeout.
+    """
+    expiration = time() + _process_cache_setting('TIMEOUT', 0)
+    get_process_cache().set(unicode(content.location).encode("utf-8"), (content, expiration))
+
+
+def get_process_cached_content(location):
+    """
+    Retrieves the given piece of content by its location if cached in the
+    process-local cache and not expired.
+    """
+    process_cache = get_process_cache()
+    cache_key = unicode(location).encode("utf-8")
+    entry = process_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    content, expiration = entry
+    if expiration < time():
+        process_cache.delete(cache_key)
+        return None
+    return content
+
+
+def _process_cache_setting(name, default):
+    """
+    Returns the given setting of the process-local cache of course assets.
+    """
+    return getattr(settings, 'CONTENTSERVER_PROCESS_CACHE', {}).get(name, default)
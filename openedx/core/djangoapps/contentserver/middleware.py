@@ -4,6 +4,7 @@ Middleware to serve assets.
 
 import logging
 import datetime
+import time
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
@@ -11,17 +12,22 @@ except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect,
+    StreamingHttpResponse)
+from django.utils.http import parse_etags, quote_etag
 from six import text_type
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    get_cached_content, set_cached_content,
+    get_process_cached_content, set_process_cached_content, is_process_cacheable
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -72,7 +78,7 @@ class StaticContentServer(object):
             # if we're able to load it.
             actual_digest = None
             try:
-                content = self.load_asset_from_location(loc)
+                content = self.load_asset_from_location(loc, requested_digest=requested_digest)
                 actual_digest = getattr(content, "content_digest", None)
             except (ItemNotFoundError, NotFoundError):
                 return HttpResponseNotFound()
@@ -108,9 +114,16 @@ class StaticContentServer(object):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
+            # if this asset has changed since then.  As per RFC 7232, If-None-Match takes
+            # precedence over If-Modified-Since when both are sent.
+            etag = self.get_etag(content)
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag is not None and self.is_etag_matched(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
@@ -123,10 +136,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -151,7 +160,7 @@ class StaticContentServer(object):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            response = self.make_response(content, content.stream_data_in_range(first, last))
                             response['Content-Range'] = b'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -169,7 +178,7 @@ class StaticContentServer(object):
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                response = self.make_response(content, content.stream_data())
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -180,6 +189,8 @@ class StaticContentServer(object):
             response['Accept-Ranges'] = 'bytes'
             response['Content-Type'] = content.content_type
             response['X-Frame-Options'] = 'ALLOW'
+            if etag is not None:
+                response['ETag'] = etag
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -189,6 +200,42 @@ class StaticContentServer(object):
 
             return response
 
+    @staticmethod
+    def make_response(content, data):
+        """
+        Returns a response for the given data of the content.
+
+        Content that is streamed from the contentstore, because it is too large
+        to be cached, is streamed to the client chunk by chunk rather than being
+        read into memory.
+        """
+        if isinstance(content, StaticContentStream):
+            return StreamingHttpResponse(data)
+        return HttpResponse(data)
+
+    @staticmethod
+    def get_etag(content):
+        """
+        Returns the ETag of the given content, derived from its digest, or None
+        if it has no digest.
+        """
+        content_digest = getattr(content, "content_digest", None)
+        if not content_digest:
+            return None
+        return quote_etag(content_digest)
+
+    @staticmethod
+    def is_etag_matched(if_none_match, etag):
+        """
+        Returns whether the given If-None-Match header value matches the ETag,
+        using the weak comparison required for If-None-Match.
+        """
+        etags = parse_etags(if_none_match)
+        if '*' in etags:
+            return True
+        strip_weak = lambda tag: tag[2:] if tag.startswith('W/') else tag
+        return strip_weak(etag) in [strip_weak(tag) for tag in etags]
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -268,27 +315,48 @@ class StaticContentServer(object):
 
         return True
 
-    def load_asset_from_location(self, location):
+    def load_asset_from_location(self, location, requested_digest=None):
         """
-        Loads an asset based on its location, either retrieving it from a cache
-        or loading it directly from the contentstore.
+        Loads an asset based on its location, from the first of these tiers
+        that has it:
+
+        * "process": the process-local cache of small, hot assets,
+        * "cache": the shared cache of assets under 1MB,
+        * "contentstore": the contentstore, as a stream.
+
+        Since the process-local cache is not invalidated when an asset changes,
+        a copy of the asset in it whose digest differs from requested_digest,
+        if given, is not used.
         """
+        start_time = time.time()
+
+        tier = 'process'
+        content = get_process_cached_content(location)
+        if content is not None and requested_digest is not None and content.content_digest != requested_digest:
+            content = None
 
-        # See if we can load this item from cache.
-        content = get_cached_content(location)
         if content is None:
-            # Not in cache, so just try and load it from the asset manager.
-            try:
+            # See if we can load this item from cache.
+            tier = 'cache'
+            content = get_cached_content(location)
+            if content is None:
+                # Not in cache, so just try and load it from the asset manager.
+                tier = 'contentstore'
                 content = AssetManager.find(location, as_stream=True)
-            except (ItemNotFoundError, NotFoundError):
-                raise
-
-            # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
-                content = content.copy_to_in_mem()
-                set_cached_content(content)
+
+                # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
+                # because it's the default for memcached and also we don't want to do too much
+                # buffering in memory when we're serving an actual request.
+                if content.length is not None and content.length < 1048576:
+                    content = content.copy_to_in_mem()
+                    set_cached_content(content)
+
+            if not isinstance(content, StaticContentStream) and is_process_cacheable(content):
+                set_process_cached_content(content)
+
+        if newrelic:
+            newrelic.agent.add_custom_parameter('contentserver.tier', tier)
+            newrelic.agent.add_custom_parameter('contentserver.load_time', time.time() - start_time)
 
         return content
 
@@ -13,10 +13,11 @@ from django.conf import settings
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
-from mock import patch
+from django.http import StreamingHttpResponse
+from mock import Mock, patch
 
 from xmodule.contentstore.django import contentstore
-from xmodule.contentstore.content import StaticContent, VERSIONED_ASSETS_PREFIX
+from xmodule.contentstore.content import StaticContent, StaticContentStream, VERSIONED_ASSETS_PREFIX
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
@@ -27,6 +28,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from .. import caching
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -402,6 +404,92 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         is_from_cdn = StaticContentServer.is_cdn_request(browser_request)
         self.assertEqual(is_from_cdn, True)
 
+    def test_etag_header_sent(self):
+        """
+        Tests that the ETag of an asset is derived from its digest.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], '"{}"'.format(self.contentstore.find(self.unlocked_asset).content_digest))
+
+    @ddt.data(
+        ('{etag}', 304),
+        ('W/{etag}', 304),
+        ('"{digest}x", {etag}', 304),
+        ('*', 304),
+        ('"{digest}x"', 200),
+    )
+    @ddt.unpack
+    def test_if_none_match(self, if_none_match, expected_status_code):
+        """
+        Tests that a request whose If-None-Match header matches the asset's ETag
+        gets a 304 Not Modified response.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_IF_NONE_MATCH=if_none_match.format(etag=etag, digest=etag.strip('"')),
+        )
+        self.assertEqual(resp.status_code, expected_status_code)
+        self.assertEqual(resp['ETag'], etag)
+
+    def test_if_none_match_takes_precedence(self):
+        """
+        Tests that If-Modified-Since is ignored when If-None-Match is sent.
+        """
+        resp = self.client.get(self.url_unlocked)
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH),
+            HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'],
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    @override_settings(CONTENTSERVER_PROCESS_CACHE={'MAX_SIZE': 1024 * 1024, 'MAX_ASSET_SIZE': 1024, 'TIMEOUT': 60})
+    @patch.object(caching, '_PROCESS_CACHE', None)
+    def test_process_cache(self):
+        """
+        Tests that small assets are served from the process-local cache once
+        loaded, unless a different version of them is requested.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(caching.get_process_cache()), 1)
+
+        with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content') as mock_get_cached_content:
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertFalse(mock_get_cached_content.called)
+
+            mock_get_cached_content.return_value = None
+            resp = self.client.get(StaticContent.add_version_to_asset_path(self.url_unlocked, FAKE_MD5_HASH))
+            self.assertEqual(resp.status_code, 301)
+            self.assertTrue(mock_get_cached_content.called)
+
+        caching.del_cached_content(self.unlocked_asset)
+        self.assertEqual(len(caching.get_process_cache()), 0)
+
+    @override_settings(CONTENTSERVER_PROCESS_CACHE={'MAX_SIZE': 1024 * 1024, 'MAX_ASSET_SIZE': 1, 'TIMEOUT': 60})
+    @patch.object(caching, '_PROCESS_CACHE', None)
+    def test_process_cache_max_asset_size(self):
+        """
+        Tests that assets larger than the configured size are not kept in the
+        process-local cache.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(caching.get_process_cache()), 0)
+
+    def test_large_asset_streamed(self):
+        """
+        Tests that assets streamed from the contentstore are streamed to the client.
+        """
+        stream = Mock(read=Mock(side_effect=['data', '']))
+        content = StaticContentStream(self.unlocked_asset, 'asset.txt', 'text/plain', stream, length=4)
+        resp = StaticContentServer.make_response(content, content.stream_data())
+        self.assertIsInstance(resp, StreamingHttpResponse)
+        self.assertEqual(''.join(resp.streaming_content), 'data')
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
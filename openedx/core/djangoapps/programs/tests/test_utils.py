@@ -8,6 +8,7 @@ import ddt
 import httpretty
 import mock
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -23,6 +24,10 @@ from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFact
 from lms.djangoapps.commerce.tests.test_utils import update_commerce_config
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.grades.tests.utils import mock_passing_grade
+from openedx.core.djangoapps.catalog.cache import (
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
+)
 from openedx.core.djangoapps.catalog.tests.factories import (
     CourseFactory,
     CourseRunFactory,
@@ -42,7 +47,7 @@ from openedx.core.djangoapps.programs.utils import (
     get_logged_in_program_certificate_url
 )
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory
-from openedx.core.djangolib.testing.utils import skip_unless_lms
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from student.tests.factories import AnonymousUserFactory, CourseEnrollmentFactory, UserFactory
 from util.date_utils import strftime_localized
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -804,6 +809,90 @@ def _create_course(self, course_price, course_run_count=1, make_entitlement=Fals
     return CourseFactory(course_runs=course_runs, entitlements=entitlements)
 
 
+@skip_unless_lms
+@override_settings(CATALOG_PROGRAM_INDEX={'ENABLED': True})
+@mock.patch(UTILS_MODULE + '.get_programs')
+@mock.patch('openedx.core.djangoapps.catalog.utils.get_programs')
+class TestProgramProgressMeterIndex(CacheIsolationTestCase):
+    """Tests of the program progress utility class reading programs through the program index."""
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestProgramProgressMeterIndex, self).setUp()
+
+        self.user = UserFactory()
+        self.site = SiteFactory()
+
+    def test_program_index(self, mock_get_indexed_programs, mock_get_programs):
+        """
+        Verify that programs read through the program index are engaged like
+        programs read directly, and that the index is only rebuilt once the
+        programs are recached.
+        """
+        course_run_key = generate_course_run_key()
+        course_uuid = uuid.uuid4()
+        data = [
+            ProgramFactory(title='b', courses=[CourseFactory(course_runs=[CourseRunFactory(key=course_run_key)])]),
+            ProgramFactory(title='a', courses=[CourseFactory(course_runs=[CourseRunFactory(key=course_run_key)])]),
+            ProgramFactory(courses=[CourseFactory(uuid=str(course_uuid))]),
+            ProgramFactory(),
+        ]
+        mock_get_indexed_programs.return_value = data
+        self._cache_program_uuids(data)
+
+        CourseEnrollmentFactory(user=self.user, course_id=course_run_key, mode=CourseMode.VERIFIED)
+        CourseEntitlementFactory(user=self.user, course_uuid=course_uuid)
+        meter = ProgramProgressMeter(self.site, self.user)
+
+        expected = deepcopy(data)
+        for program in expected:
+            program['detail_url'] = reverse('program_details_view', kwargs={'program_uuid': program['uuid']})
+        self.assertEqual(meter.invert_programs(), {
+            course_run_key: [expected[1], expected[0]],
+            str(course_uuid): [expected[2]],
+        })
+        self.assertEqual(meter.engaged_programs, [expected[1], expected[0], expected[2]])
+        self.assertEqual(meter.programs, expected)
+        self.assertNotIn('detail_url', data[0])
+        mock_get_programs.assert_not_called()
+
+        ProgramProgressMeter(self.site, self.user)
+        self.assertEqual(mock_get_indexed_programs.call_count, 1)
+
+        cache.delete(SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=self.site.domain))
+        ProgramProgressMeter(self.site, self.user)
+        self.assertEqual(mock_get_indexed_programs.call_count, 2)
+
+    def test_partial_program_index(self, mock_get_indexed_programs, mock_get_programs):
+        """
+        Verify that an index missing some of the site's programs is not kept.
+        """
+        data = [ProgramFactory(), ProgramFactory()]
+        mock_get_indexed_programs.return_value = data[:1]
+        self._cache_program_uuids(data)
+
+        self.assertEqual(len(ProgramProgressMeter(self.site, self.user).programs), 1)
+        self.assertEqual(mock_get_indexed_programs.call_count, 1)
+
+        mock_get_indexed_programs.return_value = data
+        self.assertEqual(len(ProgramProgressMeter(self.site, self.user).programs), 2)
+        self.assertEqual(mock_get_indexed_programs.call_count, 2)
+
+        ProgramProgressMeter(self.site, self.user)
+        self.assertEqual(mock_get_indexed_programs.call_count, 2)
+        mock_get_programs.assert_not_called()
+
+    def _cache_program_uuids(self, programs):
+        """
+        Caches the UUIDs of the given programs as the programs of the site.
+        """
+        cache.set(
+            SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=self.site.domain),
+            [program['uuid'] for program in programs],
+            None
+        )
+
+
 @ddt.ddt
 @override_settings(ECOMMERCE_PUBLIC_URL_ROOT=ECOMMERCE_URL_ROOT)
 @skip_unless_lms
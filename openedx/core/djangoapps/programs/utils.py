@@ -25,7 +25,12 @@ from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.courseware.access import has_access
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
-from openedx.core.djangoapps.catalog.utils import get_programs, get_fulfillable_course_runs_for_entitlement
+from openedx.core.djangoapps.catalog.utils import (
+    get_fulfillable_course_runs_for_entitlement,
+    get_program_index,
+    get_programs,
+    is_program_index_enabled
+)
 from openedx.core.djangoapps.certificates.api import available_date_for_certificate
 from openedx.core.djangoapps.commerce.utils import ecommerce_api_client
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
@@ -108,11 +113,34 @@ class ProgramProgressMeter(object):
 
         self.course_grade_factory = CourseGradeFactory()
 
+        # The site's ProgramIndex, if programs are read through it.
+        self.program_index = None
+        self._indexed_programs = {}
         if uuid:
             self.programs = [get_programs(uuid=uuid)]
+        elif is_program_index_enabled():
+            self.program_index = get_program_index(self.site)
         else:
             self.programs = attach_program_detail_url(get_programs(self.site), self.mobile_only)
 
+    @cached_property
+    def programs(self):
+        """All the site's programs, read from the program index.
+
+        Only used when the meter reads programs through the index, which is
+        otherwise left unread until all programs are needed.
+        """
+        return [self._get_indexed_program(program_uuid) for program_uuid in self.program_index.programs]
+
+    def _get_indexed_program(self, program_uuid):
+        """Returns this meter's copy of the indexed program with the given UUID, with its detail URL."""
+        program = self._indexed_programs.get(program_uuid)
+        if program is None:
+            program = deepcopy(self.program_index.programs[program_uuid])
+            attach_program_detail_url([program], self.mobile_only)
+            self._indexed_programs[program_uuid] = program
+        return program
+
     def invert_programs(self):
         """Intersect programs and enrollments.
 
@@ -125,6 +153,19 @@ class ProgramProgressMeter(object):
         """
         inverted_programs = defaultdict(list)
 
+        if self.program_index is not None:
+            # The index already lists the programs of each course and course run, sorted by title.
+            for program_uuids_by_key, keys in (
+                    (self.program_index.course_programs, self.course_uuids),
+                    (self.program_index.course_run_programs, self.course_run_ids),
+            ):
+                for key in keys:
+                    if key in program_uuids_by_key:
+                        inverted_programs[key] = [
+                            self._get_indexed_program(program_uuid) for program_uuid in program_uuids_by_key[key]
+                        ]
+            return inverted_programs
+
         for program in self.programs:
             for course in program['courses']:
                 course_uuid = course['uuid']
@@ -155,20 +196,17 @@ class ProgramProgressMeter(object):
         inverted_programs = self.invert_programs()
 
         programs = []
+        program_uuids = set()
         # Remember that these course run ids are derived from a list of
         # enrollments sorted from most recent to least recent. Iterating
         # over the values in inverted_programs alone won't yield a program
         # ordering consistent with the user's enrollments.
-        for course_run_id in self.course_run_ids:
-            for program in inverted_programs[course_run_id]:
-                # Dicts aren't a hashable type, so we can't use a set. Sets also
-                # aren't ordered, which is important here.
-                if program not in programs:
-                    programs.append(program)
-
-        for course_uuid in self.course_uuids:
-            for program in inverted_programs[course_uuid]:
-                if program not in programs:
+        for key in chain(self.course_run_ids, self.course_uuids):
+            for program in inverted_programs.get(key, []):
+                # Dicts aren't a hashable type, so we track their UUIDs in a set
+                # and keep the programs themselves in an ordered list.
+                if program['uuid'] not in program_uuids:
+                    program_uuids.add(program['uuid'])
                     programs.append(program)
 
         return programs
@@ -5,9 +5,13 @@ from __future__ import absolute_import
 import collections
 import functools
 import itertools
+import threading
 import zlib
+from uuid import uuid4
+
 import wrapt
 
+from django.core.cache import cache
 from django.utils.encoding import force_text
 from edx_django_utils.cache import RequestCache
 from six import iteritems
@@ -149,6 +153,137 @@ class process_cached(object):  # pylint: disable=invalid-name
         return functools.partial(self.__call__, obj)
 
 
+class LRUCache(object):
+    """
+    A process-local cache that holds at most max_size worth of values,
+    evicting the least recently used entries first.
+
+    The size of each value is given by size_func, so the cache can be
+    bounded by the number of entries (the default) or by any other
+    measure, such as the number of bytes or blocks held.
+
+    The hits, misses and evictions counters are kept for monitoring.
+
+    WARNING: As with process_cached, values held in this cache live
+    for the life of the process and are shared by all requests it
+    serves.  Callers must not mutate the values they get from it.
+    """
+    def __init__(self, max_size, size_func=None):
+        self.max_size = max_size
+        self._size_func = size_func or (lambda value: 1)
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for the given key, marking it as the
+        most recently used, or default if not found.
+        """
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries[key] = (value, size)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Caches the given value for the given key, evicting least
+        recently used entries as needed to stay within max_size.
+        Values larger than max_size are not cached.
+        """
+        size = self._size_func(value)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_size:
+                return
+            while self._entries and self._size + size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size)
+            self._size += size
+
+    def delete(self, key):
+        """
+        Removes the value cached for the given key, if any.
+        """
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        """
+        Removes all values from the cache and resets its counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def size(self):
+        """
+        Returns the total size of the cached values.
+        """
+        return self._size
+
+    def stats(self):
+        """
+        Returns a dict of the cache's counters and current size.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._entries),
+            size=self._size,
+        )
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _pop(self, key):
+        """
+        Removes the entry for the given key, if any, from the cache.
+        Must be called while holding the lock.
+        """
+        try:
+            _, size = self._entries.pop(key)
+        except KeyError:
+            return
+        self._size -= size
+
+
+def get_cache_generations(generation_keys):
+    """
+    Returns the current generations stored in the default cache with the
+    given keys, in the same order, starting a new generation for each key
+    that has none.
+
+    A generation is a random value that callers put in the keys of the
+    entries depending on it, so that deleting the generation key
+    invalidates all of them at once.  Generations never expire, and
+    cache.add keeps concurrent callers from starting different ones.
+    """
+    generations = cache.get_many(generation_keys)
+    missing_keys = [generation_key for generation_key in generation_keys if generation_key not in generations]
+    if missing_keys:
+        for generation_key in missing_keys:
+            cache.add(generation_key, uuid4().hex, None)
+        generations.update(cache.get_many(missing_keys))
+    return [generations.get(generation_key) for generation_key in generation_keys]
+
+
 def zpickle(data):
     """Given any data structure, returns a zlib compressed pickled serialization."""
     return zlib.compress(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
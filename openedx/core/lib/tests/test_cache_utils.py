@@ -6,10 +6,12 @@ from __future__ import absolute_import
 from unittest import TestCase
 
 import ddt
+from django.core.cache import cache
 from mock import Mock
 
 from edx_django_utils.cache import RequestCache
-from openedx.core.lib.cache_utils import request_cached
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import LRUCache, get_cache_generations, request_cached
 import six
 
 
@@ -297,3 +299,68 @@ class TestRequestCachedDecorator(TestCase):
         result = wrapped(3)
         self.assertEqual(result, 2)
         self.assertEqual(to_be_wrapped.call_count, 2)
+
+
+class TestLRUCache(TestCase):
+    """
+    Test the LRUCache class.
+    """
+    def test_get_and_set(self):
+        cache = LRUCache(max_size=2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIn('a', cache)
+        cache.delete('a')
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.stats(), dict(hits=1, misses=2, evictions=0, entries=0, size=0))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_size_func(self):
+        cache = LRUCache(max_size=10, size_func=len)
+        cache.set('a', 'x' * 6)
+        cache.set('b', 'x' * 4)
+        self.assertEqual(cache.size, 10)
+        cache.set('c', 'x' * 2)
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.size, 6)
+        cache.set('d', 'x' * 11)
+        self.assertNotIn('d', cache)
+        self.assertEqual(cache.size, 6)
+
+    def test_clear(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), dict(hits=0, misses=0, evictions=0, entries=0, size=0))
+
+
+class TestGetCacheGenerations(CacheIsolationTestCase):
+    """
+    Test the get_cache_generations function.
+    """
+    ENABLED_CACHES = ['default']
+
+    def test_generations(self):
+        first, second = get_cache_generations(['a', 'b'])
+        self.assertIsNotNone(first)
+        self.assertNotEqual(first, second)
+        self.assertEqual(get_cache_generations(['b', 'a']), [second, first])
+
+        cache.delete('a')
+        new_first, new_second = get_cache_generations(['a', 'b'])
+        self.assertNotEqual(new_first, first)
+        self.assertEqual(new_second, second)
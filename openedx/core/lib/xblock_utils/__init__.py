@@ -272,6 +272,23 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(data_dir, course_id, jump_to_id_base_url, block, view, frag, context,  # pylint: disable=unused-argument
+                 static_asset_path=''):
+    """
+    Updates the supplied module with a new get_html function that wraps
+    the old get_html function and does the substitutions of replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls in a single pass.
+    See static_replace.replace_urls.
+    """
+    return wrap_fragment(frag, static_replace.replace_urls(
+        frag.content,
+        course_id,
+        jump_to_id_base_url=jump_to_id_base_url,
+        data_directory=data_dir,
+        static_asset_path=static_asset_path
+    ))
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.